@@ -1,4 +1,655 @@
-from typing import List, Optional, Tuple, Dict, Union
+from abc import ABC, abstractmethod
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict, deque
+from collections.abc import Mapping
+from contextlib import nullcontext
+from itertools import islice
+from math import inf
+from operator import attrgetter, itemgetter
+from typing import Callable, ContextManager, Deque, Dict, Generic, Hashable, Iterable, Iterator, List, Optional, Sequence, Set, Tuple, TypeVar, Union
+
+T = TypeVar("T")
+V = TypeVar("V")
+
+_MISSING = object()  # Tells a missing entry apart from a cached None
+
+MIN_GRADE: int = 0
+MAX_GRADE: int = 100
+UNGRADED: int = -1  # Stands for a missing grade in GradeStore
+DAYS: Tuple[str, ...] = ("Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun")
+MINUTES_PER_DAY: int = 24 * 60
+SCHEDULE_SEARCH_LIMIT: int = 1000  # The section choices tried for one student before schedule_students settles for fewer courses
+
+
+class Registry(Generic[T]):
+    """
+    An insertion-ordered collection of objects indexed by an ID attribute.
+    
+    Objects are kept in a list of slots so that the index returned by locate() can be used to replace
+    an object in place, and a dictionary maps each ID to its slot. Removing an object leaves an empty
+    slot behind, which is compacted away once empty slots outnumber the live ones.
+    Iterating over the registry, len() and the in operator behave like they would on a list of the objects.
+    Indexing does not: registry[i] takes a slot index as returned by locate(), which stays valid until
+    the next removal; use list(registry) for positions and slices.
+
+    A registry can be backed by storage through two optional callables: loader fetches a single object
+    the first time its ID is looked up, and bulk_loader fetches every stored object the first time
+    the registry is iterated or measured, after which the registry is complete and the loaders are dropped.
+
+    A registry can also keep secondary indexes (see ValueIndex and NameIndex), which it updates
+    whenever an object is added, replaced, removed or loaded. The first call to after() adds a
+    KeyIndex named "order", which keeps the IDs sorted from then on.
+    
+    Attributes:
+        key (Callable[[T], Hashable]): Returns the ID of an object, e.g. attrgetter("id_number").
+        indexes (Dict[str, Index]): The secondary indexes, by name.
+
+    Methods:
+        get(key: Hashable): Returns the object with the given ID, or None.
+        locate(key: Hashable): Returns the slot index and object with the given ID, or None.
+        append(item: T): Adds an object, replacing any object that has the same ID.
+        pop(key: Hashable): Removes and returns the object with the given ID, or None.
+        load_all(): Loads every stored object, if the registry has a bulk_loader.
+        after(key: Optional[Hashable]): Yields the objects in ascending ID order, starting after the given ID.
+    """
+
+    __slots__ = ("key", "indexes", "_slots", "_positions", "_loader", "_bulk_loader")
+
+    def __init__(
+        self,
+        key: Union[str, Callable[[T], Hashable]],
+        loader: Optional[Callable[[Hashable], Optional[T]]] = None,
+        bulk_loader: Optional[Callable[[], Iterable[T]]] = None,
+        indexes: Optional[Dict[str, "Index"]] = None,
+    ) -> None:
+        self.key: Callable[[T], Hashable] = attrgetter(key) if isinstance(key, str) else key
+        self.indexes: Dict[str, Index] = indexes or {}
+        self._slots: List[Optional[T]] = []
+        self._positions: Dict[Hashable, int] = {}  # {id: slot index}
+        self._loader: Optional[Callable[[Hashable], Optional[T]]] = loader
+        self._bulk_loader: Optional[Callable[[], Iterable[T]]] = bulk_loader
+
+    def __len__(self) -> int:
+        self.load_all()
+        return len(self._positions)
+
+    def __iter__(self) -> Iterator[T]:
+        self.load_all()
+        return (item for item in self._slots if item is not None)
+
+    def __contains__(self, item: T) -> bool:
+        return self._position(self.key(item)) is not None
+
+    def __getitem__(self, index: int) -> T:
+        if not isinstance(index, int):
+            raise TypeError(f"Registry indexes are slot indexes from locate(), not {type(index).__name__}")
+        item = self._slots[index]
+        if item is None:
+            raise IndexError(f"No object at index {index}")
+        return item
+
+    def __setitem__(self, index: int, item: T) -> None:
+        old_item = self[index]
+        del self._positions[self.key(old_item)]
+        self._positions[self.key(item)] = index
+        self._slots[index] = item
+        self._reindex(old_item, item)
+
+    def __str__(self) -> str:
+        return str(list(self))
+
+    def __repr__(self) -> str:
+        return repr(list(self))
+
+    def get(self, key: Hashable) -> Optional[T]:
+        index = self._position(key)
+        return None if index is None else self._slots[index]
+
+    def locate(self, key: Hashable) -> Optional[Tuple[int, T]]:
+        index = self._position(key)
+        return None if index is None else (index, self._slots[index])
+
+    def append(self, item: T) -> None:
+        key = self.key(item)
+        index = self._positions.get(key)
+        if index is None:
+            self._positions[key] = len(self._slots)
+            self._slots.append(item)
+            if self.indexes:
+                self._reindex(None, item)
+        else:
+            old_item = self._slots[index]
+            self._slots[index] = item
+            if self.indexes:
+                self._reindex(old_item, item)
+
+    def pop(self, key: Hashable) -> Optional[T]:
+        if self._position(key) is None:
+            return None
+        index = self._positions.pop(key)
+        item = self._slots[index]
+        self._slots[index] = None
+        self._reindex(item, None)
+        if len(self._slots) > 2 * len(self._positions):
+            self._compact()
+        return item
+
+    def _reindex(self, old_item: Optional[T], item: Optional[T]) -> None:
+        for index in self.indexes.values():
+            if old_item is not None:
+                index.discard(self.key(old_item), old_item)
+            if item is not None:
+                index.add(self.key(item), item)
+
+    def _compact(self) -> None:
+        self._slots = [item for item in self._slots if item is not None]
+        self._positions = {self.key(item): i for i, item in enumerate(self._slots)}
+
+    def _position(self, key: Hashable) -> Optional[int]:
+        index = self._positions.get(key)
+        if index is None and self._loader is not None:
+            item = self._loader(key)
+            if item is not None:
+                index = self._positions[key] = len(self._slots)
+                self._slots.append(item)
+                self._reindex(None, item)
+        return index
+
+    def after(self, key: Optional[Hashable] = None) -> Iterator[T]:
+        """
+        Yields the objects in ascending ID order, starting after the given ID (which need not be in the
+        registry), or from the first one if key is None. Each object costs a constant number of steps
+        after the first, which takes a bisection, so a page of a large registry is cheap. Objects added
+        or removed during the iteration are seen or skipped according to where their IDs fall.
+        """
+        self.load_all()
+        order = self.indexes.get("order")
+        if order is None:
+            # setdefault, so that two threads building the index at once end up sharing one
+            order = self.indexes.setdefault("order", KeyIndex(sorted(self._positions)))
+        for item_key in order.after(key):
+            index = self._positions.get(item_key)
+            if index is not None:
+                yield self._slots[index]
+
+    def load_all(self) -> None:
+        """
+        Replaces the contents with every stored object, in storage order, keeping the objects that
+        are already loaded and appending the ones that have not been stored yet.
+        """
+        bulk_loader = self._bulk_loader
+        if bulk_loader is None:
+            return
+        self._loader = self._bulk_loader = None
+        loaded = {self.key(item): item for item in self._slots if item is not None}
+        indexed = set(loaded)
+        slots = [loaded.pop(self.key(item), item) for item in bulk_loader()]
+        self._slots = slots + list(loaded.values())
+        self._positions = {self.key(item): i for i, item in enumerate(self._slots)}
+        for item in slots:
+            if self.key(item) not in indexed:
+                self._reindex(None, item)
+
+
+class Index(ABC):
+    """
+    The interface of a secondary index kept by a Registry.
+
+    Methods:
+        add(key: Hashable, item: object): Indexes an object under its ID.
+        discard(key: Hashable, item: object): Removes an object from the index.
+    """
+
+    __slots__ = ()
+
+    @abstractmethod
+    def add(self, key: Hashable, item: object) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    def discard(self, key: Hashable, item: object) -> None:
+        raise NotImplementedError
+
+
+class ValueIndex(Index):
+    """
+    Indexes objects by the value of one text attribute, such as a student's major, ignoring case.
+
+    Attributes:
+        attribute (str): The name of the indexed attribute.
+
+    Methods:
+        find(value: str): Returns the objects with the given value, in the order they were indexed.
+    """
+
+    __slots__ = ("attribute", "_items")
+
+    def __init__(self, attribute: str) -> None:
+        self.attribute: str = attribute
+        self._items: Dict[str, Dict[Hashable, object]] = {}  # {value: {id: object}}
+
+    def add(self, key: Hashable, item: object) -> None:
+        self._items.setdefault(getattr(item, self.attribute).casefold(), {})[key] = item
+
+    def discard(self, key: Hashable, item: object) -> None:
+        value = getattr(item, self.attribute).casefold()
+        items = self._items.get(value)
+        if items is not None:
+            items.pop(key, None)
+            if not items:
+                del self._items[value]
+
+    def find(self, value: str) -> List[object]:
+        return list(self._items.get(value.casefold(), {}).values())
+
+
+class NameIndex(Index):
+    """
+    Indexes objects by name for case-insensitive prefix and substring search.
+
+    Each name is kept with a space in front of every word, so a word prefix is a substring that starts
+    with a space. Every three-character substring (trigram) of a name, and the first letter of every
+    word after its space, has a posting list of the IDs whose name contains it. A search takes the
+    shortest posting list among the trigrams of the text and checks each of its names, so its cost
+    depends on how selective the text is rather than on the number of names. Texts too short to have
+    a trigram fall back to checking every name, except for one-letter word prefixes.
+
+    The posting lists are built by the first search, or by build(), so adding objects stays cheap until
+    the index is used. Removed or renamed objects are left in the posting lists, where the check skips them, and the
+    lists are rebuilt once stale entries outnumber live ones.
+
+    Attributes:
+        attribute (str): The name of the indexed attribute.
+
+    Methods:
+        build(): Builds the posting lists now, if they have not been built yet.
+        search(text: str, prefix: bool, limit: Optional[int]): Returns the objects whose name contains
+            the text, or has a word starting with it if prefix is True.
+    """
+
+    __slots__ = ("attribute", "_items", "_names", "_postings", "_entries", "_stale")
+
+    def __init__(self, attribute: str = "name") -> None:
+        self.attribute: str = attribute
+        self._items: Dict[Hashable, object] = {}
+        self._names: Dict[Hashable, str] = {}  # {id: normalized name}, once the posting lists are built
+        self._postings: Optional[Dict[str, List[Hashable]]] = None
+        self._entries: int = 0
+        self._stale: int = 0
+
+    @staticmethod
+    def _normalize(name: str) -> str:
+        return " " + " ".join(name.casefold().split())
+
+    @staticmethod
+    def _grams(name: str) -> Set[str]:
+        grams = {name[i : i + 3] for i in range(len(name) - 2)}
+        for word in name.split():
+            grams.add(" " + word[0])
+        return grams
+
+    def add(self, key: Hashable, item: object) -> None:
+        if key in self._items:
+            self.discard(key, self._items[key])
+        self._items[key] = item
+        if self._postings is not None:
+            self._post(key, item)
+
+    def discard(self, key: Hashable, item: object) -> None:
+        if self._items.pop(key, None) is None or self._postings is None:
+            return
+        self._stale += len(self._grams(self._names.pop(key)))
+        if 2 * self._stale > self._entries:
+            self._build()
+
+    def _post(self, key: Hashable, item: object) -> None:
+        name = self._names[key] = self._normalize(getattr(item, self.attribute))
+        postings = self._postings
+        grams = self._grams(name)
+        for gram in grams:
+            posting = postings.get(gram)
+            if posting is None:
+                postings[gram] = [key]
+            else:
+                posting.append(key)
+        self._entries += len(grams)
+
+    def _build(self) -> None:
+        self._names, self._postings = {}, {}
+        self._entries = self._stale = 0
+        for key, item in self._items.items():
+            self._post(key, item)
+
+    def build(self) -> None:
+        if self._postings is None:
+            self._build()
+
+    def search(self, text: str, prefix: bool = False, limit: Optional[int] = None) -> List[object]:
+        self.build()
+        pattern = " ".join(text.casefold().split())
+        if prefix:
+            pattern = " " + pattern
+        if len(pattern) >= 3:
+            candidates: Iterable[Hashable] = min(
+                (self._postings.get(pattern[i : i + 3], ()) for i in range(len(pattern) - 2)), key=len
+            )
+        elif prefix and len(pattern) == 2:
+            candidates = self._postings.get(pattern, ())
+        else:
+            candidates = self._names
+        found: Dict[Hashable, object] = {}  # Also skips the duplicates left by renames
+        names, items = self._names, self._items
+        for key in candidates:
+            if key not in found and pattern in names.get(key, ""):
+                found[key] = items[key]
+                if len(found) == limit:
+                    break
+        return list(found.values())
+
+
+class KeyIndex(Index):
+    """
+    Keeps the IDs of a registry in ascending order, for keyset pagination.
+
+    The IDs are stored in a list of sorted chunks of up to 2 * CHUNK_SIZE IDs, along with the
+    largest ID of each chunk, so that adding or removing an ID moves at most one chunk's worth of
+    entries, and finding where a page starts takes two bisections.
+
+    Methods:
+        after(key: Optional[Hashable]): Yields the IDs greater than key in ascending order, or all of them if key is None.
+    """
+
+    __slots__ = ("_chunks", "_maxes")
+
+    CHUNK_SIZE = 512
+    BATCH_SIZE = 64  # The IDs copied out of a chunk at a time while iterating
+
+    def __init__(self, keys: Iterable[Hashable] = ()) -> None:
+        """
+        Args:
+            keys (Iterable[Hashable]): The IDs to start with, in ascending order and without duplicates.
+        """
+        keys = list(keys)
+        self._chunks: List[List[Hashable]] = [keys[i : i + self.CHUNK_SIZE] for i in range(0, len(keys), self.CHUNK_SIZE)]
+        self._maxes: List[Hashable] = [chunk[-1] for chunk in self._chunks]
+
+    def add(self, key: Hashable, item: object) -> None:
+        if not self._chunks:
+            self._chunks.append([key])
+            self._maxes.append(key)
+            return
+        i = min(bisect_left(self._maxes, key), len(self._maxes) - 1)
+        chunk = self._chunks[i]
+        j = bisect_left(chunk, key)
+        if j < len(chunk) and chunk[j] == key:
+            return  # An object replaced by one with the same ID
+        chunk.insert(j, key)
+        self._maxes[i] = chunk[-1]
+        if len(chunk) > 2 * self.CHUNK_SIZE:
+            self._chunks[i : i + 1] = [chunk[: self.CHUNK_SIZE], chunk[self.CHUNK_SIZE :]]
+            self._maxes[i : i + 1] = [chunk[self.CHUNK_SIZE - 1], chunk[-1]]
+
+    def discard(self, key: Hashable, item: object) -> None:
+        i = bisect_left(self._maxes, key)
+        if i == len(self._maxes):
+            return
+        chunk = self._chunks[i]
+        j = bisect_left(chunk, key)
+        if j < len(chunk) and chunk[j] == key:
+            del chunk[j]
+            if chunk:
+                self._maxes[i] = chunk[-1]
+            else:
+                del self._chunks[i]
+                del self._maxes[i]
+
+    def after(self, key: Optional[Hashable] = None) -> Iterator[Hashable]:
+        # Each batch is found again from the last ID yielded, so changes made between batches are fine
+        while True:
+            if key is None:
+                if not self._chunks:
+                    return
+                batch = self._chunks[0][: self.BATCH_SIZE]
+            else:
+                i = bisect_right(self._maxes, key)
+                if i == len(self._maxes):
+                    return
+                chunk = self._chunks[i]
+                j = bisect_right(chunk, key)
+                batch = chunk[j : j + self.BATCH_SIZE]
+            yield from batch
+            key = batch[-1]
+
+
+class GradeStore(Mapping[int, Dict[str, Optional[int]]]):
+    """
+    Stores grades column-wise in compact integer arrays instead of one dictionary per student.
+    
+    Each row holds a student index, a course index and a grade, where the indices point into
+    tables of interned student IDs and course IDs/names and UNGRADED marks a missing grade.
+    The rows of a student are chained through next_row, so a student's grades are found without
+    a per-grade dictionary entry. Read access behaves like the {student_id: {course_name: grade}}
+    GradeView that StudentManagementSystem.grades holds by default.
+    
+    Attributes:
+        student_index (array): The student index of each row.
+        course_index (array): The course index of each row.
+        grade (array): The grade of each row, or UNGRADED.
+        student_ids (array): The student ID of each student index.
+        course_ids (array): The course ID of each course index.
+        course_names (List[str]): The course name of each course index.
+
+    Methods:
+        set(student_id: int, course_id: int, course_name: str, grade: Optional[int]): Sets the grade of a student for a course.
+        get_grade(student_id: int, course_id: int): Returns the grade of a student for a course, or None.
+        discard(student_id: int, course_id: int): Removes the grade of a student for a course.
+        drop_student(student_id: int): Removes all grades of a student.
+        rename_course(course_id: int, course_name: str): Changes the name under which a course's grades are shown.
+    """
+
+    def __init__(self) -> None:
+        self.student_index: array = array("i")
+        self.course_index: array = array("i")
+        self.grade: array = array("h")
+        self.next_row: array = array("i")  # The next row of the same student, or -1
+        self.student_ids: array = array("q")
+        self.first_row: array = array("i")  # The first row of each student index, or -1
+        self.course_ids: array = array("q")
+        self.course_names: List[str] = []
+        self._student_positions: Dict[int, int] = {}  # {student_id: student index}
+        self._course_positions: Dict[int, int] = {}  # {course_id: course index}
+
+    def __getitem__(self, student_id: int) -> Dict[str, Optional[int]]:
+        rows = list(self._rows(self._student_positions[student_id]))
+        return {
+            self.course_names[self.course_index[row]]: None if self.grade[row] == UNGRADED else self.grade[row]
+            for row in reversed(rows)
+        }
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self._student_positions)
+
+    def __len__(self) -> int:
+        return len(self._student_positions)
+
+    def __repr__(self) -> str:
+        return repr(dict(self))
+
+    def set(self, student_id: int, course_id: int, course_name: str, grade: Optional[int]) -> None:
+        student = self._student_positions.get(student_id)
+        if student is None:
+            student = self._student_positions[student_id] = len(self.student_ids)
+            self.student_ids.append(student_id)
+            self.first_row.append(-1)
+        course = self._course_positions.get(course_id)
+        if course is None:
+            course = self._course_positions[course_id] = len(self.course_ids)
+            self.course_ids.append(course_id)
+            self.course_names.append(course_name)
+        value = UNGRADED if grade is None else grade
+        for row in self._rows(student):
+            if self.course_index[row] == course:
+                self.grade[row] = value
+                return
+        # New rows go to the front of the student's chain.
+        self.student_index.append(student)
+        self.course_index.append(course)
+        self.grade.append(value)
+        self.next_row.append(self.first_row[student])
+        self.first_row[student] = len(self.grade) - 1
+
+    def get_grade(self, student_id: int, course_id: int) -> Optional[int]:
+        row = self._find_row(student_id, course_id)
+        return None if row == -1 or self.grade[row] == UNGRADED else self.grade[row]
+
+    def discard(self, student_id: int, course_id: int) -> None:
+        row = self._find_row(student_id, course_id)
+        if row != -1:
+            self._delete_row(row)
+
+    def drop_student(self, student_id: int) -> None:
+        student = self._student_positions.pop(student_id, None)
+        if student is not None:
+            while self.first_row[student] != -1:
+                self._delete_row(self.first_row[student])
+
+    def rename_course(self, course_id: int, course_name: str) -> None:
+        course = self._course_positions.get(course_id)
+        if course is not None:
+            self.course_names[course] = course_name
+
+    def _rows(self, student: int) -> Iterator[int]:
+        row = self.first_row[student]
+        while row != -1:
+            yield row
+            row = self.next_row[row]
+
+    def _find_row(self, student_id: int, course_id: int) -> int:
+        student = self._student_positions.get(student_id)
+        course = self._course_positions.get(course_id)
+        if student is not None and course is not None:
+            for row in self._rows(student):
+                if self.course_index[row] == course:
+                    return row
+        return -1
+
+    def _relink(self, row: int, new_row: int) -> None:
+        """
+        Makes whatever points to row in its student's chain point to new_row instead.
+        """
+        student = self.student_index[row]
+        if self.first_row[student] == row:
+            self.first_row[student] = new_row
+            return
+        for previous in self._rows(student):
+            if self.next_row[previous] == row:
+                self.next_row[previous] = new_row
+                return
+
+    def _delete_row(self, row: int) -> None:
+        """
+        Unchains a row and moves the last row into its place, so the columns stay dense.
+        """
+        self._relink(row, self.next_row[row])
+        last = len(self.grade) - 1
+        if row != last:
+            self._relink(last, row)
+            for column in (self.student_index, self.course_index, self.grade, self.next_row):
+                column[row] = column[last]
+        for column in (self.student_index, self.course_index, self.grade, self.next_row):
+            column.pop()
+
+
+class GradeView(Mapping[int, Dict[str, Optional[int]]]):
+    """
+    A read-only {student_id: {course_name: grade}} view of the grades held by the enrollment index.
+    
+    Grades are kept once, on the enrollments, where the {student_id: {course_id: enrollment}} and
+    {course_id: {student_id: enrollment}} indexes find them by integer IDs in either direction. This
+    view derives the name-keyed grade maps of older callers as they are read, so a renamed course
+    shows its new name at once. Courses that share a name share a key here, so the last one wins;
+    StudentManagementSystem.grades_for_student tells them apart.
+    """
+
+    __slots__ = ("_student_enrollments",)
+
+    def __init__(self, student_enrollments: Dict[int, Dict[int, "Enrollment"]]) -> None:
+        self._student_enrollments: Dict[int, Dict[int, "Enrollment"]] = student_enrollments
+
+    def __getitem__(self, student_id: int) -> Dict[str, Optional[int]]:
+        return {enrollment._course.course_name: enrollment.grade for enrollment in self._student_enrollments[student_id].values()}
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self._student_enrollments)
+
+    def __len__(self) -> int:
+        return len(self._student_enrollments)
+
+    def __repr__(self) -> str:
+        return repr(dict(self.items()))
+
+
+class ViewCache:
+    """
+    A bounded cache of derived views, such as a course's roster strings, that evicts the least recently
+    used view once it holds maxsize of them. Views are keyed by (view name, ID), and the system drops a
+    view whenever a change touches the student or course it was derived from.
+
+    Attributes:
+        maxsize (int): The most views kept; 0 turns caching off.
+        hits (int): The number of lookups answered from the cache.
+        misses (int): The number of lookups that had to compute the view.
+        evictions (int): The number of views dropped to make room.
+
+    Methods:
+        get(key: Tuple[str, Hashable], compute: Callable[[], V]): Returns the cached view, computing and caching it on a miss.
+        invalidate(key: Tuple[str, Hashable]): Drops a view.
+        clear(): Drops every view.
+        stats(): Returns the counters and the current size as a dictionary.
+    """
+
+    __slots__ = ("maxsize", "hits", "misses", "evictions", "_views", "_lock")
+
+    def __init__(self, maxsize: int = 4096, lock: Optional[ContextManager] = None) -> None:
+        self.maxsize: int = maxsize
+        self.hits: int = 0
+        self.misses: int = 0
+        self.evictions: int = 0
+        self._views: "OrderedDict[Tuple[str, Hashable], object]" = OrderedDict()
+        self._lock: ContextManager = lock if lock is not None else nullcontext()
+
+    def __len__(self) -> int:
+        return len(self._views)
+
+    def get(self, key: Tuple[str, Hashable], compute: Callable[[], V]) -> V:
+        with self._lock:
+            view = self._views.get(key, _MISSING)
+            if view is not _MISSING:
+                self._views.move_to_end(key)
+                self.hits += 1
+                return view
+            self.misses += 1
+        view = compute()
+        if self.maxsize:
+            with self._lock:
+                self._views[key] = view
+                if len(self._views) > self.maxsize:
+                    self._views.popitem(last=False)
+                    self.evictions += 1
+        return view
+
+    def invalidate(self, key: Tuple[str, Hashable]) -> None:
+        with self._lock:
+            self._views.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._views.clear()
+
+    def stats(self) -> Dict[str, int]:
+        return {"size": len(self._views), "maxsize": self.maxsize, "hits": self.hits, "misses": self.misses, "evictions": self.evictions}
+
 
 class Person:
     """
@@ -13,6 +664,8 @@ class Person:
         __repr__(): Returns a string representation of the person's details for debugging.
     """
 
+    __slots__ = ("name", "id_number")
+
     def __init__(self, name: str, id_number: int) -> None:
         self.name: str = name
         self.id_number: int = id_number
@@ -36,6 +689,8 @@ class Student(Person):
         __repr__(): Returns a string representation of the student's details for debugging.
     """
 
+    __slots__ = ("major",)
+
     def __init__(self, name: str, id_number: int, major: str) -> None:
         super().__init__(name, id_number)
         self.major: str = major 
@@ -59,6 +714,8 @@ class Instructor(Person):
         __repr__(): Returns a string representation of the instructor's details for debugging.
     """
 
+    __slots__ = ("department",)
+
     def __init__(self, name: str, id_number: int, department: str) -> None:
         super().__init__(name, id_number)
         self.department: str = department 
@@ -70,6 +727,147 @@ class Instructor(Person):
         return f"Instructor(Name: {self.name}, ID Number: {self.id_number}, Department: {self.department})"
 
 
+class MeetingSlot:
+    """
+    A weekly meeting of a course: a day of the week and a time range on that day.
+    
+    Attributes:
+        day (int): The day of the week, from 0 for Monday to 6 for Sunday.
+        start (int): The start time, in minutes after midnight.
+        end (int): The end time, in minutes after midnight; the meeting ends just before it.
+
+    Methods:
+        __str__(): Returns the slot as text, such as "Mon 09:00-10:30".
+        __repr__(): Returns a string representation of the slot for debugging.
+        parse(text: str): Creates a slot from text such as "Mon 09:00-10:30".
+        week_interval(): Returns the slot as (start, end) minutes after Monday midnight.
+        overlaps(other: MeetingSlot): Returns whether two slots share any time.
+    """
+
+    __slots__ = ("day", "start", "end")
+
+    def __init__(self, day: int, start: int, end: int) -> None:
+        if not 0 <= day < len(DAYS):
+            raise ValueError(f"day must be between 0 and {len(DAYS) - 1}, not {day}")
+        if not 0 <= start < end <= MINUTES_PER_DAY:
+            raise ValueError(f"A meeting must start before it ends, within the day: {start}-{end}")
+        self.day: int = day
+        self.start: int = start
+        self.end: int = end
+
+    @classmethod
+    def parse(cls, text: str) -> "MeetingSlot":
+        day, _, times = text.strip().partition(" ")
+        start, _, end = times.partition("-")
+        try:
+            return cls(DAYS.index(day.capitalize()), _minutes(start), _minutes(end))
+        except ValueError:
+            raise ValueError(f"Not a meeting slot like 'Mon 09:00-10:30': {text!r}") from None
+
+    def week_interval(self) -> Tuple[int, int]:
+        offset = self.day * MINUTES_PER_DAY
+        return offset + self.start, offset + self.end
+
+    def overlaps(self, other: "MeetingSlot") -> bool:
+        return self.day == other.day and self.start < other.end and other.start < self.end
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, MeetingSlot):
+            return NotImplemented
+        return (self.day, self.start, self.end) == (other.day, other.start, other.end)
+
+    def __hash__(self) -> int:
+        return hash((self.day, self.start, self.end))
+
+    def __str__(self) -> str:
+        return f"{DAYS[self.day]} {self.start // 60:02d}:{self.start % 60:02d}-{self.end // 60:02d}:{self.end % 60:02d}"
+
+    def __repr__(self) -> str:
+        return f"MeetingSlot({str(self)!r})"
+
+
+def _minutes(text: str) -> int:
+    hours, _, minutes = text.strip().partition(":")
+    return int(hours) * 60 + int(minutes or 0)
+
+
+def format_meetings(meetings: Iterable[MeetingSlot]) -> str:
+    """Returns the text under which a course's meetings are stored, like 'Mon 09:00-10:30, Wed 09:00-10:30'."""
+    return ", ".join(map(str, meetings))
+
+
+def parse_meetings(text: Optional[str]) -> Tuple[MeetingSlot, ...]:
+    """Reads meetings stored by format_meetings; empty or missing text stands for no meetings."""
+    return tuple(MeetingSlot.parse(meeting) for meeting in text.split(",")) if text else ()
+
+
+class IntervalIndex:
+    """
+    Half-open intervals [start, end), each with an owner, kept sorted by start to find the ones that
+    overlap a given interval.
+
+    An interval can only overlap [start, end) if it starts before end and no earlier than start
+    minus the longest interval indexed, so a query bisects to that range and only checks the
+    intervals in it rather than all of them.
+
+    Methods:
+        add(start: int, end: int, owner: Hashable): Indexes an interval.
+        discard(start: int, end: int, owner: Hashable): Removes an interval, if it is indexed.
+        overlapping(start: int, end: int): Returns the owners of the intervals that overlap [start, end).
+        __len__(): Returns the number of intervals indexed.
+    """
+
+    __slots__ = ("_starts", "_intervals", "_longest")
+
+    def __init__(self) -> None:
+        self._starts: List[int] = []
+        self._intervals: List[Tuple[int, int, Hashable]] = []  # (start, end, owner), in the order of _starts
+        self._longest: int = 0  # Not lowered on removal, which only widens the range a query checks
+
+    def add(self, start: int, end: int, owner: Hashable) -> None:
+        i = bisect_right(self._starts, start)
+        self._starts.insert(i, start)
+        self._intervals.insert(i, (start, end, owner))
+        if end - start > self._longest:
+            self._longest = end - start
+
+    def discard(self, start: int, end: int, owner: Hashable) -> None:
+        i = bisect_left(self._starts, start)
+        while i < len(self._starts) and self._starts[i] == start:
+            if self._intervals[i] == (start, end, owner):
+                del self._starts[i]
+                del self._intervals[i]
+                return
+            i += 1
+
+    def overlapping(self, start: int, end: int) -> List[Hashable]:
+        low, high = bisect_right(self._starts, start - self._longest), bisect_left(self._starts, end)
+        return [owner for _, other_end, owner in self._intervals[low:high] if other_end > start]
+
+    def __len__(self) -> int:
+        return len(self._starts)
+
+
+def _book(timetables: Dict[int, IntervalIndex], key: int, course_id: int, meetings: Sequence["MeetingSlot"]) -> None:
+    """Adds a course's meetings to the timetable of a student or instructor, under the course ID."""
+    if not meetings:
+        return
+    timetable = timetables.get(key)
+    if timetable is None:
+        timetable = timetables[key] = IntervalIndex()
+    for meeting in meetings:
+        timetable.add(*meeting.week_interval(), course_id)
+
+
+def _unbook(timetables: Dict[int, IntervalIndex], key: int, course_id: int, meetings: Sequence["MeetingSlot"]) -> None:
+    timetable = timetables.get(key)
+    if timetable is not None:
+        for meeting in meetings:
+            timetable.discard(*meeting.week_interval(), course_id)
+        if not timetable:
+            del timetables[key]
+
+
 class Course:
     """
     Represents a course with a name and an ID, and manages the enrollment of students.
@@ -77,31 +875,82 @@ class Course:
     Attributes:
         course_name (str): The name of the course.
         course_id (int): The unique identifier for the course.
-        enrolled_students (List[Student]): A list of students enrolled in the course.
+        capacity (Optional[int]): The number of seats in the course, or None if it is unlimited.
+        meetings (Tuple[MeetingSlot, ...]): The weekly meetings of the course.
+        instructor (Optional[Instructor]): The instructor teaching the course, or None if none is assigned (or it was
+            only given by ID number, until the course is registered).
+        instructor_id (Optional[int]): The ID number of the instructor, or None if none is assigned.
+        enrolled_students (Registry[Student]): The students enrolled in the course, in enrollment order and keyed by ID number.
 
     Methods:
         __str__(): Returns a human-readable string representation of the course's details.
         __repr__(): Returns a string representation of the course's details for debugging.
 
         add_students_to_course(student: Student): Takes a student object and enrolls them into the course.
+        A student counts as already enrolled if a student with the same ID number is on the roster.
+        If the course is full, the student is put at the end of its waitlist instead. While the course is
+        registered in a system, a student whose courses meet at the same time as this one is turned away.
         Args:
             student (Student): The student to be enrolled in the course.
         Returns:
-            str: A message indicating whether the student was successfully enrolled or already enrolled.
+            str: A message indicating whether the student was enrolled, waitlisted, already enrolled or has a time clash.
 
-        remove_student_from_course(student: Student): Removes a student from the course.
+        remove_student_from_course(student: Student): Removes a student from the course, or from its waitlist.
+        A seat freed on the roster goes to the students at the front of the waitlist.
         Args:
             student (Student): The student to be removed from the course.
         Returns:
             str: A message indicating whether the student was successfully removed or is not an enrolled student.
 
         list_enrolled_students(): Returns a list of string representations of all enrolled students.
+        is_full(): Returns whether every seat in the course is taken.
+        waitlist(): Returns the waitlisted students, first in line first.
+
+    While the course is registered in a StudentManagementSystem, adding or removing a student here
+    also creates or drops the matching enrollment in the system. Waitlists are kept in memory only,
+    while storage keeps the meetings and the instructor's ID number, which is looked up in the system
+    when the course is registered or loaded. Courses with the same name are sections of one course, which
+    StudentManagementSystem.schedule_students chooses between.
     """
 
-    def __init__(self, course_name: str, course_id: int) -> None:
+    __slots__ = (
+        "course_name", "course_id", "capacity", "meetings", "instructor_id", "_instructor",
+        "enrolled_students", "_waitlist", "_tickets", "_next_ticket", "_system",
+    )
+
+    def __init__(
+        self,
+        course_name: str,
+        course_id: int,
+        capacity: Optional[int] = None,
+        meetings: Iterable[MeetingSlot] = (),
+        instructor: Union[Instructor, int, None] = None,
+    ) -> None:
         self.course_name: str = course_name
         self.course_id: int = course_id
-        self.enrolled_students: List[Student] = []  # List of students enrolled in the course
+        self.capacity: Optional[int] = capacity
+        self.meetings: Tuple[MeetingSlot, ...] = tuple(meetings)
+        self.instructor = instructor  # Set through StudentManagementSystem.assign_instructor once registered
+        self.enrolled_students: Registry[Student] = Registry("id_number")  # Students enrolled in the course
+        # The waitlist is a queue of (ticket, student); an entry is live while the student's current ticket
+        # matches, so leaving the waitlist only drops the ticket and the stale entry is skipped later.
+        self._waitlist: Deque[Tuple[int, Student]] = deque()
+        self._tickets: Dict[int, int] = {}  # {id_number: ticket}
+        self._next_ticket: int = 0
+        self._system: Optional["StudentManagementSystem"] = None  # Set while the course is registered in a system
+
+    @property
+    def instructor(self) -> Optional[Instructor]:
+        return self._instructor
+
+    @instructor.setter
+    def instructor(self, instructor: Union[Instructor, int, None]) -> None:
+        if isinstance(instructor, int):
+            self._instructor: Optional[Instructor] = None
+            self.instructor_id: Optional[int] = instructor
+        else:
+            self._instructor = instructor
+            self.instructor_id = None if instructor is None else instructor.id_number
 
     def __str__(self) -> str:
         return f"Course: {self.course_name}, Course ID: {self.course_id}"
@@ -110,30 +959,130 @@ class Course:
         return f"Course: {self.course_name}, Course ID: {self.course_id}"
     
     def add_students_to_course(self, student: Student) -> str:
-        if student not in self.enrolled_students:
-            self.enrolled_students.append(student)
+        with self._writing():
+            if student in self.enrolled_students:
+                return f"Student {student.name} is already enrolled in {self.course_name}"
+            if student.id_number in self._tickets:
+                return f"Student {student.name} is already on the waitlist for {self.course_name}"
+            if self._system is not None:
+                clashes = self._system._clashes(student.id_number, (self,))
+                if clashes:
+                    return f"Student {student.name} cannot enroll in {self.course_name}: it clashes with {clashes[0][1].course_name}"
+            if self.is_full():
+                self._join_waitlist(student)
+                return f"{self.course_name} is full; student {student.name} is number {len(self._tickets)} on the waitlist"
+            self._seat(student)
             return f"Student {student.name} has enrolled in {self.course_name}"
-        else:
-            return f"Student {student.name} is already enrolled in {self.course_name}"
         
     def remove_student_from_course(self, student: Student) -> str:
-        if student in self.enrolled_students:
-            self.enrolled_students.remove(student)
-            return f"Student {student.name} has been removed from {self.course_name}"
+        with self._writing():
+            if self.enrolled_students.get(student.id_number) is not None:
+                if self._system is not None:
+                    self._system._unlink(student.id_number, self.course_id)
+                else:
+                    self.enrolled_students.pop(student.id_number)
+                self._promote()
+                return f"Student {student.name} has been removed from {self.course_name}"
+            elif self._leave_waitlist(student.id_number):
+                return f"Student {student.name} has been removed from the waitlist for {self.course_name}"
+            else:
+                return f"Student {student.name} is not enrolled in {self.course_name}"
+
+    def is_full(self) -> bool:
+        return self.capacity is not None and len(self.enrolled_students) >= self.capacity
+
+    def waitlist(self) -> List[Student]:
+        students = [student for ticket, student in self._waitlist if self._tickets.get(student.id_number) == ticket]
+        if self._system is None:
+            return students
+        return [self._system.students.get(student.id_number) or student for student in students]
+
+    def _seat(self, student: Student) -> None:
+        if self._system is not None:
+            self._system._link(student, self)
         else:
-            return f"Student {student.name} is not enrolled in {self.course_name}"
+            self.enrolled_students.append(student)
+
+    def _join_waitlist(self, student: Student) -> None:
+        self._tickets[student.id_number] = self._next_ticket
+        self._waitlist.append((self._next_ticket, student))
+        self._next_ticket += 1
+        if self._system is not None:
+            self._system._waitlisted.setdefault(student.id_number, set()).add(self.course_id)
+
+    def _leave_waitlist(self, student_id: int) -> bool:
+        """
+        Takes a student off the waitlist, if they are on it. Once the stale queue entries outnumber the
+        live ones, the queue is rebuilt without them, so students who left do not linger in memory.
+        """
+        if self._tickets.pop(student_id, None) is None:
+            return False
+        if self._system is not None:
+            self._system._forget_waitlisted(student_id, self.course_id)
+        if len(self._waitlist) > 2 * len(self._tickets):
+            self._waitlist = deque(
+                (ticket, student) for ticket, student in self._waitlist if self._tickets.get(student.id_number) == ticket
+            )
+        return True
+
+    def _promote(self) -> None:
+        """
+        Enrolls students from the front of the waitlist while there are free seats, skipping students
+        who left the waitlist or were removed from the system in the meantime, and dropping students
+        who have since enrolled in a course that clashes with this one. In a system, the student seated
+        is the one registered now, as the queued object predates any update_student since.
+        """
+        system = self._system
+        while self._waitlist and not self.is_full():
+            ticket, student = self._waitlist.popleft()
+            if self._tickets.get(student.id_number) != ticket:
+                continue
+            self._leave_waitlist(student.id_number)
+            if system is not None:
+                student = system.students.get(student.id_number)
+                if student is None or system._clashes(student.id_number, (self,)):
+                    continue
+            self._seat(student)
+
+    def _writing(self) -> ContextManager:
+        return nullcontext() if self._system is None else self._system._writing()
 
     def list_enrolled_students(self) -> List[str]:
-        return [str(student) for student in self.enrolled_students]
+        if self._system is None:
+            return [str(student) for student in self.enrolled_students]
+        return list(
+            self._system.views.get(("roster", self.course_id), lambda: [str(student) for student in self.enrolled_students])
+        )
+
+
+def _added(kind: str, added: int, skipped: List[int]) -> str:
+    message = f"{added} {kind}(s) have been added."
+    if skipped:
+        message += f" Already registered, so skipped: {', '.join(map(str, skipped))}"
+    return message
+
+
+def _is_grade(grade: object) -> bool:
+    return isinstance(grade, int) and not isinstance(grade, bool) and MIN_GRADE <= grade <= MAX_GRADE
+
+
+def _check_grade(grade: object) -> None:
+    if not _is_grade(grade):
+        raise ValueError(f"A grade must be an integer from {MIN_GRADE} to {MAX_GRADE}, not {grade!r}")
 
 
 class Enrollment:
     """
     Represents enrollment of a student in a course, including their grade.
     
+    The student and course can be given as integer IDs instead of objects, in which case the enrollment
+    only keeps the IDs, student and course are None and the IDs are shown in place of the names.
+    
     Attributes:
-        student (Student): The student enrolled in the course.
-        course (Course): The course in which the student is enrolled.
+        student (Optional[Student]): The student enrolled in the course.
+        course (Optional[Course]): The course in which the student is enrolled.
+        student_id (int): The ID number of the student.
+        course_id (int): The ID of the course.
         grade (Optional[int]): The grade assigned to the student for the course.
 
     Methods:
@@ -142,27 +1091,271 @@ class Enrollment:
         assign_grade(grade: int): Assigns a grade to the student for the course.
     """
 
-    def __init__(self, student: Student, course: Course, grade: Optional[int] = None) -> None:
-        self.student: Student = student
-        self.course: Course = course
+    __slots__ = ("student_id", "course_id", "grade", "_student", "_course")
+
+    def __init__(self, student: Union[Student, int], course: Union[Course, int], grade: Optional[int] = None) -> None:
+        self.student = student
+        self.course = course
         self.grade: Optional[int] = grade
 
+    @property
+    def student(self) -> Optional[Student]:
+        return self._student
+
+    @student.setter
+    def student(self, student: Union[Student, int]) -> None:
+        if isinstance(student, int):
+            self._student: Optional[Student] = None
+            self.student_id: int = student
+        else:
+            self._student = student
+            self.student_id = student.id_number
+
+    @property
+    def course(self) -> Optional[Course]:
+        return self._course
+
+    @course.setter
+    def course(self, course: Union[Course, int]) -> None:
+        if isinstance(course, int):
+            self._course: Optional[Course] = None
+            self.course_id: int = course
+        else:
+            self._course = course
+            self.course_id = course.course_id
+
     def __str__(self) -> str:
-        return f"The student {self.student.name} is enrolled in {self.course.course_name} with a grade of {self.grade}"
+        student_name = self.student_id if self._student is None else self._student.name
+        course_name = f"course {self.course_id}" if self._course is None else self._course.course_name
+        return f"The student {student_name} is enrolled in {course_name} with a grade of {self.grade}"
     
     def __repr__(self) -> str:
-        return f"The student {self.student.name} is enrolled in {self.course.course_name} with a grade of {self.grade}"
+        student_name = self.student_id if self._student is None else self._student.name
+        course_name = f"course {self.course_id}" if self._course is None else self._course.course_name
+        return f"The student {student_name} is enrolled in {course_name} with a grade of {self.grade}"
     
     def assign_grade(self, grade: int) -> None:
         """
         Assigns a grade to the student for the course.
         
         Args:
-            grade (int): The grade to assign to the student.
+            grade (int): The grade to assign to the student, from MIN_GRADE to MAX_GRADE; anything else raises ValueError.
         """
+        _check_grade(grade)
         self.grade = grade
 
 
+class BulkGradeReport:
+    """
+    Summarizes the outcome of a bulk grade import.
+    
+    Attributes:
+        applied (int): The number of rows whose grade was assigned.
+        rejected (Dict[str, List[int]]): The row numbers that were rejected, grouped by reason
+            ("invalid grade", "unknown student", "unknown course" or "not enrolled").
+
+    Methods:
+        __str__(): Returns a one-line summary of the import.
+        __repr__(): Returns a string representation of the report for debugging.
+        reject(row: int, reason: str): Records a rejected row number under the given reason.
+    """
+
+    def __init__(self) -> None:
+        self.applied: int = 0
+        self.rejected: Dict[str, List[int]] = {}
+
+    def __str__(self) -> str:
+        rejected = ", ".join(f"{len(rows)} {reason}" for reason, rows in self.rejected.items())
+        return f"{self.applied} grade(s) assigned, {sum(len(rows) for rows in self.rejected.values())} rejected" + (
+            f" ({rejected})" if rejected else ""
+        )
+
+    def __repr__(self) -> str:
+        return f"BulkGradeReport(applied={self.applied}, rejected={self.rejected})"
+
+    def reject(self, row: int, reason: str) -> None:
+        self.rejected.setdefault(reason, []).append(row)
+
+
+def _paginate(
+    items: Iterator[T],
+    key_fields: Tuple[str, ...],
+    limit: Optional[int],
+    where: Optional[Callable[[T], bool]],
+    fields: Optional[Sequence[str]],
+) -> Iterator[Union[T, Dict[str, object]]]:
+    """
+    Filters, limits and projects a page of objects. A projected object is a dictionary of the
+    requested attributes, which always includes the ID attributes so that the next page can be asked for.
+    """
+    if where is not None:
+        items = filter(where, items)
+    if limit is not None:
+        items = islice(items, limit)
+    if fields is None:
+        return items
+    names = tuple(dict.fromkeys((*key_fields, *fields)))
+    return ({name: getattr(item, name) for name in names} for item in items)
+
+
+def _free_seats(course: "Course") -> float:
+    return inf if course.capacity is None else course.capacity - len(course.enrolled_students)
+
+
+def _overlap(intervals: List[Tuple[int, int]], booked: List[Tuple[int, int]]) -> bool:
+    return any(start < booked_end and booked_start < end for start, end in intervals for booked_start, booked_end in booked)
+
+
+def _fit_sections(wanted: List[List["Course"]], intervals: Dict[int, List[Tuple[int, int]]]) -> Optional[List["Course"]]:
+    """
+    Searches depth first for one section of each course that do not overlap each other, trying at
+    most SCHEDULE_SEARCH_LIMIT sections in all.
+    
+    Returns:
+        Optional[List[Course]]: The sections chosen, or None if none fit or the search ran out of tries.
+    """
+    tries = SCHEDULE_SEARCH_LIMIT
+
+    def fit(level: int, booked: List[Tuple[int, int]]) -> Optional[List["Course"]]:
+        nonlocal tries
+        if level == len(wanted):
+            return []
+        for course in wanted[level]:
+            tries -= 1
+            if tries < 0:
+                return None
+            course_intervals = intervals[course.course_id]
+            if booked and _overlap(course_intervals, booked):
+                continue
+            rest = fit(level + 1, booked + course_intervals)
+            if rest is not None:
+                return [course, *rest]
+        return None
+
+    return fit(0, [])
+
+
+class ScheduleReport:
+    """
+    Summarizes the outcome of a batch of schedule requests.
+    
+    Attributes:
+        enrolled (Dict[int, List[int]]): The IDs of the sections each student was enrolled in.
+        unscheduled (Dict[int, Dict[str, str]]): The requested courses that could not be scheduled for each
+            student, with the reason ("unknown student", "unknown course", "full" or "time clash").
+
+    Methods:
+        __str__(): Returns a one-line summary of the batch.
+        __repr__(): Returns a string representation of the report for debugging.
+        unschedule(student_id: int, course_name: str, reason: str): Records a request that could not be scheduled.
+    """
+
+    def __init__(self) -> None:
+        self.enrolled: Dict[int, List[int]] = {}
+        self.unscheduled: Dict[int, Dict[str, str]] = {}
+
+    def __str__(self) -> str:
+        reasons: Dict[str, int] = {}
+        for courses in self.unscheduled.values():
+            for reason in courses.values():
+                reasons[reason] = reasons.get(reason, 0) + 1
+        details = ", ".join(f"{count} {reason}" for reason, count in reasons.items())
+        sections = sum(len(course_ids) for course_ids in self.enrolled.values())
+        return f"{len(self.enrolled)} student(s) enrolled in {sections} section(s), {sum(reasons.values())} request(s) unscheduled" + (
+            f" ({details})" if details else ""
+        )
+
+    def __repr__(self) -> str:
+        return f"ScheduleReport(enrolled={self.enrolled}, unscheduled={self.unscheduled})"
+
+    def unschedule(self, student_id: int, course_name: str, reason: str) -> None:
+        self.unscheduled.setdefault(student_id, {})[course_name] = reason
+
+
+class ChangeEvent:
+    """
+    A change made to a StudentManagementSystem, as passed to the callbacks subscribed to it.
+    
+    Attributes:
+        kind (str): "add", "update" or "remove".
+        table (str): "students", "instructors", "courses", "enrollments", or "teaching" for the
+            assignment of an instructor to a course.
+        key (Hashable): The ID of the object changed; (student_id, course_id) for an enrollment and
+            (instructor_id, course_id) for a teaching assignment.
+        old (Optional[object]): The object before the change, or None if it was added. For an
+            enrollment, the grade before the change.
+        new (Optional[object]): The object after the change, or None if it was removed. For an
+            enrollment, the grade after the change.
+
+    Methods:
+        __repr__(): Returns a string representation of the event for debugging.
+    """
+
+    __slots__ = ("kind", "table", "key", "old", "new")
+
+    def __init__(self, kind: str, table: str, key: Hashable, old: Optional[object], new: Optional[object]) -> None:
+        self.kind: str = kind
+        self.table: str = table
+        self.key: Hashable = key
+        self.old: Optional[object] = old
+        self.new: Optional[object] = new
+
+    def __repr__(self) -> str:
+        return f"ChangeEvent({self.kind!r}, {self.table!r}, {self.key!r}, old={self.old!r}, new={self.new!r})"
+
+
+class StorageBackend(ABC):
+    """
+    The interface through which a StudentManagementSystem persists its data.
+    
+    The tables are "students", "instructors", "courses" and "enrollments". Students, instructors and
+    courses are keyed by their ID; enrollments are keyed by (student_id, course_id) and stored as
+    (student_id, course_id, grade) rows.
+
+    Methods:
+        record(table: str, key: Hashable, item: Optional[object]): Records that an object was saved, or removed if item is None.
+        flush(): Writes all recorded changes.
+        load(table: str, key: Hashable): Returns the stored student, instructor or course with the given ID, or None.
+        load_all(table: str): Yields every stored student, instructor or course in the order they were first saved.
+        load_enrollments(course_id: Optional[int]): Yields the stored enrollments, of one course if course_id is given,
+            as (student_id, course_id, grade) rows.
+        count(table: str): Returns the number of stored objects in a table, including recorded changes.
+        close(): Writes all recorded changes and releases the storage.
+    """
+
+    @abstractmethod
+    def record(self, table: str, key: Hashable, item: Optional[object]) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    def flush(self) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    def load(self, table: str, key: Hashable) -> Optional[object]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def load_all(self, table: str) -> Iterator[object]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def load_enrollments(self, course_id: Optional[int] = None) -> Iterator[Tuple[int, int, Optional[int]]]:
+        raise NotImplementedError
+
+    def count(self, table: str) -> int:
+        # Backends that can count without reading every object override this
+        rows = self.load_enrollments() if table == "enrollments" else self.load_all(table)
+        return sum(1 for _ in rows)
+
+    def close(self) -> None:
+        self.flush()
+
+
+# Attributes that a StudentManagementSystem with storage only sets once the stored enrollments are loaded
+_ENROLLMENT_ATTRIBUTES = ("enrollments", "grades", "_student_enrollments", "_course_enrollments", "_grade_rollups", "_timetables")
+
+
 class StudentManagementSystem:
     """
     Manages students, instructors, courses, and enrollments in the system.
@@ -172,44 +1365,263 @@ class StudentManagementSystem:
     
     Method:
     
-        add_student(student: Student): Adds student object to the list.
+        add_student(student: Student): Adds student object to the list, unless its ID number is taken.
+        add_students(*students: Student): Adds several students at once, skipping taken ID numbers.
         remove_student(id_number: int): Removes a student from the student list using the student ID number.
+        remove_students(*id_numbers: int): Removes several students at once, such as a graduating cohort.
         find_student(id_number: int): Finds a student in the student list using the student ID number.
         update_student(student: Student): Replaces student details in the system
         show_student(self): Returns the list of all the students in the system.
+        iter_students(after_id, limit, where, fields): Lists students a page at a time, in ID order.
+        find_students_by_major(major: str): Returns the students with a given major.
+        search_students(text: str, prefix: bool, limit: Optional[int]): Finds students by part of their name.
         add_instructor(instructor: Instructor): Adds an instructor to the system.
+        add_instructors(*instructors: Instructor): Adds several instructors at once.
         remove_instructor(id_number: int): Removes an instructor from the system by their ID number.
         find_instructor(id_number: int): Finds an instructor by their ID number.
         update_instructor(instructor: Instructor): Updates an instructor's details in the system.
         show_instructors(): Returns a list of all instructors in the system.
-        add_courses(course: Course): Adds a course to the system.
+        iter_instructors(after_id, limit, where, fields): Lists instructors a page at a time, in ID order.
+        find_instructors_by_department(department: str): Returns the instructors in a given department.
+        search_instructors(text: str, prefix: bool, limit: Optional[int]): Finds instructors by part of their name.
+        add_courses(*courses: Course): Adds one or more courses to the system.
         remove_course(course_id: int): Removes a course from the system by its course ID.
+        remove_courses(*course_ids: int): Removes several courses at once.
         find_course(course_id: int): Finds a course by its course ID.
         update_course(course: Course): Updates a course's details in the system.
-        enroll_student_in_courses(student: Student, *courses: Course): Enrolls a student in one or more courses.
+        assign_instructor(course_id: int, instructor_id: Optional[int]): Assigns an instructor to teach a course.
+        courses_for_instructor(instructor_id: int): Returns the courses an instructor teaches.
+        enroll_student_in_courses(student: Student, *courses: Course): Enrolls a student in one or more courses, all or nothing.
+        schedule_students(requests): Enrolls many students in non-clashing sections of the courses they request.
+        subscribe(callback: Callable[[ChangeEvent], None]): Calls a function with every change made from now on.
+        unsubscribe(callback: Callable[[ChangeEvent], None]): Stops calling a subscribed function.
         show_enrollment(): Prints all enrollments in the system.
+        iter_enrollments(after_id, limit, where, fields): Lists enrollments a page at a time, in (student ID, course ID) order.
         assign_grade(student: Student, course: Course, grade: int): Assigns a grade to a student for a specific course.
+        assign_grades_bulk(rows): Assigns many grades given as (student_id, course_id, grade) rows or as columns.
         students_grades(): Returns a dictionary of all students and their grades.
+        iter_students_grades(after_id, limit, where, fields): Lists students' grades a page at a time, in student ID order.
         get_student_grades(student_id: int): Returns the grades for a particular student by their ID.
         studentlist_in_course(course_id: int): Retrieves a list of students enrolled in a specific course by its ID.
+        iter_course_students(course_id, after_id, limit, where, fields): Lists a course's students a page at a time, in ID order.
         student_course_list(student_id: int): Retrieves a list of courses a specific student is enrolled in by their ID.
+        enrollments_for_student(student_id: int): Returns the enrollments of a specific student.
+        enrollments_for_course(course_id: int): Returns the enrollments in a specific course.
+        grades_for_student(student_id: int): Returns a student's grades by course ID.
+        grades_for_course(course_id: int): Returns a course's grades by student ID.
+        course_grade_rollup(course_id: int): Returns the number and average of a course's grades.
+        save(): Writes all pending changes to the storage backend.
+    
+    The lists returned by studentlist_in_course, Course.list_enrolled_students and student_course_list,
+    and the columnar grade maps returned by get_student_grades, are copies of views kept in self.views,
+    a bounded LRU cache that drops a view whenever the student or course it belongs to changes.
+
+    Removing a student or a course cascades: their enrollments, grades, roster and waitlist places and
+    cached views go with them. The cascade follows the enrollment index and the waitlist index, so it
+    only touches the removed objects' own records, and batch removal takes time in proportion to the
+    number of enrollments it drops.
+
+    Each student and each instructor has a timetable, an IntervalIndex of the weekly meetings of the
+    courses they attend or teach, so a time clash is found by a lookup per meeting of the new course.
+
+    Every change made through the system's methods is passed as a ChangeEvent to the subscribed
+    callbacks, in the order the changes are made, after the change; removing a student or a course
+    first reports the removal of its enrollments. Loading from storage is not a change, and neither
+    are waitlist moves. With no subscribers, changes cost a single check.
+
+    The iter_* listings page through the registries with keyset pagination: they yield objects in
+    ascending ID order starting after after_id, so the last ID of one page asks for the next, and a
+    page costs time in proportion to its size (plus the objects a where filter skips), however large
+    the registry. They are generators, evaluated as they are consumed.
+
+    With a storage backend, every change is recorded in the storage as it is made, and nothing is read
+    at startup: students, instructors and courses are loaded one at a time as they are looked up (or all
+    at once when a registry is listed), and the enrollments and grades are loaded the first time they are used.
+    A course is stored with its meetings and its instructor's ID number, so every course is loaded before
+    the instructor methods look at an instructor's courses.
         """
 
-    def __init__(self) -> None:
-        self.students: List[Student] = []
-        self.instructors: List[Instructor] = []
-        self.courses: List[Course] = []
-        self.enrollments: List[Enrollment] = []
-        self.grades: Dict[int, Dict[str, Optional[int]]] = {}  # {"student_id": {"course_name": grade}}
+    def __init__(
+        self, columnar_grades: bool = False, storage: Optional[StorageBackend] = None, view_cache_size: int = 4096
+    ) -> None:
+        """
+        Args:
+            columnar_grades (bool): Keep the grades in a compact GradeStore instead of nested dictionaries.
+            storage (Optional[StorageBackend]): Persist the system's data in this storage backend.
+            view_cache_size (int): The number of derived views (rosters, course lists, grade maps) to cache; 0 turns caching off.
+        """
+        self._storage: Optional[StorageBackend] = storage
+        self.views: ViewCache = ViewCache(view_cache_size)
+        # {student_id: {course_id}} of the registered courses whose waitlist each student is on
+        self._waitlisted: Dict[int, Set[int]] = {}
+        self._subscribers: List[Callable[[ChangeEvent], None]] = []
+        self._instructor_courses: Dict[int, Dict[int, Course]] = {}  # {instructor_id: {course_id: course}}
+        self._teaching: Dict[int, IntervalIndex] = {}  # {instructor_id: meetings of the courses they teach}
+        # The meetings and instructor each registered course was booked with, so that unbooking does not
+        # depend on the course object, which callers may have changed in place since
+        self._meetings: Dict[int, Tuple[MeetingSlot, ...]] = {}  # {course_id: meetings}, for courses with meetings
+        self._assigned: Dict[int, int] = {}  # {course_id: instructor_id}, for courses with an instructor
+        self.grade_store: Optional[GradeStore] = GradeStore() if columnar_grades else None
+        student_indexes = {"major": ValueIndex("major"), "name": NameIndex()}
+        instructor_indexes = {"department": ValueIndex("department"), "name": NameIndex()}
+        if storage is None:
+            self.students: Registry[Student] = Registry("id_number", indexes=student_indexes)
+            self.instructors: Registry[Instructor] = Registry("id_number", indexes=instructor_indexes)
+            self.courses: Registry[Course] = Registry("course_id")
+            self._init_enrollments()
+        else:
+            self.students = Registry(
+                "id_number",
+                lambda key: storage.load("students", key),
+                lambda: storage.load_all("students"),
+                student_indexes,
+            )
+            self.instructors = Registry(
+                "id_number",
+                lambda key: storage.load("instructors", key),
+                lambda: storage.load_all("instructors"),
+                instructor_indexes,
+            )
+            self.courses = Registry(
+                "course_id",
+                lambda key: self._attach(storage.load("courses", key)),
+                lambda: map(self._attach, storage.load_all("courses")),
+            )
+
+    def _init_enrollments(self) -> None:
+        self.enrollments: Registry[Enrollment] = Registry(attrgetter("student_id", "course_id"))
+        # Two-way enrollment index: {student_id: {course_id: enrollment}} and {course_id: {student_id: enrollment}}.
+        # It is also the grade index, as every enrollment holds its grade.
+        self._student_enrollments: Dict[int, Dict[int, Enrollment]] = {}
+        self._course_enrollments: Dict[int, Dict[int, Enrollment]] = {}
+        # {student_id: {course_name: grade}}, read-only: derived from the enrollments, or the grade store
+        self.grades: Mapping[int, Dict[str, Optional[int]]] = (
+            self.grade_store if self.grade_store is not None else GradeView(self._student_enrollments)
+        )
+        self._grade_rollups: Dict[int, List[int]] = {}  # {course_id: [number of grades, sum of grades]}
+        self._timetables: Dict[int, IntervalIndex] = {}  # {student_id: meetings of the courses they are enrolled in}
+
+    def __getattr__(self, name: str) -> object:
+        # Only called for attributes that are not set, i.e. the enrollment data of a system with storage
+        # before its first use.
+        if name in _ENROLLMENT_ATTRIBUTES and self.__dict__.get("_storage") is not None:
+            self._load_enrollments()
+            return getattr(self, name)
+        raise AttributeError(f"'{type(self).__name__}' object has no attribute '{name}'")
+
+    def _load_enrollments(self) -> None:
+        """
+        Loads the stored enrollments and grades into the enrollment index and the course rosters.
+        """
+        self._init_enrollments()
+        self.views.clear()
+        self.students.load_all()
+        self.courses.load_all()
+        for student_id, course_id, grade in self._storage.load_enrollments():
+            student, course = self.students.get(student_id), self.courses.get(course_id)
+            if student is not None and course is not None:
+                self._index(Enrollment(student, course, grade))
+                course.enrolled_students.append(student)
+
+    def _attach(self, course: Optional[Course]) -> Optional[Course]:
+        """
+        Registers a course loaded from storage with the system. Until all enrollments are loaded,
+        the course's roster is read from storage on its own.
+        """
+        if course is not None:
+            course._system = self
+            self._schedule(course)
+            # load_all() loads the courses already looked up again, and drops the copies, which must not be assigned twice
+            if course.course_id not in self._assigned:
+                self._resolve_instructor(course)
+                self._assign(course, notify=False)
+            if "enrollments" not in self.__dict__:
+                for student_id, _, _ in self._storage.load_enrollments(course.course_id):
+                    student = self.students.get(student_id)
+                    if student is not None:
+                        course.enrolled_students.append(student)
+        return course
+
+    def _writing(self) -> ContextManager:
+        """
+        Returns the context that changes to the system's structure run in. A plain system is not
+        shared between threads, so there is nothing to guard; see ConcurrentStudentManagementSystem.
+        """
+        return nullcontext()
+
+    def _persist(self, table: str, key: Hashable, item: Optional[object]) -> None:
+        if self._storage is not None:
+            self._storage.record(table, key, item)
 
-    def add_student(self, student: Student) -> None:
+    def _notify(self, kind: str, table: str, key: Hashable, old: Optional[object], new: Optional[object]) -> None:
+        if self._subscribers:
+            event = ChangeEvent(kind, table, key, old, new)
+            for callback in self._subscribers:
+                callback(event)
+
+    def subscribe(self, callback: Callable[[ChangeEvent], None]) -> None:
+        """
+        Calls a function with a ChangeEvent for every change made to the system from now on. The
+        function is called while the change is made, so it should be quick and must not change the system.
+        
+        Args:
+            callback (Callable[[ChangeEvent], None]): The function to call.
+        """
+        self._subscribers.append(callback)
+
+    def unsubscribe(self, callback: Callable[[ChangeEvent], None]) -> None:
+        """
+        Stops calling a function subscribed with subscribe(), if it is subscribed.
+        
+        Args:
+            callback (Callable[[ChangeEvent], None]): The function to stop calling.
+        """
+        if callback in self._subscribers:
+            self._subscribers.remove(callback)
+
+    def save(self) -> None:
+        """
+        Writes all pending changes to the storage backend, if the system has one.
         """
-        Adds a student to the system.
+        if self._storage is not None:
+            self._storage.flush()
+
+    def add_student(self, student: Student) -> str:
+        """
+        Adds a student to the system, unless a student with the same ID number is already registered.
         
         Args:
             student (Student): The student to be added to the system.
+        
+        Returns:
+            str: A message indicating whether the student was added or their ID number is taken.
         """
+        if self.students.get(student.id_number) is not None:
+            return f"A student with ID {student.id_number} already exists; use update_student to change their details"
         self.students.append(student)
+        self._persist("students", student.id_number, student)
+        self._notify("add", "students", student.id_number, None, student)
+        return f"Student {student.name} has been added."
+
+    def add_students(self, *students: Student) -> str:
+        """
+        Adds several students to the system at once, skipping those whose ID number is already registered.
+        
+        Args:
+            *students (Student): The students to be added to the system.
+        
+        Returns:
+            str: A message with the number of students added and the ID numbers skipped.
+        """
+        skipped = []
+        for student in students:
+            if self.students.get(student.id_number) is not None:
+                skipped.append(student.id_number)
+                continue
+            self.students.append(student)
+            self._persist("students", student.id_number, student)
+            self._notify("add", "students", student.id_number, None, student)
+        return _added("student", len(students) - len(skipped), skipped)
 
     def remove_student(self, id_number: int) -> str:
         """
@@ -221,12 +1633,54 @@ class StudentManagementSystem:
         Returns:
             str: A message indicating whether the student was successfully removed or not found.
         """
-        for student in self.students:
-            if student.id_number == id_number:
-                self.students.remove(student)
-                return f"Student with ID {id_number} has been removed."
+        if self._remove_students((id_number,))[0]:
+            return f"Student with ID {id_number} has been removed."
         return f"No student found with ID {id_number}"
 
+    def remove_students(self, *id_numbers: int) -> str:
+        """
+        Removes several students at once, such as a graduating cohort. Each course that loses students
+        offers its freed seats to its waitlist once, after all the students are removed.
+        
+        Args:
+            *id_numbers (int): The ID numbers of the students to be removed; unknown ID numbers are skipped.
+        
+        Returns:
+            str: A message with the number of students and enrollments removed.
+        """
+        students, enrollments = self._remove_students(id_numbers)
+        return f"{students} student(s) and {enrollments} enrollment(s) have been removed."
+
+    def _remove_students(self, id_numbers: Iterable[int]) -> Tuple[int, int]:
+        """
+        Removes students together with their enrollments, grades, roster and waitlist places and
+        cached views, then promotes from the waitlists of the courses that lost a student.
+        
+        Returns:
+            Tuple[int, int]: The number of students and of enrollments removed.
+        """
+        freed: Dict[int, Course] = {}
+        students = enrollments = 0
+        for id_number in id_numbers:
+            student = self.students.pop(id_number)
+            if student is None:
+                continue
+            students += 1
+            self._persist("students", id_number, None)
+            for course_id in list(self._student_enrollments.get(id_number, ())):
+                freed[course_id] = self._unlink(id_number, course_id).course
+                enrollments += 1
+            for course_id in self._waitlisted.pop(id_number, ()):
+                self.courses.get(course_id)._leave_waitlist(id_number)
+            if self.grade_store is not None:
+                self.grade_store.drop_student(id_number)
+            self.views.invalidate(("courses", id_number))
+            self.views.invalidate(("grades", id_number))
+            self._notify("remove", "students", id_number, student, None)
+        for course in freed.values():
+            course._promote()
+        return students, enrollments
+
     def find_student(self, id_number: int) -> Optional[Tuple[int, Student]]:
         """
         Finds a student by their ID number.
@@ -237,14 +1691,11 @@ class StudentManagementSystem:
         Returns:
             Optional[Tuple[int, Student]]: The index and student object if found, otherwise None.
         """
-        for i, found_student in enumerate(self.students):
-            if found_student.id_number == id_number:
-                return i, found_student
-        return None
+        return self.students.locate(id_number)
 
     def update_student(self, student: Student) -> str:
         """ 
-        It first iterates over the student list and saves the index where the student is located.
+        It first looks up the index where the student is located.
         Then replaces the student's details in the system using the index.
         
         Args:
@@ -253,31 +1704,114 @@ class StudentManagementSystem:
         Returns:
             str: A message indicating that the student data has been updated.
         """
-        i, _ = self.find_student(student.id_number)
+        i, old_student = self.find_student(student.id_number)
         self.students[i] = student
+        self._persist("students", student.id_number, student)
+        self._notify("update", "students", student.id_number, old_student, student)
+        for enrollment in self._student_enrollments.get(student.id_number, {}).values():
+            enrollment.student = student
+            enrollment.course.enrolled_students.append(student)
+            self.views.invalidate(("roster", enrollment.course_id))
         return f"Student data has been updated to {student}"
     
     def show_student(self) -> List[Student]:
         """
-        Returns a list of all students in the system.
+        Returns all students in the system.
+
+        Returns:
+            List[Student]: The student objects, in the order they were added.
+        """
+        return list(self.students)
+
+    def iter_students(
+        self,
+        after_id: Optional[int] = None,
+        limit: Optional[int] = None,
+        where: Optional[Callable[[Student], bool]] = None,
+        fields: Optional[Sequence[str]] = None,
+    ) -> Iterator[Union[Student, Dict[str, object]]]:
+        """
+        Lists the students a page at a time, in ascending ID order.
+        
+        Args:
+            after_id (Optional[int]): Start after this ID number; None to start from the first.
+            limit (Optional[int]): The maximum number of students to yield; None for no limit.
+            where (Optional[Callable[[Student], bool]]): Only yield the students for which this returns True.
+            fields (Optional[Sequence[str]]): Yield dictionaries of these attributes, plus id_number, instead of the objects.
+        
+        Returns:
+            Iterator[Union[Student, Dict[str, object]]]: The students, or their projected fields.
+        """
+        return _paginate(self.students.after(after_id), ("id_number",), limit, where, fields)
+
+    def find_students_by_major(self, major: str) -> List[Student]:
+        """
+        Returns the students with a given major, ignoring case, using the major index.
+        
+        Args:
+            major (str): The major to look for.
+        
+        Returns:
+            List[Student]: The students with that major, in the order they were added.
+        """
+        self.students.load_all()
+        return self.students.indexes["major"].find(major)
+
+    def search_students(self, text: str, prefix: bool = False, limit: Optional[int] = None) -> List[Student]:
+        """
+        Finds students by part of their name, ignoring case, using the name index.
+        
+        Args:
+            text (str): The text to look for in the names.
+            prefix (bool): Only match names with a word that starts with the text.
+            limit (Optional[int]): The maximum number of students to return.
         
         Returns:
-            List[Student]: A list of all student objects.
+            List[Student]: The matching students.
         """
-        return self.students
+        self.students.load_all()
+        return self.students.indexes["name"].search(text, prefix, limit)
 
-    def add_instructor(self, instructor: Instructor) -> None:
+    def add_instructor(self, instructor: Instructor) -> str:
         """
-        Adds an instructor to the system.
+        Adds an instructor to the system, unless an instructor with the same ID number is already registered.
         
         Args:
             instructor (Instructor): The instructor to be added to the system.
+        
+        Returns:
+            str: A message indicating whether the instructor was added or their ID number is taken.
         """
+        if self.instructors.get(instructor.id_number) is not None:
+            return f"An instructor with ID {instructor.id_number} already exists; use update_instructor to change their details"
         self.instructors.append(instructor)
+        self._persist("instructors", instructor.id_number, instructor)
+        self._notify("add", "instructors", instructor.id_number, None, instructor)
+        return f"Instructor {instructor.name} has been added."
+
+    def add_instructors(self, *instructors: Instructor) -> str:
+        """
+        Adds several instructors to the system at once, skipping those whose ID number is already registered.
+        
+        Args:
+            *instructors (Instructor): The instructors to be added to the system.
+        
+        Returns:
+            str: A message with the number of instructors added and the ID numbers skipped.
+        """
+        skipped = []
+        for instructor in instructors:
+            if self.instructors.get(instructor.id_number) is not None:
+                skipped.append(instructor.id_number)
+                continue
+            self.instructors.append(instructor)
+            self._persist("instructors", instructor.id_number, instructor)
+            self._notify("add", "instructors", instructor.id_number, None, instructor)
+        return _added("instructor", len(instructors) - len(skipped), skipped)
 
     def remove_instructor(self, id_number: int) -> str:
         """
-        Removes an instructor from the system by their ID number.
+        Removes an instructor from the system by their ID number. The courses they taught are left without an instructor.
         
         Args:
             id_number (int): The ID number of the instructor to be removed.
@@ -285,10 +1819,16 @@ class StudentManagementSystem:
         Returns:
             str: A message indicating whether the instructor was successfully removed or not found.
         """
-        for instructor in self.instructors:
-            if instructor.id_number == id_number:
-                self.instructors.remove(instructor)
-                return f"Instructor with ID {id_number} has been removed."
+        self.courses.load_all()  # The instructor's course list is only complete once every course is loaded
+        instructor = self.instructors.pop(id_number)
+        if instructor is not None:
+            self._persist("instructors", id_number, None)
+            for course in list(self._instructor_courses.get(id_number, {}).values()):
+                self._unassign(course.course_id)
+                course.instructor = None
+                self._persist("courses", course.course_id, course)
+            self._notify("remove", "instructors", id_number, instructor, None)
+            return f"Instructor with ID {id_number} has been removed."
         return "No instructor found with the given ID"
 
     def find_instructor(self, id_number: int) -> Optional[Tuple[int, Instructor]]:
@@ -301,10 +1841,7 @@ class StudentManagementSystem:
         Returns:
             Optional[Tuple[int, Instructor]]: The index and instructor object if found, otherwise None.
         """
-        for i, found_instructor in enumerate(self.instructors):
-            if found_instructor.id_number == id_number:
-                return i, found_instructor
-        return None
+        return self.instructors.locate(id_number)
 
     def update_instructor(self, instructor: Instructor) -> str:
         """
@@ -316,27 +1853,103 @@ class StudentManagementSystem:
         Returns:
             str: A message indicating that the instructor data has been updated.
         """
-        i, _ = self.find_instructor(instructor.id_number)
+        self.courses.load_all()
+        i, old_instructor = self.find_instructor(instructor.id_number)
         self.instructors[i] = instructor
+        self._persist("instructors", instructor.id_number, instructor)
+        self._notify("update", "instructors", instructor.id_number, old_instructor, instructor)
+        for course in self._instructor_courses.get(instructor.id_number, {}).values():
+            course.instructor = instructor
         return f"Instructor data has been updated to {instructor}"
     
     def show_instructors(self) -> List[Instructor]:
         """
-        Returns a list of all instructors in the system.
+        Returns all instructors in the system.
+
+        Returns:
+            List[Instructor]: The instructor objects, in the order they were added.
+        """
+        return list(self.instructors)
+
+    def iter_instructors(
+        self,
+        after_id: Optional[int] = None,
+        limit: Optional[int] = None,
+        where: Optional[Callable[[Instructor], bool]] = None,
+        fields: Optional[Sequence[str]] = None,
+    ) -> Iterator[Union[Instructor, Dict[str, object]]]:
+        """
+        Lists the instructors a page at a time, in ascending ID order.
+        
+        Args:
+            after_id (Optional[int]): Start after this ID number; None to start from the first.
+            limit (Optional[int]): The maximum number of instructors to yield; None for no limit.
+            where (Optional[Callable[[Instructor], bool]]): Only yield the instructors for which this returns True.
+            fields (Optional[Sequence[str]]): Yield dictionaries of these attributes, plus id_number, instead of the objects.
+        
+        Returns:
+            Iterator[Union[Instructor, Dict[str, object]]]: The instructors, or their projected fields.
+        """
+        return _paginate(self.instructors.after(after_id), ("id_number",), limit, where, fields)
+
+    def find_instructors_by_department(self, department: str) -> List[Instructor]:
+        """
+        Returns the instructors in a given department, ignoring case, using the department index.
+        
+        Args:
+            department (str): The department to look for.
+        
+        Returns:
+            List[Instructor]: The instructors in that department, in the order they were added.
+        """
+        self.instructors.load_all()
+        return self.instructors.indexes["department"].find(department)
+
+    def search_instructors(self, text: str, prefix: bool = False, limit: Optional[int] = None) -> List[Instructor]:
+        """
+        Finds instructors by part of their name, ignoring case, using the name index.
+        
+        Args:
+            text (str): The text to look for in the names.
+            prefix (bool): Only match names with a word that starts with the text.
+            limit (Optional[int]): The maximum number of instructors to return.
         
         Returns:
-            List[Instructor]: A list of all instructor objects.
+            List[Instructor]: The matching instructors.
         """
-        return self.instructors
+        self.instructors.load_all()
+        return self.instructors.indexes["name"].search(text, prefix, limit)
 
-    def add_courses(self, course: Course) -> None:
+    def add_courses(self, *courses: Course) -> str:
         """
-        Adds a course to the system.
+        Adds one or more courses to the system, skipping those whose ID is already registered. Students
+        already on a course's roster are enrolled, and its instructor, if it has one, is assigned without
+        checking their timetable for clashes.
         
         Args:
-            course (Course): The course to be added to the system.
+            *courses (Course): The courses to be added to the system.
+        
+        Returns:
+            str: A message with the number of courses added and the IDs skipped.
         """
-        self.courses.append(course)
+        skipped = []
+        for course in courses:
+            if self.courses.get(course.course_id) is not None:
+                skipped.append(course.course_id)
+                continue
+            self.courses.append(course)
+            self._persist("courses", course.course_id, course)
+            self._notify("add", "courses", course.course_id, None, course)
+            course._system = self
+            self._schedule(course)
+            self._resolve_instructor(course)
+            self._assign(course)
+            self.views.invalidate(("roster", course.course_id))
+            for student in course.enrolled_students:
+                self._link(student, course)
+            for student_id in course._tickets:
+                self._waitlisted.setdefault(student_id, set()).add(course.course_id)
+        return _added("course", len(courses) - len(skipped), skipped)
     
     def remove_course(self, course_id: int) -> str:
         """
@@ -348,16 +1961,55 @@ class StudentManagementSystem:
         Returns:
             str: A message indicating whether the course was successfully removed or not found.
         """
-        for course in self.courses:
-            if course.course_id == course_id:
-                self.courses.remove(course)
-                return f"Course with ID {course_id} has been removed."
+        if self._remove_courses((course_id,))[0]:
+            return f"Course with ID {course_id} has been removed."
         return "No course found with the given ID"
 
+    def remove_courses(self, *course_ids: int) -> str:
+        """
+        Removes several courses at once.
+        
+        Args:
+            *course_ids (int): The IDs of the courses to be removed; unknown IDs are skipped.
+        
+        Returns:
+            str: A message with the number of courses and enrollments removed.
+        """
+        courses, enrollments = self._remove_courses(course_ids)
+        return f"{courses} course(s) and {enrollments} enrollment(s) have been removed."
+
+    def _remove_courses(self, course_ids: Iterable[int]) -> Tuple[int, int]:
+        """
+        Removes courses together with their enrollments, the grades of those enrollments and cached
+        views. A removed course keeps its details but is left with an empty roster and waitlist.
+        
+        Returns:
+            Tuple[int, int]: The number of courses and of enrollments removed.
+        """
+        courses = enrollments = 0
+        for course_id in course_ids:
+            course = self.courses.pop(course_id)
+            if course is None:
+                continue
+            courses += 1
+            self._persist("courses", course_id, None)
+            for student_id in list(self._course_enrollments.get(course_id, ())):
+                self._unlink(student_id, course_id)
+                enrollments += 1
+            for student_id in course._tickets:
+                self._forget_waitlisted(student_id, course_id)
+            course._waitlist.clear()
+            course._tickets.clear()
+            course._system = None
+            self._unassign(course_id)
+            self._meetings.pop(course_id, None)
+            self.views.invalidate(("roster", course_id))
+            self._notify("remove", "courses", course_id, course, None)
+        return courses, enrollments
+
     def find_course(self, course_id: int) -> Optional[Tuple[int, Course]]:
         """
-        Loops through self.courses and returns the index where the course is found by comparing the id of the course 
-        and the given course id.
+        Looks up the course id in self.courses and returns the index where the course is found.
         
         Args:
             course_id (int): The id of the course to find.
@@ -365,15 +2017,13 @@ class StudentManagementSystem:
         Returns:
             Optional[Tuple[int, Course]]: The index and course object if found, otherwise None.
         """
-        for i, found_course in enumerate(self.courses):
-            if found_course.course_id == course_id:
-                return i, found_course
-        return None
+        return self.courses.locate(course_id)
     
     def update_course(self, course: Course) -> str:
         """
         Find the course using the previous find_course method, 
         and replace the course in the index location with another course.
+        The new details include the meetings and the instructor; a change of meetings is not checked for clashes.
         
         Args:
             course (Course): The course with updated details.
@@ -381,29 +2031,340 @@ class StudentManagementSystem:
         Returns:
             str: A message indicating that the course data has been updated.
         """
-        i, _ = self.find_course(course.course_id)
+        i, old_course = self.find_course(course.course_id)
+        old_course._system = None
+        # Unbook what was booked rather than old_course's details, as the caller may have changed it in place
+        self._unassign(course.course_id)
+        old_meetings = self._meetings.get(course.course_id, ())
+        self._schedule(course)
+        meetings = self._meetings.get(course.course_id, ())
+        if meetings != old_meetings:
+            for student_id in self._course_enrollments.get(course.course_id, ()):
+                _unbook(self._timetables, student_id, course.course_id, old_meetings)
+                _book(self._timetables, student_id, course.course_id, meetings)
+        # The roster and the waitlist belong to the course ID, so they carry over to the new details
+        course.enrolled_students = old_course.enrolled_students
+        course._waitlist, course._tickets, course._next_ticket = old_course._waitlist, old_course._tickets, old_course._next_ticket
         self.courses[i] = course
+        self._persist("courses", course.course_id, course)
+        self._notify("update", "courses", course.course_id, old_course, course)
+        course._system = self
+        self._resolve_instructor(course)
+        self._assign(course)
+        for enrollment in self._course_enrollments.get(course.course_id, {}).values():
+            enrollment.course = course
+            self.views.invalidate(("courses", enrollment.student_id))
+            self.views.invalidate(("grades", enrollment.student_id))
+        if self.grade_store is not None:
+            self.grade_store.rename_course(course.course_id, course.course_name)
+        course._promote()
         return f"Course data has been updated to {course}"
+
+    def assign_instructor(self, course_id: int, instructor_id: Optional[int]) -> str:
+        """
+        Assigns an instructor to teach a course, in place of its current instructor, unless the course
+        meets at the same time as another course the instructor teaches.
+        
+        Args:
+            course_id (int): The ID of the course.
+            instructor_id (Optional[int]): The ID number of the instructor, or None to leave the course without one.
+        
+        Returns:
+            str: A message indicating whether the instructor was assigned, or why not.
+        """
+        course = self.courses.get(course_id)
+        if course is None:
+            return "Course not found."
+        instructor = None
+        if instructor_id is not None:
+            instructor = self.instructors.get(instructor_id)
+            if instructor is None:
+                return "Instructor not found."
+            self.courses.load_all()  # The instructor's timetable is only complete once every course is loaded
+            timetable = self._teaching.get(instructor_id)
+            if timetable is not None:
+                for meeting in self._meetings.get(course_id, ()):
+                    clashes = [other_id for other_id in timetable.overlapping(*meeting.week_interval()) if other_id != course_id]
+                    if clashes:
+                        other = self._instructor_courses[instructor_id][clashes[0]]
+                        return f"{instructor.name} cannot teach {course.course_name}: it clashes with {other.course_name}"
+        self._unassign(course_id)
+        course.instructor = instructor
+        self._persist("courses", course_id, course)
+        self._assign(course)
+        if instructor is None:
+            return f"{course.course_name} no longer has an instructor"
+        return f"{instructor.name} has been assigned to teach {course.course_name}"
+
+    def courses_for_instructor(self, instructor_id: int) -> List[Course]:
+        """
+        Returns the courses an instructor teaches.
+        
+        Args:
+            instructor_id (int): The ID number of the instructor.
+        
+        Returns:
+            List[Course]: The courses the instructor is assigned to, in the order they were assigned.
+        """
+        self.courses.load_all()
+        return list(self._instructor_courses.get(instructor_id, {}).values())
     
     def enroll_student_in_courses(self, student: Student, *courses: Course) -> str:
         """
-        Enrolls a student in one or more courses.
+        Enrolls a student in one or more courses, all or nothing: if any of the courses is full
+        (and the student is not already enrolled in it), or meets at the same time as another of the
+        courses or as a course the student is already enrolled in, the student is enrolled in none of them.
         
         Args:
             student (Student): The student to enroll.
             *courses (Course): One or more courses to enroll the student in.
         
         Returns:
-            str: A message indicating how many courses the student has been enrolled in.
+            str: A message indicating how many courses the student has been enrolled in, or which courses are full or clash.
         """
+        full = [
+            course for course in courses
+            if course.is_full() and student.id_number not in self._course_enrollments.get(course.course_id, ())
+        ]
+        if full:
+            return f"{student.name} has not been enrolled; full course(s): {', '.join(course.course_name for course in full)}"
+        clashes = self._clashes(student.id_number, courses)
+        if clashes:
+            pairs = ", ".join(f"{course.course_name} with {other.course_name}" for course, other in clashes)
+            return f"{student.name} has not been enrolled; time clash(es): {pairs}"
         for course in courses:
-            enrollment = Enrollment(student, course)
-            self.enrollments.append(enrollment)
-            if student.id_number not in self.grades:
-                self.grades[student.id_number] = {}
-            self.grades[student.id_number][course.course_name] = None
+            self._link(student, course)
         return f"{student.name} has been enrolled in {len(courses)} course(s)"
 
+    def schedule_students(self, requests: Iterable[Tuple[int, Sequence[str]]]) -> ScheduleReport:
+        """
+        Enrolls many students at once, each in one section of every course they request, so that none
+        of a student's sections meet at the same time as each other or as the courses the student is
+        already enrolled in, and no section goes over its capacity. Courses with the same name are the
+        sections of one course.
+
+        The requests are served first come, first served, in a single pass. For each student the courses
+        with the fewest open sections are placed first, trying the sections with the most free seats
+        first, and a depth-first search backtracks when a choice leaves no section for a later course.
+        If no choice fits every course (or SCHEDULE_SEARCH_LIMIT choices have been tried), the courses
+        are placed one by one in the first section that fits, and the rest are reported as unscheduled.
+        A request for a course the student is already enrolled in, in any section, is already met.
+        
+        Args:
+            requests (Iterable[Tuple[int, Sequence[str]]]): (student_id, course names) pairs.
+        
+        Returns:
+            ScheduleReport: The sections each student was enrolled in, and the requests that could not be scheduled.
+        """
+        sections: Dict[str, List[Course]] = {}
+        intervals: Dict[int, List[Tuple[int, int]]] = {}
+        for course in self.courses:
+            sections.setdefault(course.course_name, []).append(course)
+            intervals[course.course_id] = [meeting.week_interval() for meeting in course.meetings]
+        report = ScheduleReport()
+        for student_id, course_names in requests:
+            student = self.students.get(student_id)
+            if student is None:
+                for course_name in course_names:
+                    report.unschedule(student_id, course_name, "unknown student")
+                continue
+            enrolled = {enrollment.course.course_name for enrollment in self._student_enrollments.get(student_id, {}).values()}
+            timetable = self._timetables.get(student_id)
+            wanted: List[List[Course]] = []  # The open sections of each requested course, most free seats first
+            for course_name in dict.fromkeys(course_names):
+                if course_name in enrolled:
+                    continue
+                options = sections.get(course_name)
+                if options is None:
+                    report.unschedule(student_id, course_name, "unknown course")
+                    continue
+                seats = sorted(((_free_seats(course), course) for course in options), key=itemgetter(0), reverse=True)
+                open_sections = [course for free, course in seats if free > 0]
+                if not open_sections:
+                    report.unschedule(student_id, course_name, "full")
+                    continue
+                if timetable is not None:
+                    open_sections = [
+                        course for course in open_sections
+                        if not any(timetable.overlapping(start, end) for start, end in intervals[course.course_id])
+                    ]
+                    if not open_sections:
+                        report.unschedule(student_id, course_name, "time clash")
+                        continue
+                wanted.append(open_sections)
+            wanted.sort(key=len)
+            chosen = _fit_sections(wanted, intervals)
+            if chosen is None:
+                chosen, booked = [], []
+                for options in wanted:
+                    for course in options:
+                        if not _overlap(intervals[course.course_id], booked):
+                            chosen.append(course)
+                            booked += intervals[course.course_id]
+                            break
+                    else:
+                        report.unschedule(student_id, options[0].course_name, "time clash")
+            for course in chosen:
+                self._link(student, course)
+            if chosen:
+                report.enrolled[student_id] = [course.course_id for course in chosen]
+        return report
+
+    def _link(self, student: Student, course: Course) -> Enrollment:
+        """
+        Records an enrollment in self.enrollments, the two-way enrollment index, the grades and the
+        course's roster, unless the student is already enrolled in the course. Capacity is not checked here.
+        
+        Returns:
+            Enrollment: The new or existing enrollment.
+        """
+        enrollment = self._student_enrollments.get(student.id_number, {}).get(course.course_id)
+        if enrollment is None:
+            enrollment = self._index(Enrollment(student, course))
+            course.enrolled_students.append(student)
+            self.views.invalidate(("roster", course.course_id))
+            self.views.invalidate(("courses", student.id_number))
+            self._persist("enrollments", (student.id_number, course.course_id), enrollment)
+            self._notify("add", "enrollments", (student.id_number, course.course_id), None, enrollment.grade)
+        return enrollment
+
+    def _index(self, enrollment: Enrollment) -> Enrollment:
+        self.enrollments.append(enrollment)
+        self._student_enrollments.setdefault(enrollment.student_id, {})[enrollment.course_id] = enrollment
+        self._course_enrollments.setdefault(enrollment.course_id, {})[enrollment.student_id] = enrollment
+        self._set_grade(enrollment.student_id, enrollment.course, enrollment.grade)
+        self._rollup(enrollment.course_id, None, enrollment.grade)
+        meetings = self._meetings.get(enrollment.course_id)
+        if meetings:
+            _book(self._timetables, enrollment.student_id, enrollment.course_id, meetings)
+        return enrollment
+
+    def _unlink(self, student_id: int, course_id: int) -> Optional[Enrollment]:
+        """
+        Drops an enrollment from self.enrollments, the two-way enrollment index, the grades and the
+        course's roster. The freed seat is not offered to the waitlist here; see Course._promote.
+        
+        Returns:
+            Optional[Enrollment]: The dropped enrollment, or None if the student was not enrolled in the course.
+        """
+        course_enrollments = self._student_enrollments.get(student_id)
+        enrollment = course_enrollments.pop(course_id, None) if course_enrollments else None
+        if enrollment is None:
+            return None
+        if not course_enrollments:
+            del self._student_enrollments[student_id]
+        student_enrollments = self._course_enrollments[course_id]
+        del student_enrollments[student_id]
+        if not student_enrollments:
+            del self._course_enrollments[course_id]
+        self.enrollments.pop((student_id, course_id))
+        enrollment.course.enrolled_students.pop(student_id)
+        self.views.invalidate(("roster", course_id))
+        self.views.invalidate(("courses", student_id))
+        self._drop_grade(student_id, enrollment.course)
+        self._rollup(course_id, enrollment.grade, None)
+        meetings = self._meetings.get(course_id)
+        if meetings:
+            _unbook(self._timetables, student_id, course_id, meetings)
+        self._persist("enrollments", (student_id, course_id), None)
+        self._notify("remove", "enrollments", (student_id, course_id), enrollment.grade, None)
+        return enrollment
+
+    def _clashes(self, student_id: int, courses: Sequence[Course]) -> List[Tuple[Course, Course]]:
+        """
+        Finds the time clashes that enrolling a student in some courses would cause, with the courses
+        the student is enrolled in and among the new courses themselves. Courses the student is
+        already enrolled in are skipped.
+        
+        Returns:
+            List[Tuple[Course, Course]]: (new course, course it clashes with) pairs.
+        """
+        enrolled = self._student_enrollments.get(student_id, {})
+        timetable = self._timetables.get(student_id)
+        clashes: Dict[Tuple[Course, Course], None] = {}
+        booked: List[Tuple[int, int, Course]] = []
+        for course in courses:
+            if course.course_id in enrolled:
+                continue
+            intervals = [meeting.week_interval() for meeting in course.meetings]
+            for start, end in intervals:
+                if timetable is not None:
+                    for course_id in timetable.overlapping(start, end):
+                        other = enrolled.get(course_id)
+                        if other is not None:  # Skips what is left of a course the student has since left
+                            clashes[course, other.course] = None
+                for other_start, other_end, other in booked:
+                    if other_start < end and start < other_end and other is not course:
+                        clashes[course, other] = None
+            booked.extend((start, end, course) for start, end in intervals)
+        return list(clashes)
+
+    def _schedule(self, course: Course) -> None:
+        """Records the meetings a registered course is booked with in the timetables."""
+        if course.meetings:
+            self._meetings[course.course_id] = tuple(course.meetings)
+        else:
+            self._meetings.pop(course.course_id, None)
+
+    def _resolve_instructor(self, course: Course) -> None:
+        """Replaces an instructor given by ID number with the registered instructor, or with None if there is none."""
+        if course.instructor is None and course.instructor_id is not None:
+            course.instructor = self.instructors.get(course.instructor_id)
+
+    def _assign(self, course: Course, notify: bool = True) -> None:
+        """Records a course's instructor, if it has one, in the instructor's course list and timetable."""
+        if course.instructor is not None:
+            instructor_id = course.instructor_id
+            self._assigned[course.course_id] = instructor_id
+            self._instructor_courses.setdefault(instructor_id, {})[course.course_id] = course
+            _book(self._teaching, instructor_id, course.course_id, self._meetings.get(course.course_id, ()))
+            if notify:
+                self._notify("add", "teaching", (instructor_id, course.course_id), None, None)
+
+    def _unassign(self, course_id: int) -> None:
+        """Drops a course from the course list and timetable of the instructor it was assigned to, if any."""
+        instructor_id = self._assigned.pop(course_id, None)
+        if instructor_id is not None:
+            courses = self._instructor_courses[instructor_id]
+            del courses[course_id]
+            if not courses:
+                del self._instructor_courses[instructor_id]
+            _unbook(self._teaching, instructor_id, course_id, self._meetings.get(course_id, ()))
+            self._notify("remove", "teaching", (instructor_id, course_id), None, None)
+
+    def _forget_waitlisted(self, student_id: int, course_id: int) -> None:
+        course_ids = self._waitlisted.get(student_id)
+        if course_ids is not None:
+            course_ids.discard(course_id)
+            if not course_ids:
+                del self._waitlisted[student_id]
+
+    def _set_grade(self, student_id: int, course: Course, grade: Optional[int]) -> None:
+        if self.grade_store is not None:
+            self.grade_store.set(student_id, course.course_id, course.course_name, grade)
+        self.views.invalidate(("grades", student_id))
+
+    def _drop_grade(self, student_id: int, course: Course) -> None:
+        if self.grade_store is not None:
+            self.grade_store.discard(student_id, course.course_id)
+        self.views.invalidate(("grades", student_id))
+
+    def _rollup(self, course_id: int, old_grade: Optional[int], grade: Optional[int]) -> None:
+        """
+        Moves a course's grade rollup from an enrollment's old grade to its new one, either of which may be None.
+        """
+        rollup = self._grade_rollups.get(course_id)
+        if rollup is None:
+            rollup = self._grade_rollups[course_id] = [0, 0]
+        if old_grade is not None:
+            rollup[0] -= 1
+            rollup[1] -= old_grade
+        if grade is not None:
+            rollup[0] += 1
+            rollup[1] += grade
+        if not rollup[0]:
+            del self._grade_rollups[course_id]
+
     def show_enrollment(self) -> None:
         """
         Prints all enrollments in the system.
@@ -411,6 +2372,28 @@ class StudentManagementSystem:
         for enrollment in self.enrollments:
             print(enrollment)
 
+    def iter_enrollments(
+        self,
+        after_id: Optional[Tuple[int, int]] = None,
+        limit: Optional[int] = None,
+        where: Optional[Callable[[Enrollment], bool]] = None,
+        fields: Optional[Sequence[str]] = None,
+    ) -> Iterator[Union[Enrollment, Dict[str, object]]]:
+        """
+        Lists the enrollments a page at a time, in ascending (student ID, course ID) order; unlike
+        show_enrollment, nothing is printed or formatted.
+        
+        Args:
+            after_id (Optional[Tuple[int, int]]): Start after this (student ID, course ID); None to start from the first.
+            limit (Optional[int]): The maximum number of enrollments to yield; None for no limit.
+            where (Optional[Callable[[Enrollment], bool]]): Only yield the enrollments for which this returns True.
+            fields (Optional[Sequence[str]]): Yield dictionaries of these attributes, plus student_id and course_id, instead of the objects.
+        
+        Returns:
+            Iterator[Union[Enrollment, Dict[str, object]]]: The enrollments, or their projected fields.
+        """
+        return _paginate(self.enrollments.after(after_id), ("student_id", "course_id"), limit, where, fields)
+
     def assign_grade(self, student: Student, course: Course, grade: int) -> str:
         """
         Assigns a grade to a student for a specific course.
@@ -418,28 +2401,119 @@ class StudentManagementSystem:
         Args:
             student (Student): The student to whom the grade is assigned.
             course (Course): The course for which the grade is assigned.
-            grade (int): The grade to assign.
+            grade (int): The grade to assign, from MIN_GRADE to MAX_GRADE; anything else raises ValueError
+                before anything is changed.
         
         Returns:
             str: A message indicating that the grade has been assigned.
         """
-        for enrollment in self.enrollments:
-            if enrollment.student == student and enrollment.course == course:
-                enrollment.assign_grade(grade)
-                self.grades[student.id_number][course.course_name] = grade
+        _check_grade(grade)
+        enrollment = self._student_enrollments.get(student.id_number, {}).get(course.course_id)
+        if enrollment is not None:
+            old_grade = enrollment.grade
+            self._set_grade(student.id_number, course, grade)
+            enrollment.assign_grade(grade)
+            self._rollup(course.course_id, old_grade, grade)
+            self._persist("enrollments", (student.id_number, course.course_id), enrollment)
+            self._notify("update", "enrollments", (student.id_number, course.course_id), old_grade, grade)
         return f"Grade {grade} assigned to student {student.name} for course {course.course_name}"
+
+    def assign_grades_bulk(
+        self,
+        rows: Optional[Iterable[Tuple[int, int, int]]] = None,
+        student_ids: Optional[Sequence[int]] = None,
+        course_ids: Optional[Sequence[int]] = None,
+        grades: Optional[Sequence[int]] = None,
+    ) -> BulkGradeReport:
+        """
+        Assigns many grades at once, either from (student_id, course_id, grade) rows or from three
+        parallel columns. The grades are range-checked in one pass before any are applied, and each
+        row is resolved through the enrollment index.
+        
+        Args:
+            rows (Optional[Iterable[Tuple[int, int, int]]]): The (student_id, course_id, grade) rows.
+            student_ids (Optional[Sequence[int]]): The student ID column, used when rows is not given.
+            course_ids (Optional[Sequence[int]]): The course ID column, used when rows is not given.
+            grades (Optional[Sequence[int]]): The grade column, used when rows is not given.
         
-    def students_grades(self) -> Dict[int, Dict[str, Optional[int]]]:
+        Returns:
+            BulkGradeReport: The number of grades assigned and the row numbers that were rejected, by reason.
+        """
+        if rows is not None:
+            student_ids, course_ids, grades = tuple(zip(*rows)) or ((), (), ())
+        if not len(student_ids) == len(course_ids) == len(grades):
+            raise ValueError("student_ids, course_ids and grades must have the same length")
+
+        valid_grades = [_is_grade(grade) for grade in grades]
+        report = BulkGradeReport()
+        index = self._student_enrollments
+        for row, (student_id, course_id, grade, valid) in enumerate(zip(student_ids, course_ids, grades, valid_grades)):
+            if not valid:
+                report.reject(row, "invalid grade")
+                continue
+            enrollment = index.get(student_id, {}).get(course_id)
+            if enrollment is not None:
+                old_grade = enrollment.grade
+                self._set_grade(student_id, enrollment.course, grade)
+                enrollment.grade = grade  # Already range-checked
+                self._rollup(course_id, old_grade, grade)
+                self._persist("enrollments", (student_id, course_id), enrollment)
+                self._notify("update", "enrollments", (student_id, course_id), old_grade, grade)
+                report.applied += 1
+            elif self.students.get(student_id) is None:
+                report.reject(row, "unknown student")
+            elif self.courses.get(course_id) is None:
+                report.reject(row, "unknown course")
+            else:
+                report.reject(row, "not enrolled")
+        return report
+
+    def students_grades(self) -> Mapping[int, Dict[str, Optional[int]]]:
        
 
         """
         Returns a dictionary of all students and their grades.
+        This is a read-only view, derived from the enrollments or, with columnar grades, the grade store.
         
         Returns:
-            Dict[int, Dict[str, Optional[int]]]: A dictionary where the keys are student IDs and values are dictionaries of course names and grades.
+            Mapping[int, Dict[str, Optional[int]]]: A dictionary where the keys are student IDs and values are dictionaries of course names and grades.
         """
         return self.grades
 
+    def iter_students_grades(
+        self,
+        after_id: Optional[int] = None,
+        limit: Optional[int] = None,
+        where: Optional[Callable[[Tuple[int, Dict[str, Optional[int]]]], bool]] = None,
+        fields: Optional[Sequence[str]] = None,
+    ) -> Iterator[Tuple[int, Dict[str, Optional[int]]]]:
+        """
+        Lists the grades of the students with enrollments a page at a time, in ascending student ID
+        order, walking the enrollments in key order.
+        
+        Args:
+            after_id (Optional[int]): Start after this student ID; None to start from the first.
+            limit (Optional[int]): The maximum number of students to yield; None for no limit.
+            where (Optional[Callable[[Tuple[int, Dict[str, Optional[int]]]], bool]]): Only yield the
+                (student ID, grades) pairs for which this returns True.
+            fields (Optional[Sequence[str]]): Only keep the grades of these course names.
+        
+        Returns:
+            Iterator[Tuple[int, Dict[str, Optional[int]]]]: (student ID, {course name: grade}) pairs.
+        """
+        def students_grades() -> Iterator[Tuple[int, Dict[str, Optional[int]]]]:
+            previous = None
+            for enrollment in self.enrollments.after(None if after_id is None else (after_id, inf)):
+                student_id = enrollment.student_id
+                if student_id != previous:
+                    previous = student_id
+                    grades = self.grades.get(student_id)
+                    if fields is not None:
+                        grades = {course_name: grades[course_name] for course_name in fields if course_name in grades}
+                    yield student_id, grades
+
+        return _paginate(students_grades(), (), limit, where, None)
+
     def get_student_grades(self, student_id: int) -> Optional[Dict[str, Optional[int]]]:
         """
         Returns the grades for a particular student by their ID.
@@ -450,7 +2524,10 @@ class StudentManagementSystem:
         Returns:
             Optional[Dict[str, Optional[int]]]: A dictionary of course names and grades for the specified student, or None if the student is not found.
         """
-        return self.grades.get(student_id)
+        # Cached in both modes, as the GradeView derives a new map on every read; _set_grade and _drop_grade
+        # drop the cached map whenever one of the student's grades changes
+        grades = self.views.get(("grades", student_id), lambda: self.grades.get(student_id))
+        return None if grades is None else dict(grades)
     
     def studentlist_in_course(self, course_id: int) -> Union[List[str], str]:
         """
@@ -462,7 +2539,7 @@ class StudentManagementSystem:
         Returns:
             Union[List[str], str]: A list of student names enrolled in the course, or a message indicating no students or course not found.
         """
-        course_object = next((course for course in self.courses if course.course_id == course_id), None)
+        course_object = self.courses.get(course_id)
         if course_object:
             enrolled_students = course_object.list_enrolled_students()
             if enrolled_students:
@@ -472,6 +2549,32 @@ class StudentManagementSystem:
         else:
             return "Course not found."
 
+    def iter_course_students(
+        self,
+        course_id: int,
+        after_id: Optional[int] = None,
+        limit: Optional[int] = None,
+        where: Optional[Callable[[Student], bool]] = None,
+        fields: Optional[Sequence[str]] = None,
+    ) -> Iterator[Union[Student, Dict[str, object]]]:
+        """
+        Lists the students enrolled in a course a page at a time, in ascending ID order.
+        
+        Args:
+            course_id (int): The ID of the course; an unknown course has no students.
+            after_id (Optional[int]): Start after this ID number; None to start from the first.
+            limit (Optional[int]): The maximum number of students to yield; None for no limit.
+            where (Optional[Callable[[Student], bool]]): Only yield the students for which this returns True.
+            fields (Optional[Sequence[str]]): Yield dictionaries of these attributes, plus id_number, instead of the objects.
+        
+        Returns:
+            Iterator[Union[Student, Dict[str, object]]]: The students, or their projected fields.
+        """
+        course = self.courses.get(course_id)
+        if course is None:
+            return iter(())
+        return _paginate(course.enrolled_students.after(after_id), ("id_number",), limit, where, fields)
+
     def student_course_list(self, student_id: int) -> Union[List[str], str]:
         """
         Retrieves a list of courses a specific student is enrolled in by their ID.
@@ -482,14 +2585,80 @@ class StudentManagementSystem:
         Returns:
             Union[List[str], str]: A list of course names the student is enrolled in, or a message indicating no courses or student not found.
         """
-        student_object = next((student for student in self.students if student.id_number == student_id), None)
+        student_object = self.students.get(student_id)
         if student_object:
-            enrolled_courses = [
-                course.course_name for course in self.courses if student_object in course.enrolled_students
-            ]
+            enrolled_courses = list(
+                self.views.get(
+                    ("courses", student_id),
+                    lambda: [enrollment.course.course_name for enrollment in self.enrollments_for_student(student_id)],
+                )
+            )
             if enrolled_courses:
                 return enrolled_courses
             else:
                 return f"Student {student_object.name} is not enrolled in any courses."
         else:
-            return "Student not found."
\ No newline at end of file
+            return "Student not found."
+
+    def enrollments_for_student(self, student_id: int) -> List[Enrollment]:
+        """
+        Returns the enrollments of a specific student by their ID, using the enrollment index.
+        
+        Args:
+            student_id (int): The ID of the student.
+        
+        Returns:
+            List[Enrollment]: The student's enrollments, in the order they were made.
+        """
+        return list(self._student_enrollments.get(student_id, {}).values())
+
+    def grades_for_student(self, student_id: int) -> Dict[int, Optional[int]]:
+        """
+        Returns the grades of a specific student by their ID, keyed by course ID, using the enrollment index.
+        Unlike get_student_grades, courses that share a name are kept apart.
+        
+        Args:
+            student_id (int): The ID of the student.
+        
+        Returns:
+            Dict[int, Optional[int]]: The grade for each course the student is enrolled in, or None if ungraded.
+        """
+        return {course_id: enrollment.grade for course_id, enrollment in self._student_enrollments.get(student_id, {}).items()}
+
+    def grades_for_course(self, course_id: int) -> Dict[int, Optional[int]]:
+        """
+        Returns the grades in a specific course by its ID, keyed by student ID, using the enrollment index.
+        
+        Args:
+            course_id (int): The ID of the course.
+        
+        Returns:
+            Dict[int, Optional[int]]: The grade of each student enrolled in the course, or None if ungraded.
+        """
+        return {student_id: enrollment.grade for student_id, enrollment in self._course_enrollments.get(course_id, {}).items()}
+
+    def course_grade_rollup(self, course_id: int) -> Optional[Tuple[int, float]]:
+        """
+        Returns the number and the average of the grades in a course. The rollup is kept up to date
+        as grades change, so this is a single lookup.
+        
+        Args:
+            course_id (int): The ID of the course.
+        
+        Returns:
+            Optional[Tuple[int, float]]: The number of grades and their average, or None if the course has no grades.
+        """
+        rollup = self._grade_rollups.get(course_id)
+        return None if rollup is None else (rollup[0], rollup[1] / rollup[0])
+
+    def enrollments_for_course(self, course_id: int) -> List[Enrollment]:
+        """
+        Returns the enrollments in a specific course by its ID, using the enrollment index.
+        
+        Args:
+            course_id (int): The ID of the course.
+        
+        Returns:
+            List[Enrollment]: The course's enrollments, in the order they were made.
+        """
+        return list(self._course_enrollments.get(course_id, {}).values())
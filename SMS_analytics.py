@@ -0,0 +1,172 @@
+from math import sqrt
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+from SMS_Project import MAX_GRADE, UNGRADED, StudentManagementSystem
+
+# (lowest grade, grade points) from the highest band down
+GPA_SCALE: Tuple[Tuple[int, float], ...] = ((90, 4.0), (80, 3.0), (70, 2.0), (60, 1.0), (0, 0.0))
+
+
+def percentile(sorted_grades: Sequence[int], p: float) -> float:
+    """
+    Returns the p-th percentile of already sorted grades, interpolating linearly between ranks.
+
+    Args:
+        sorted_grades (Sequence[int]): The grades in ascending order, at least one.
+        p (float): The percentile, from 0 to 100.
+    """
+    rank = (len(sorted_grades) - 1) * p / 100
+    low = int(rank)
+    high = min(low + 1, len(sorted_grades) - 1)
+    return sorted_grades[low] + (sorted_grades[high] - sorted_grades[low]) * (rank - low)
+
+
+def grade_points(grade: int) -> float:
+    """
+    Converts a grade into grade points using GPA_SCALE.
+    """
+    for lowest, points in GPA_SCALE:
+        if grade >= lowest:
+            return points
+    return 0.0
+
+
+class GradeSummary:
+    """
+    Aggregate statistics over a group of grades.
+
+    Attributes:
+        count (int): The number of grades.
+        mean (float): The average grade.
+        std (float): The population standard deviation of the grades.
+        minimum (int): The lowest grade.
+        maximum (int): The highest grade.
+        median (float): The 50th percentile.
+        histogram (List[int]): The number of grades in each bucket of bucket_width points, starting at 0.
+
+    Methods:
+        __str__(): Returns a human-readable summary.
+        __repr__(): Returns a string representation of the summary for debugging.
+        percentile(p: float): Returns the p-th percentile of the grades.
+    """
+
+    def __init__(self, grades: Sequence[int], bucket_width: int = 10) -> None:
+        self._sorted: List[int] = sorted(grades)
+        self.count: int = len(self._sorted)
+        self.mean: float = sum(self._sorted) / self.count
+        self.std: float = sqrt(sum((grade - self.mean) ** 2 for grade in self._sorted) / self.count)
+        self.minimum: int = self._sorted[0]
+        self.maximum: int = self._sorted[-1]
+        self.median: float = percentile(self._sorted, 50)
+        self.histogram: List[int] = [0] * (MAX_GRADE // bucket_width + 1)
+        for grade in self._sorted:
+            self.histogram[grade // bucket_width] += 1
+
+    def __str__(self) -> str:
+        return f"{self.count} grade(s), mean {self.mean:.2f}, std {self.std:.2f}, min {self.minimum}, max {self.maximum}"
+
+    def __repr__(self) -> str:
+        return (
+            f"GradeSummary(count={self.count}, mean={self.mean:.2f}, std={self.std:.2f}, "
+            f"minimum={self.minimum}, maximum={self.maximum}, median={self.median})"
+        )
+
+    def percentile(self, p: float) -> float:
+        return percentile(self._sorted, p)
+
+
+class GradeAnalytics:
+    """
+    Computes grade statistics and GPAs for a StudentManagementSystem.
+
+    The queries over all courses or all students make a single pass over every graded enrollment,
+    grouping the grades as they go, instead of walking the nested grade dictionaries. With columnar
+    grades the pass reads the GradeStore arrays directly. Queries about one course or student only
+    read that course's or student's enrollments.
+
+    Attributes:
+        system (StudentManagementSystem): The system whose grades are analysed.
+        bucket_width (int): The width of the histogram buckets.
+
+    Methods:
+        course_summaries(): Returns a GradeSummary for every course with at least one grade.
+        course_summary(course_id: int): Returns the GradeSummary of one course, or None.
+        student_summaries(): Returns a GradeSummary for every student with at least one grade.
+        student_summary(student_id: int): Returns the GradeSummary of one student, or None.
+        gpas(credits: Optional[Dict[int, float]]): Returns the credit-weighted GPA of every graded student.
+        student_gpa(student_id: int, credits: Optional[Dict[int, float]]): Returns the GPA of one student, or None.
+    """
+
+    def __init__(self, system: StudentManagementSystem, bucket_width: int = 10) -> None:
+        self.system: StudentManagementSystem = system
+        self.bucket_width: int = bucket_width
+
+    def graded(self) -> Iterator[Tuple[int, int, int]]:
+        """
+        Yields (student_id, course_id, grade) for every enrollment that has a grade.
+        """
+        store = self.system.grade_store
+        if store is not None:
+            student_ids, course_ids = store.student_ids, store.course_ids
+            for student, course, grade in zip(store.student_index, store.course_index, store.grade):
+                if grade != UNGRADED:
+                    yield student_ids[student], course_ids[course], grade
+        else:
+            for enrollment in self.system.enrollments:
+                if enrollment.grade is not None:
+                    yield enrollment.student_id, enrollment.course_id, enrollment.grade
+
+    def course_summaries(self) -> Dict[int, GradeSummary]:
+        by_course: Dict[int, List[int]] = {}
+        for _, course_id, grade in self.graded():
+            by_course.setdefault(course_id, []).append(grade)
+        return {course_id: GradeSummary(grades, self.bucket_width) for course_id, grades in by_course.items()}
+
+    def course_summary(self, course_id: int) -> Optional[GradeSummary]:
+        grades = [
+            enrollment.grade
+            for enrollment in self.system.enrollments_for_course(course_id)
+            if enrollment.grade is not None
+        ]
+        return GradeSummary(grades, self.bucket_width) if grades else None
+
+    def student_summaries(self) -> Dict[int, GradeSummary]:
+        by_student: Dict[int, List[int]] = {}
+        for student_id, _, grade in self.graded():
+            by_student.setdefault(student_id, []).append(grade)
+        return {student_id: GradeSummary(grades, self.bucket_width) for student_id, grades in by_student.items()}
+
+    def student_summary(self, student_id: int) -> Optional[GradeSummary]:
+        grades = [
+            enrollment.grade
+            for enrollment in self.system.enrollments_for_student(student_id)
+            if enrollment.grade is not None
+        ]
+        return GradeSummary(grades, self.bucket_width) if grades else None
+
+    def gpas(self, credits: Optional[Dict[int, float]] = None) -> Dict[int, float]:
+        """
+        Args:
+            credits (Optional[Dict[int, float]]): The credits of each course ID; courses not listed count as 1.
+
+        Returns:
+            Dict[int, float]: The credit-weighted GPA of every student with at least one grade.
+        """
+        credits = credits or {}
+        totals: Dict[int, List[float]] = {}  # {student_id: [weighted points, credits]}
+        for student_id, course_id, grade in self.graded():
+            weight = credits.get(course_id, 1.0)
+            total = totals.setdefault(student_id, [0.0, 0.0])
+            total[0] += grade_points(grade) * weight
+            total[1] += weight
+        return {student_id: points / weight for student_id, (points, weight) in totals.items() if weight}
+
+    def student_gpa(self, student_id: int, credits: Optional[Dict[int, float]] = None) -> Optional[float]:
+        credits = credits or {}
+        points = weight = 0.0
+        for enrollment in self.system.enrollments_for_student(student_id):
+            if enrollment.grade is not None:
+                course_weight = credits.get(enrollment.course_id, 1.0)
+                points += grade_points(enrollment.grade) * course_weight
+                weight += course_weight
+        return points / weight if weight else None
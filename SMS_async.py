@@ -0,0 +1,281 @@
+import asyncio
+from abc import ABC, abstractmethod
+from functools import wraps
+from typing import Callable, Dict, Hashable, Iterator, List, Optional, Tuple
+
+from SMS_Project import Course, StorageBackend, Student, StudentManagementSystem
+from SMS_storage import TABLES, from_row, to_row
+
+# A change to write: (table, key, row), where a row of None removes the object
+Change = Tuple[str, Hashable, Optional[tuple]]
+
+
+class AsyncStorageBackend(ABC):
+    """
+    The interface of storage that an AsyncStudentManagementSystem reads and writes without blocking.
+    Tables, keys and rows are laid out as in SMS_storage.TABLES.
+
+    Methods:
+        write(changes: List[Change]): Applies a batch of changes as one operation.
+        load_all(table: str): Returns every stored student, instructor or course.
+        load_enrollments(): Returns every stored enrollment as a (student_id, course_id, grade) row.
+        close(): Releases the storage.
+    """
+
+    @abstractmethod
+    async def write(self, changes: List[Change]) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def load_all(self, table: str) -> List[object]:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def load_enrollments(self) -> List[Tuple[int, int, Optional[int]]]:
+        raise NotImplementedError
+
+    async def close(self) -> None:
+        pass
+
+
+class InMemoryAsyncStorage(AsyncStorageBackend):
+    """
+    An in-process stand-in for an asynchronous database, for tests and benchmarks.
+
+    Attributes:
+        tables (Dict[str, Dict[Hashable, tuple]]): The stored rows of each table, by key.
+        latency (float): The number of seconds every call waits, to imitate a round trip.
+        write_calls (int): The number of batches written so far.
+    """
+
+    def __init__(self, latency: float = 0.0) -> None:
+        self.tables: Dict[str, Dict[Hashable, tuple]] = {table: {} for table in TABLES}
+        self.latency: float = latency
+        self.write_calls: int = 0
+
+    async def write(self, changes: List[Change]) -> None:
+        await asyncio.sleep(self.latency)
+        self.write_calls += 1
+        for table, key, row in changes:
+            if row is None:
+                self.tables[table].pop(key, None)
+            else:
+                self.tables[table][key] = row
+
+    async def load_all(self, table: str) -> List[object]:
+        await asyncio.sleep(self.latency)
+        return [from_row(table, row) for row in self.tables[table].values()]
+
+    async def load_enrollments(self) -> List[Tuple[int, int, Optional[int]]]:
+        await asyncio.sleep(self.latency)
+        return list(self.tables["enrollments"].values())
+
+
+class _ChangeBuffer(StorageBackend):
+    """
+    The synchronous storage of the wrapped system: it only collects the changes, which the
+    asynchronous facade then writes in batches. Everything is loaded up front, so reads find nothing.
+    """
+
+    def __init__(self) -> None:
+        self.changes: Dict[Tuple[str, Hashable], Optional[object]] = {}
+
+    def record(self, table: str, key: Hashable, item: Optional[object]) -> None:
+        self.changes[(table, key)] = item
+
+    def flush(self) -> None:
+        pass
+
+    def load(self, table: str, key: Hashable) -> Optional[object]:
+        return None
+
+    def load_all(self, table: str) -> Iterator[object]:
+        return iter(())
+
+    def load_enrollments(self, course_id: Optional[int] = None) -> Iterator[Tuple[int, int, Optional[int]]]:
+        return iter(())
+
+    def count(self, table: str) -> int:
+        return 0
+
+    def drain(self) -> List[Change]:
+        changes = [
+            (table, key, None if item is None else to_row(table, item)) for (table, key), item in self.changes.items()
+        ]
+        self.changes = {}
+        return changes
+
+
+def _query(method: Callable) -> Callable:
+    @wraps(method)
+    async def coroutine(self: "AsyncStudentManagementSystem", *args, **kwargs):
+        return method(self.system, *args, **kwargs)
+
+    return coroutine
+
+
+def _change(method: Callable) -> Callable:
+    @wraps(method)
+    async def coroutine(self: "AsyncStudentManagementSystem", *args, **kwargs):
+        result = method(self.system, *args, **kwargs)
+        await self._commit()
+        return result
+
+    return coroutine
+
+
+class AsyncStudentManagementSystem:
+    """
+    An asyncio front end for a StudentManagementSystem, with optional asynchronous storage.
+
+    Every public method of StudentManagementSystem is available as a coroutine. The system itself is
+    in memory, so queries return straight away. Changes are applied to it at once, and every change
+    made during the same event loop tick is then written to storage as a single batch; a change's
+    coroutine returns once its batch is written. Grades are batched further: assign_grade calls made in
+    the same tick are applied together with one assign_grades_bulk call, so a grade the bulk checks
+    reject comes back as a "was not assigned" message with the reason. Use open() to create a system
+    that loads its data from storage.
+
+    Attributes:
+        system (StudentManagementSystem): The wrapped system.
+        storage (Optional[AsyncStorageBackend]): The storage that changes are written to.
+
+    Methods:
+        open(storage: Optional[AsyncStorageBackend], columnar_grades: bool): Creates a system and loads it from storage.
+        save(): Waits until every change made so far is written.
+        close(): Writes every change and closes the storage.
+    """
+
+    def __init__(self, storage: Optional[AsyncStorageBackend] = None, columnar_grades: bool = False) -> None:
+        self.storage: Optional[AsyncStorageBackend] = storage
+        self._buffer: Optional[_ChangeBuffer] = _ChangeBuffer() if storage is not None else None
+        self.system: StudentManagementSystem = StudentManagementSystem(columnar_grades, self._buffer)
+        self._pending_commit: Optional[asyncio.Future] = None
+        self._last_write: Optional[asyncio.Task] = None
+        self._grade_queue: List[Tuple[Student, Course, int, asyncio.Future]] = []
+
+    @classmethod
+    async def open(
+        cls, storage: Optional[AsyncStorageBackend] = None, columnar_grades: bool = False
+    ) -> "AsyncStudentManagementSystem":
+        facade = cls(storage, columnar_grades)
+        if storage is not None:
+            system = facade.system
+            system.add_students(*await storage.load_all("students"))
+            system.add_instructors(*await storage.load_all("instructors"))
+            system.add_courses(*await storage.load_all("courses"))
+            graded: List[Tuple[int, int, int]] = []
+            for student_id, course_id, grade in await storage.load_enrollments():
+                # Stored enrollments are restored as they are, without checking capacity again
+                system._link(system.students.get(student_id), system.courses.get(course_id))
+                if grade is not None:
+                    graded.append((student_id, course_id, grade))
+            system.assign_grades_bulk(graded)
+            facade._buffer.drain()  # Everything loaded is already stored
+        return facade
+
+    def _commit(self) -> "asyncio.Future[None]":
+        """
+        Returns a future for the write of the current tick's changes, scheduling the write on first use.
+        """
+        loop = asyncio.get_running_loop()
+        if self.storage is None:
+            future = loop.create_future()
+            future.set_result(None)
+            return future
+        if self._pending_commit is None:
+            self._pending_commit = loop.create_future()
+            loop.call_soon(self._start_write)
+        return self._pending_commit
+
+    def _start_write(self) -> None:
+        future, self._pending_commit = self._pending_commit, None
+        self._last_write = asyncio.get_running_loop().create_task(self._write(self._last_write, self._buffer.drain()))
+        self._last_write.add_done_callback(
+            lambda task: future.set_exception(task.exception()) if task.exception() else future.set_result(None)
+        )
+
+    async def _write(self, previous: Optional[asyncio.Task], changes: List[Change]) -> None:
+        # Batches are written in order; a failed batch is reported to its own callers only.
+        if previous is not None:
+            await asyncio.wait([previous])
+        if changes:
+            await self.storage.write(changes)
+
+    def _apply_grades(self) -> None:
+        queue, self._grade_queue = self._grade_queue, []
+        report = self.system.assign_grades_bulk(
+            (student.id_number, course.course_id, grade) for student, course, grade, _ in queue
+        )
+        reasons = {row: reason for reason, rows in report.rejected.items() for row in rows}
+        for row, (student, course, grade, future) in enumerate(queue):
+            if row in reasons:
+                future.set_result(
+                    f"Grade {grade} was not assigned to student {student.name} for course {course.course_name}: {reasons[row]}"
+                )
+            else:
+                future.set_result(f"Grade {grade} assigned to student {student.name} for course {course.course_name}")
+
+    async def assign_grade(self, student: Student, course: Course, grade: int) -> str:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        if not self._grade_queue:
+            loop.call_soon(self._apply_grades)
+        self._grade_queue.append((student, course, grade, future))
+        result = await future
+        await self._commit()
+        return result
+
+    async def save(self) -> None:
+        await self._commit()
+
+    async def close(self) -> None:
+        await self._commit()
+        if self.storage is not None:
+            await self.storage.close()
+
+    add_student = _change(StudentManagementSystem.add_student)
+    add_students = _change(StudentManagementSystem.add_students)
+    remove_student = _change(StudentManagementSystem.remove_student)
+    remove_students = _change(StudentManagementSystem.remove_students)
+    update_student = _change(StudentManagementSystem.update_student)
+    add_instructor = _change(StudentManagementSystem.add_instructor)
+    add_instructors = _change(StudentManagementSystem.add_instructors)
+    remove_instructor = _change(StudentManagementSystem.remove_instructor)
+    update_instructor = _change(StudentManagementSystem.update_instructor)
+    add_courses = _change(StudentManagementSystem.add_courses)
+    remove_course = _change(StudentManagementSystem.remove_course)
+    remove_courses = _change(StudentManagementSystem.remove_courses)
+    update_course = _change(StudentManagementSystem.update_course)
+    assign_instructor = _change(StudentManagementSystem.assign_instructor)
+    enroll_student_in_courses = _change(StudentManagementSystem.enroll_student_in_courses)
+    schedule_students = _change(StudentManagementSystem.schedule_students)
+    assign_grades_bulk = _change(StudentManagementSystem.assign_grades_bulk)
+
+    find_student = _query(StudentManagementSystem.find_student)
+    show_student = _query(StudentManagementSystem.show_student)
+    find_instructor = _query(StudentManagementSystem.find_instructor)
+    find_students_by_major = _query(StudentManagementSystem.find_students_by_major)
+    search_students = _query(StudentManagementSystem.search_students)
+    find_instructors_by_department = _query(StudentManagementSystem.find_instructors_by_department)
+    search_instructors = _query(StudentManagementSystem.search_instructors)
+    show_instructors = _query(StudentManagementSystem.show_instructors)
+    find_course = _query(StudentManagementSystem.find_course)
+    show_enrollment = _query(StudentManagementSystem.show_enrollment)
+    students_grades = _query(StudentManagementSystem.students_grades)
+    get_student_grades = _query(StudentManagementSystem.get_student_grades)
+    studentlist_in_course = _query(StudentManagementSystem.studentlist_in_course)
+    student_course_list = _query(StudentManagementSystem.student_course_list)
+    enrollments_for_student = _query(StudentManagementSystem.enrollments_for_student)
+    enrollments_for_course = _query(StudentManagementSystem.enrollments_for_course)
+    grades_for_student = _query(StudentManagementSystem.grades_for_student)
+    grades_for_course = _query(StudentManagementSystem.grades_for_course)
+    course_grade_rollup = _query(StudentManagementSystem.course_grade_rollup)
+    courses_for_instructor = _query(StudentManagementSystem.courses_for_instructor)
+    subscribe = _query(StudentManagementSystem.subscribe)
+    iter_students = _query(StudentManagementSystem.iter_students)
+    iter_instructors = _query(StudentManagementSystem.iter_instructors)
+    iter_enrollments = _query(StudentManagementSystem.iter_enrollments)
+    iter_students_grades = _query(StudentManagementSystem.iter_students_grades)
+    iter_course_students = _query(StudentManagementSystem.iter_course_students)
+    unsubscribe = _query(StudentManagementSystem.unsubscribe)
@@ -0,0 +1,299 @@
+import threading
+from functools import wraps
+from typing import Callable, ContextManager, Dict, Hashable, Iterator, List, Optional, Tuple, TypeVar
+
+from SMS_Project import Course, StorageBackend, Student, StudentManagementSystem, ViewCache
+
+F = TypeVar("F", bound=Callable)
+
+
+class ReadWriteLock:
+    """
+    A lock that any number of readers can hold at once, or a single writer.
+
+    Waiting writers block new readers, so a steady stream of reads cannot starve a write.
+    Both sides are re-entrant within a thread, and a thread holding the write lock may also read,
+    but a thread holding only the read lock cannot upgrade it to the write lock.
+
+    Methods:
+        acquire_read(), release_read(): Take and give back the lock for reading.
+        acquire_write(), release_write(): Take and give back the lock for writing.
+        reading(): Returns a context manager that holds the lock for reading.
+        writing(): Returns a context manager that holds the lock for writing.
+    """
+
+    def __init__(self) -> None:
+        self._condition = threading.Condition(threading.Lock())
+        self._readers: int = 0
+        self._writer: Optional[int] = None  # The ident of the thread holding the write lock
+        self._writes: int = 0  # How many times the writer has taken the lock
+        self._waiting_writers: int = 0
+        self._local = threading.local()  # The read depth of each thread
+        self._read_side = _Side(self.acquire_read, self.release_read)
+        self._write_side = _Side(self.acquire_write, self.release_write)
+
+    def acquire_read(self) -> None:
+        local = self._local
+        depth = getattr(local, "reads", 0)
+        if depth or self._writer == threading.get_ident():
+            local.reads = depth + 1
+            return
+        with self._condition:
+            while self._writer is not None or self._waiting_writers:
+                self._condition.wait()
+            self._readers += 1
+        local.reads = 1
+
+    def release_read(self) -> None:
+        local = self._local
+        local.reads -= 1
+        if local.reads or self._writer == threading.get_ident():
+            return
+        with self._condition:
+            self._readers -= 1
+            if not self._readers and self._waiting_writers:
+                self._condition.notify_all()
+
+    def acquire_write(self) -> None:
+        me = threading.get_ident()
+        if self._writer == me:
+            self._writes += 1
+            return
+        if getattr(self._local, "reads", 0):
+            raise RuntimeError("A read lock cannot be upgraded to a write lock")
+        with self._condition:
+            self._waiting_writers += 1
+            while self._writer is not None or self._readers:
+                self._condition.wait()
+            self._waiting_writers -= 1
+            self._writer = me
+            self._writes = 1
+
+    def release_write(self) -> None:
+        self._writes -= 1
+        if self._writes:
+            return
+        with self._condition:
+            self._writer = None
+            self._condition.notify_all()
+
+    def reading(self) -> ContextManager:
+        return self._read_side
+
+    def writing(self) -> ContextManager:
+        return self._write_side
+
+
+class _Side:
+    """A context manager that takes one side of a ReadWriteLock."""
+
+    __slots__ = ("_acquire", "_release")
+
+    def __init__(self, acquire: Callable[[], None], release: Callable[[], None]) -> None:
+        self._acquire = acquire
+        self._release = release
+
+    def __enter__(self) -> None:
+        self._acquire()
+
+    def __exit__(self, *exc_info: object) -> None:
+        self._release()
+
+
+def _reader(method: F) -> F:
+    @wraps(method)
+    def wrapper(self: "ConcurrentStudentManagementSystem", *args, **kwargs):
+        self._lock.acquire_read()
+        try:
+            return method(self, *args, **kwargs)
+        finally:
+            self._lock.release_read()
+
+    return wrapper
+
+
+def _page_reader(method: Callable) -> Callable:
+    # Pages are read in full under the read lock, as a generator would run after the lock is released
+    @wraps(method)
+    def wrapper(self: "ConcurrentStudentManagementSystem", *args, **kwargs):
+        self._lock.acquire_read()
+        try:
+            return list(method(self, *args, **kwargs))
+        finally:
+            self._lock.release_read()
+
+    return wrapper
+
+
+def _writer(method: F) -> F:
+    @wraps(method)
+    def wrapper(self: "ConcurrentStudentManagementSystem", *args, **kwargs):
+        self._lock.acquire_write()
+        try:
+            return method(self, *args, **kwargs)
+        finally:
+            self._lock.release_write()
+
+    return wrapper
+
+
+class _LockedStorage(StorageBackend):
+    """
+    Runs every call to a storage backend under a lock, so that threads use it one at a time. Reads
+    are completed under the lock, as a generator would run after it is released. Methods particular
+    to the backend, such as JournalStorage.snapshot, are passed through under the lock too.
+    """
+
+    def __init__(self, storage: StorageBackend, lock: threading.Lock) -> None:
+        self._storage: StorageBackend = storage
+        self._lock: threading.Lock = lock
+
+    def __getattr__(self, name: str) -> object:
+        attribute = getattr(self._storage, name)
+        if not callable(attribute):
+            return attribute
+
+        @wraps(attribute)
+        def locked(*args, **kwargs):
+            with self._lock:
+                return attribute(*args, **kwargs)
+
+        return locked
+
+    def record(self, table: str, key: Hashable, item: Optional[object]) -> None:
+        with self._lock:
+            self._storage.record(table, key, item)
+
+    def flush(self) -> None:
+        with self._lock:
+            self._storage.flush()
+
+    def load(self, table: str, key: Hashable) -> Optional[object]:
+        with self._lock:
+            return self._storage.load(table, key)
+
+    def load_all(self, table: str) -> Iterator[object]:
+        with self._lock:
+            return iter(list(self._storage.load_all(table)))
+
+    def load_enrollments(self, course_id: Optional[int] = None) -> Iterator[Tuple[int, int, Optional[int]]]:
+        with self._lock:
+            return iter(list(self._storage.load_enrollments(course_id)))
+
+    def count(self, table: str) -> int:
+        with self._lock:
+            return self._storage.count(table)
+
+    def close(self) -> None:
+        with self._lock:
+            self._storage.close()
+
+
+class ConcurrentStudentManagementSystem(StudentManagementSystem):
+    """
+    A StudentManagementSystem that can be shared between threads.
+
+    Lookups and listings hold a shared read lock, so they run alongside each other. Changes to the
+    registries, the enrollments or a registered course's roster hold the exclusive write lock, which
+    also makes the check-then-add in Course.add_students_to_course atomic. assign_grade only changes
+    the grade of an existing enrollment, so it holds the read lock plus a lock for the student (one of
+    student_lock_count striped locks), letting grades for different students be assigned in parallel.
+
+    Listings return copies rather than live views: show_student(), show_instructors() and the iter_*
+    pages return lists, and students_grades() and get_student_grades() return new dictionaries. The view cache has its own
+    lock, since readers fill it in parallel, and as grades are assigned in parallel, change event
+    subscribers may be called from several threads at once. A storage-backed system is
+    loaded completely when it is created, since lazy loading would change the registries during reads,
+    and for the same reason the name search indexes are built when the system is created.
+    The storage backend is used by one thread at a time: the system keeps it wrapped so that every
+    call to it, including the loads and the counts, holds a storage lock.
+    """
+
+    def __init__(
+        self,
+        columnar_grades: bool = False,
+        storage: Optional[StorageBackend] = None,
+        student_lock_count: int = 64,
+        view_cache_size: int = 4096,
+    ) -> None:
+        self._lock: ReadWriteLock = ReadWriteLock()
+        self._student_locks: List[threading.Lock] = [threading.Lock() for _ in range(student_lock_count)]
+        self._storage_lock: threading.Lock = threading.Lock()
+        self._rollup_lock: threading.Lock = threading.Lock()  # Grades of different students can share a course
+        if storage is not None:
+            storage = _LockedStorage(storage, self._storage_lock)
+        super().__init__(columnar_grades, storage, view_cache_size)
+        self.views = ViewCache(view_cache_size, threading.Lock())  # Readers fill the cache concurrently
+        if storage is not None:
+            self._load_enrollments()  # Also loads the students and courses, without a roster query per course
+            self.instructors.load_all()
+        # Searches hold only the read lock, so the posting lists are built now rather than by the first
+        # search; afterwards they are only rebuilt by changes, which hold the write lock
+        for registry in (self.students, self.instructors):
+            registry.indexes["name"].build()
+
+    def _writing(self) -> ContextManager:
+        return self._lock.writing()
+
+    def _rollup(self, course_id: int, old_grade: Optional[int], grade: Optional[int]) -> None:
+        with self._rollup_lock:
+            super()._rollup(course_id, old_grade, grade)
+
+    add_student = _writer(StudentManagementSystem.add_student)
+    add_students = _writer(StudentManagementSystem.add_students)
+    remove_student = _writer(StudentManagementSystem.remove_student)
+    remove_students = _writer(StudentManagementSystem.remove_students)
+    update_student = _writer(StudentManagementSystem.update_student)
+    add_instructor = _writer(StudentManagementSystem.add_instructor)
+    add_instructors = _writer(StudentManagementSystem.add_instructors)
+    remove_instructor = _writer(StudentManagementSystem.remove_instructor)
+    update_instructor = _writer(StudentManagementSystem.update_instructor)
+    add_courses = _writer(StudentManagementSystem.add_courses)
+    remove_course = _writer(StudentManagementSystem.remove_course)
+    remove_courses = _writer(StudentManagementSystem.remove_courses)
+    update_course = _writer(StudentManagementSystem.update_course)
+    assign_instructor = _writer(StudentManagementSystem.assign_instructor)
+    enroll_student_in_courses = _writer(StudentManagementSystem.enroll_student_in_courses)
+    schedule_students = _writer(StudentManagementSystem.schedule_students)
+    subscribe = _writer(StudentManagementSystem.subscribe)
+    unsubscribe = _writer(StudentManagementSystem.unsubscribe)
+    assign_grades_bulk = _writer(StudentManagementSystem.assign_grades_bulk)
+    save = _writer(StudentManagementSystem.save)
+
+    find_student = _reader(StudentManagementSystem.find_student)
+    find_instructor = _reader(StudentManagementSystem.find_instructor)
+    find_students_by_major = _reader(StudentManagementSystem.find_students_by_major)
+    search_students = _reader(StudentManagementSystem.search_students)
+    find_instructors_by_department = _reader(StudentManagementSystem.find_instructors_by_department)
+    search_instructors = _reader(StudentManagementSystem.search_instructors)
+    find_course = _reader(StudentManagementSystem.find_course)
+    show_student = _reader(StudentManagementSystem.show_student)
+    show_instructors = _reader(StudentManagementSystem.show_instructors)
+    show_enrollment = _reader(StudentManagementSystem.show_enrollment)
+    studentlist_in_course = _reader(StudentManagementSystem.studentlist_in_course)
+    student_course_list = _reader(StudentManagementSystem.student_course_list)
+    enrollments_for_student = _reader(StudentManagementSystem.enrollments_for_student)
+    enrollments_for_course = _reader(StudentManagementSystem.enrollments_for_course)
+    grades_for_student = _reader(StudentManagementSystem.grades_for_student)
+    grades_for_course = _reader(StudentManagementSystem.grades_for_course)
+    course_grade_rollup = _reader(StudentManagementSystem.course_grade_rollup)
+    courses_for_instructor = _reader(StudentManagementSystem.courses_for_instructor)
+    iter_students = _page_reader(StudentManagementSystem.iter_students)
+    iter_instructors = _page_reader(StudentManagementSystem.iter_instructors)
+    iter_enrollments = _page_reader(StudentManagementSystem.iter_enrollments)
+    iter_students_grades = _page_reader(StudentManagementSystem.iter_students_grades)
+    iter_course_students = _page_reader(StudentManagementSystem.iter_course_students)
+
+    def assign_grade(self, student: Student, course: Course, grade: int) -> str:
+        with self._lock.reading(), self._student_locks[hash(student.id_number) % len(self._student_locks)]:
+            return super().assign_grade(student, course, grade)
+
+    @_reader
+    def students_grades(self) -> Dict[int, Dict[str, Optional[int]]]:
+        return {student_id: dict(grades) for student_id, grades in super().students_grades().items()}
+
+    def get_student_grades(self, student_id: int) -> Optional[Dict[str, Optional[int]]]:
+        # The student's lock keeps a concurrent assign_grade from invalidating the cached grade map between
+        # its being computed and stored, which would leave the old grade cached; the map returned is a copy
+        with self._lock.reading(), self._student_locks[hash(student_id) % len(self._student_locks)]:
+            return super().get_student_grades(student_id)
@@ -0,0 +1,177 @@
+import threading
+import time
+from array import array
+from bisect import bisect_left, bisect_right
+from contextlib import nullcontext
+from typing import Callable, ContextManager, Dict, List, Optional, Tuple
+
+from SMS_Project import UNGRADED, ChangeEvent, StudentManagementSystem
+
+DROPPED: int = -2  # Stands for an enrollment that was dropped, in GradeHistory.grades
+
+
+class GradeHistory:
+    """
+    The versioned history of a StudentManagementSystem's enrollments and grades, for answering what
+    a transcript or a course roster looked like at a given time.
+
+    The history subscribes to the system's change events and appends a version for every enrollment,
+    grade change and drop, stamped with the clock. Versions are stored in two append-only arrays,
+    their times and grades (UNGRADED for no grade, DROPPED for a drop), and each enrollment keeps
+    its version chain: the positions of its versions, oldest first. As the clock is never allowed
+    to go backwards, the times are sorted, so a query bisects them once for the number of versions
+    made by its time, and then bisects each chain for the last of those, without replaying any changes.
+
+    Only changes made through the system are seen; calling Enrollment.assign_grade directly is not
+    recorded. The enrollments the system has when the history is created are recorded as of that
+    moment. Courses are shown under their latest name. The history is kept in memory only.
+
+    With a ConcurrentStudentManagementSystem, pass lock=True: its assign_grade calls run in parallel
+    and so deliver events from several threads at once.
+
+    Attributes:
+        system (StudentManagementSystem): The system whose history is kept.
+        times (array): The time of each version, in seconds since the epoch, in order.
+        grades (array): The grade of each version, or UNGRADED or DROPPED.
+
+    Methods:
+        get_student_grades(student_id: int, as_of: float): Returns a student's grades by course name at a time.
+        grades_for_student(student_id: int, as_of: float): Returns a student's grades by course ID at a time.
+        course_roster(course_id: int, as_of: float): Returns the students enrolled in a course at a time, with their grades.
+        enrollment_history(student_id: int, course_id: int): Returns every version of an enrollment.
+        close(): Stops recording the system's changes.
+    """
+
+    def __init__(self, system: StudentManagementSystem, clock: Callable[[], float] = time.time, lock: bool = False) -> None:
+        """
+        Args:
+            system (StudentManagementSystem): The system to keep the history of.
+            clock (Callable[[], float]): Returns the current time, in seconds since the epoch.
+            lock (bool): Guard the history with a lock, for systems that change from several threads at once.
+        """
+        self.system: StudentManagementSystem = system
+        self.times: array = array("d")
+        self.grades: array = array("h")
+        self._clock: Callable[[], float] = clock
+        self._lock: ContextManager = threading.Lock() if lock else nullcontext()
+        # Version chains, shared between the two views: {student_id: {course_id: chain}} and {course_id: {student_id: chain}}
+        self._student_chains: Dict[int, Dict[int, array]] = {}
+        self._course_chains: Dict[int, Dict[int, array]] = {}
+        self._course_names: Dict[int, str] = {}
+        with system._writing():
+            now = self._now()
+            for course in system.courses:
+                self._course_names[course.course_id] = course.course_name
+            for enrollment in system.enrollments:
+                self._append(enrollment.student_id, enrollment.course_id, enrollment.grade, now)
+            system.subscribe(self._record)
+
+    def close(self) -> None:
+        self.system.unsubscribe(self._record)
+
+    def _now(self) -> float:
+        now = self._clock()
+        return now if not self.times or now > self.times[-1] else self.times[-1]
+
+    def _record(self, event: ChangeEvent) -> None:
+        if event.table == "enrollments":
+            with self._lock:
+                grade = DROPPED if event.kind == "remove" else event.new
+                self._append(*event.key, grade, self._now())
+        elif event.table == "courses" and event.new is not None:
+            self._course_names[event.key] = event.new.course_name
+
+    def _append(self, student_id: int, course_id: int, grade: Optional[int], at: float) -> None:
+        chain = self._student_chains.setdefault(student_id, {}).get(course_id)
+        if chain is None:
+            chain = self._student_chains[student_id][course_id] = array("i")
+            self._course_chains.setdefault(course_id, {})[student_id] = chain
+        chain.append(len(self.times))
+        self.times.append(at)
+        self.grades.append(UNGRADED if grade is None else grade)
+
+    def _versions_by(self, as_of: float) -> int:
+        """Returns the number of versions made at or before a time, which are the ones positioned before it."""
+        return bisect_right(self.times, as_of)
+
+    def _grade_at(self, chain: array, versions: int) -> int:
+        """
+        Returns the grade of the last version in a chain among the first versions made, UNGRADED or
+        DROPPED; DROPPED if the chain starts later.
+        """
+        i = bisect_left(chain, versions)
+        return DROPPED if i == 0 else self.grades[chain[i - 1]]
+
+    def grades_for_student(self, student_id: int, as_of: float) -> Dict[int, Optional[int]]:
+        """
+        Returns the grades of a student at a time, keyed by course ID.
+
+        Args:
+            student_id (int): The ID of the student.
+            as_of (float): The time, in seconds since the epoch.
+
+        Returns:
+            Dict[int, Optional[int]]: The grade of each course the student was enrolled in at that time, or None if ungraded.
+        """
+        grades = {}
+        with self._lock:
+            versions = self._versions_by(as_of)
+            for course_id, chain in self._student_chains.get(student_id, {}).items():
+                grade = self._grade_at(chain, versions)
+                if grade != DROPPED:
+                    grades[course_id] = None if grade == UNGRADED else grade
+        return grades
+
+    def get_student_grades(self, student_id: int, as_of: float) -> Optional[Dict[str, Optional[int]]]:
+        """
+        Returns the grades of a student at a time, keyed by course name, like
+        StudentManagementSystem.get_student_grades.
+
+        Args:
+            student_id (int): The ID of the student.
+            as_of (float): The time, in seconds since the epoch.
+
+        Returns:
+            Optional[Dict[str, Optional[int]]]: The grade of each course the student was enrolled in at that time,
+            or None if the student had no enrollments then.
+        """
+        grades = self.grades_for_student(student_id, as_of)
+        if not grades:
+            return None
+        return {self._course_names.get(course_id, f"course {course_id}"): grade for course_id, grade in grades.items()}
+
+    def course_roster(self, course_id: int, as_of: float) -> Dict[int, Optional[int]]:
+        """
+        Returns the students enrolled in a course at a time.
+
+        Args:
+            course_id (int): The ID of the course.
+            as_of (float): The time, in seconds since the epoch.
+
+        Returns:
+            Dict[int, Optional[int]]: The grade of each student enrolled at that time, or None if ungraded, by student ID.
+        """
+        roster = {}
+        with self._lock:
+            versions = self._versions_by(as_of)
+            for student_id, chain in self._course_chains.get(course_id, {}).items():
+                grade = self._grade_at(chain, versions)
+                if grade != DROPPED:
+                    roster[student_id] = None if grade == UNGRADED else grade
+        return roster
+
+    def enrollment_history(self, student_id: int, course_id: int) -> List[Tuple[float, Optional[int], bool]]:
+        """
+        Returns every version of an enrollment, oldest first.
+
+        Args:
+            student_id (int): The ID of the student.
+            course_id (int): The ID of the course.
+
+        Returns:
+            List[Tuple[float, Optional[int], bool]]: (time, grade, enrolled) for each version; enrolled is False for a drop.
+        """
+        with self._lock:
+            chain = self._student_chains.get(student_id, {}).get(course_id, ())
+            versions = [(self.times[version], self.grades[version]) for version in chain]
+        return [(at, None if grade in (UNGRADED, DROPPED) else grade, grade != DROPPED) for at, grade in versions]
@@ -0,0 +1,310 @@
+import csv
+import json
+from contextlib import contextmanager
+from itertools import islice
+from typing import IO, Dict, Iterable, Iterator, List, Optional, Tuple, TypeVar, Union
+
+from SMS_Project import Course, Instructor, Student, StudentManagementSystem, format_meetings, parse_meetings
+
+T = TypeVar("T")
+
+Source = Union[str, IO[str]]  # A file path or an open text file
+
+# The fields of each kind of record, in the order they are written
+FIELDS: Dict[str, Tuple[str, ...]] = {
+    "students": ("id_number", "name", "major"),
+    "instructors": ("id_number", "name", "department"),
+    "courses": ("course_id", "course_name", "capacity", "meetings", "instructor_id"),
+    "enrollments": ("student_id", "course_id", "grade"),
+    "grades": ("student_id", "course_id", "grade"),
+}
+
+
+@contextmanager
+def _open(source: Source, mode: str) -> Iterator[IO[str]]:
+    if isinstance(source, str):
+        with open(source, mode, newline="") as file:
+            yield file
+    else:
+        yield source
+
+
+def _format(source: Source, fmt: Optional[str]) -> str:
+    if fmt is None:
+        name = source if isinstance(source, str) else getattr(source, "name", "")
+        fmt = "jsonl" if str(name).endswith((".jsonl", ".json")) else "csv"
+    if fmt not in ("csv", "jsonl"):
+        raise ValueError(f"Unknown format {fmt!r}, expected 'csv' or 'jsonl'")
+    return fmt
+
+
+def _int_or_none(value: object) -> Optional[int]:
+    return None if value is None or value == "" else int(value)
+
+
+def chunks(items: Iterable[T], size: int) -> Iterator[List[T]]:
+    """
+    Splits an iterable into lists of at most size items, reading only one list ahead.
+    """
+    iterator = iter(items)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+def read_records(source: Source, fmt: Optional[str] = None) -> Iterator[Dict[str, object]]:
+    """
+    Yields the records of a CSV file (with a header row) or a JSON Lines file one at a time.
+
+    Args:
+        source (Source): The file path or open text file to read.
+        fmt (Optional[str]): "csv" or "jsonl"; guessed from the file name if not given.
+    """
+    fmt = _format(source, fmt)
+    with _open(source, "r") as file:
+        if fmt == "csv":
+            yield from csv.DictReader(file)
+        else:
+            for line in file:
+                if line.strip():
+                    yield json.loads(line)
+
+
+def write_records(target: Source, kind: str, records: Iterable[Dict[str, object]], fmt: Optional[str] = None) -> int:
+    """
+    Writes records one at a time to a CSV file (with a header row) or a JSON Lines file.
+
+    Args:
+        target (Source): The file path or open text file to write.
+        kind (str): The kind of record, a key of FIELDS.
+        records (Iterable[Dict[str, object]]): The records to write.
+        fmt (Optional[str]): "csv" or "jsonl"; guessed from the file name if not given.
+
+    Returns:
+        int: The number of records written.
+    """
+    fmt = _format(target, fmt)
+    count = 0
+    with _open(target, "w") as file:
+        if fmt == "csv":
+            writer = csv.DictWriter(file, FIELDS[kind])
+            writer.writeheader()
+            for count, record in enumerate(records, 1):
+                writer.writerow(record)
+        else:
+            for count, record in enumerate(records, 1):
+                file.write(json.dumps(record) + "\n")
+    return count
+
+
+def import_students(system: StudentManagementSystem, source: Source, fmt: Optional[str] = None, chunk_size: int = 10_000) -> int:
+    """
+    Adds the students in a file to the system, chunk_size records at a time.
+
+    Returns:
+        int: The number of students imported.
+    """
+    count = 0
+    for chunk in chunks(read_records(source, fmt), chunk_size):
+        system.add_students(*(Student(record["name"], int(record["id_number"]), record["major"]) for record in chunk))
+        count += len(chunk)
+    return count
+
+
+def import_instructors(system: StudentManagementSystem, source: Source, fmt: Optional[str] = None, chunk_size: int = 10_000) -> int:
+    """
+    Adds the instructors in a file to the system, chunk_size records at a time.
+
+    Returns:
+        int: The number of instructors imported.
+    """
+    count = 0
+    for chunk in chunks(read_records(source, fmt), chunk_size):
+        system.add_instructors(
+            *(Instructor(record["name"], int(record["id_number"]), record["department"]) for record in chunk)
+        )
+        count += len(chunk)
+    return count
+
+
+def import_courses(system: StudentManagementSystem, source: Source, fmt: Optional[str] = None, chunk_size: int = 10_000) -> int:
+    """
+    Adds the courses in a file to the system, chunk_size records at a time. The meetings and
+    instructor_id columns may be left out; instructors are looked up by ID number, so import them first.
+
+    Returns:
+        int: The number of courses imported.
+    """
+    count = 0
+    for chunk in chunks(read_records(source, fmt), chunk_size):
+        system.add_courses(
+            *(
+                Course(
+                    record["course_name"],
+                    int(record["course_id"]),
+                    _int_or_none(record.get("capacity")),
+                    parse_meetings(record.get("meetings")),
+                    _int_or_none(record.get("instructor_id")),
+                )
+                for record in chunk
+            )
+        )
+        count += len(chunk)
+    return count
+
+
+class EnrollmentImportReport:
+    """
+    Summarizes the outcome of import_enrollments.
+
+    Attributes:
+        imported (int): The number of enrollments created; records of existing enrollments are not counted.
+        rejected (Dict[str, List[int]]): The record numbers, counting from 0, that were not imported,
+            grouped by reason ("unknown student", "unknown course", "not enrolled" or "invalid grade").
+        messages (Dict[int, str]): Why each student with "not enrolled" records was turned away, as
+            returned by enroll_student_in_courses (a full course or a time clash).
+
+    Methods:
+        __str__(): Returns a one-line summary of the import.
+        __repr__(): Returns a string representation of the report for debugging.
+        reject(row: int, reason: str): Records a rejected record number under the given reason.
+    """
+
+    def __init__(self) -> None:
+        self.imported: int = 0
+        self.rejected: Dict[str, List[int]] = {}
+        self.messages: Dict[int, str] = {}
+
+    def __str__(self) -> str:
+        rejected = ", ".join(f"{len(rows)} {reason}" for reason, rows in self.rejected.items())
+        return f"{self.imported} enrollment(s) imported, {sum(len(rows) for rows in self.rejected.values())} record(s) rejected" + (
+            f" ({rejected})" if rejected else ""
+        )
+
+    def __repr__(self) -> str:
+        return f"EnrollmentImportReport(imported={self.imported}, rejected={self.rejected}, messages={self.messages})"
+
+    def reject(self, row: int, reason: str) -> None:
+        self.rejected.setdefault(reason, []).append(row)
+
+
+def import_enrollments(
+    system: StudentManagementSystem, source: Source, fmt: Optional[str] = None, chunk_size: int = 10_000
+) -> EnrollmentImportReport:
+    """
+    Enrolls students in courses from a file of (student_id, course_id, grade) records, chunk_size records
+    at a time. Each chunk is enrolled student by student, and the grades it contains are then assigned
+    with assign_grades_bulk. As enroll_student_in_courses is all or nothing, a full or clashing course
+    turns away all of a student's records in the chunk, and their grades with them.
+
+    Returns:
+        EnrollmentImportReport: The number of enrollments created and the records that were rejected, by reason.
+    """
+    report = EnrollmentImportReport()
+    row = 0
+    for chunk in chunks(read_records(source, fmt), chunk_size):
+        courses_by_student: Dict[int, Dict[int, Course]] = {}
+        rows_by_student: Dict[int, List[Tuple[int, int]]] = {}  # {student_id: [(row, course_id)]}
+        graded: List[Tuple[int, int, int]] = []
+        graded_rows: List[int] = []
+        for record in chunk:
+            student_id, course_id = int(record["student_id"]), int(record["course_id"])
+            course = system.courses.get(course_id)
+            if system.students.get(student_id) is None:
+                report.reject(row, "unknown student")
+            elif course is None:
+                report.reject(row, "unknown course")
+            else:
+                courses_by_student.setdefault(student_id, {})[course_id] = course
+                rows_by_student.setdefault(student_id, []).append((row, course_id))
+                grade = _int_or_none(record.get("grade"))
+                if grade is not None:
+                    graded.append((student_id, course_id, grade))
+                    graded_rows.append(row)
+            row += 1
+        for student_id, courses in courses_by_student.items():
+            enrolled = system.grades_for_student(student_id).keys()
+            created = len(courses.keys() - enrolled)
+            message = system.enroll_student_in_courses(system.students.get(student_id), *courses.values())
+            enrolled = system.grades_for_student(student_id).keys()
+            if courses.keys() <= enrolled:
+                report.imported += created
+            else:
+                report.messages[student_id] = message
+                for student_row, course_id in rows_by_student[student_id]:
+                    if course_id not in enrolled:
+                        report.reject(student_row, "not enrolled")
+        if graded:
+            # Grades of records turned away above are rejected as "not enrolled" here too, and not counted twice
+            for reason, rows in system.assign_grades_bulk(graded).rejected.items():
+                if reason == "invalid grade":
+                    for graded_row in rows:
+                        report.reject(graded_rows[graded_row], reason)
+    return report
+
+
+def import_grades(system: StudentManagementSystem, source: Source, fmt: Optional[str] = None, chunk_size: int = 10_000) -> int:
+    """
+    Assigns the grades in a file of (student_id, course_id, grade) records with assign_grades_bulk,
+    chunk_size records at a time.
+
+    Returns:
+        int: The number of grades assigned.
+    """
+    applied = 0
+    for chunk in chunks(read_records(source, fmt), chunk_size):
+        applied += system.assign_grades_bulk(
+            (int(record["student_id"]), int(record["course_id"]), _int_or_none(record["grade"])) for record in chunk
+        ).applied
+    return applied
+
+
+def student_records(system: StudentManagementSystem) -> Iterator[Dict[str, object]]:
+    for student in system.students:
+        yield {"id_number": student.id_number, "name": student.name, "major": student.major}
+
+
+def instructor_records(system: StudentManagementSystem) -> Iterator[Dict[str, object]]:
+    for instructor in system.instructors:
+        yield {"id_number": instructor.id_number, "name": instructor.name, "department": instructor.department}
+
+
+def course_records(system: StudentManagementSystem) -> Iterator[Dict[str, object]]:
+    for course in system.courses:
+        yield {
+            "course_id": course.course_id,
+            "course_name": course.course_name,
+            "capacity": course.capacity,
+            "meetings": format_meetings(course.meetings),
+            "instructor_id": course.instructor_id,
+        }
+
+
+def enrollment_records(system: StudentManagementSystem) -> Iterator[Dict[str, object]]:
+    for enrollment in system.enrollments:
+        yield {"student_id": enrollment.student_id, "course_id": enrollment.course_id, "grade": enrollment.grade}
+
+
+def grade_records(system: StudentManagementSystem) -> Iterator[Dict[str, object]]:
+    for enrollment in system.enrollments:
+        if enrollment.grade is not None:
+            yield {"student_id": enrollment.student_id, "course_id": enrollment.course_id, "grade": enrollment.grade}
+
+
+_RECORDS = {
+    "students": student_records,
+    "instructors": instructor_records,
+    "courses": course_records,
+    "enrollments": enrollment_records,
+    "grades": grade_records,
+}
+
+
+def export(system: StudentManagementSystem, kind: str, target: Source, fmt: Optional[str] = None) -> int:
+    """
+    Streams one kind of record ("students", "instructors", "courses", "enrollments" or "grades")
+    from the system's registries to a file, without building an intermediate list.
+
+    Returns:
+        int: The number of records written.
+    """
+    return write_records(target, kind, _RECORDS[kind](system), fmt)
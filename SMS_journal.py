@@ -0,0 +1,321 @@
+import gc
+import os
+import struct
+import zlib
+from typing import BinaryIO, Callable, Dict, Hashable, Iterator, List, Optional, Tuple
+
+from SMS_Project import Course, Instructor, StorageBackend, Student, StudentManagementSystem, format_meetings, parse_meetings
+from SMS_snapshot import NONE, SnapshotReader, write_snapshot
+
+# The tables in the order of their codes in journal records
+_TABLE_CODES: Dict[str, int] = {"students": 0, "instructors": 1, "courses": 2, "enrollments": 3}
+_TABLE_NAMES: Tuple[str, ...] = tuple(_TABLE_CODES)
+
+_FRAME = struct.Struct("<II")  # Payload length and CRC-32 of one group commit
+_OP = struct.Struct("<B")  # table code * 2, plus 1 for a removal
+_ID = struct.Struct("<q")
+_PAIR = struct.Struct("<qq")
+_TRIPLE = struct.Struct("<qqq")
+_LENGTH = struct.Struct("<I")
+
+
+def _pack_text(text: str) -> bytes:
+    data = text.encode()
+    return _LENGTH.pack(len(data)) + data
+
+
+def _unpack_text(view: memoryview, offset: int) -> Tuple[str, int]:
+    (length,) = _LENGTH.unpack_from(view, offset)
+    offset += _LENGTH.size
+    return str(view[offset : offset + length], "utf-8"), offset + length
+
+
+def encode_record(table: str, key: Hashable, item: Optional[object]) -> bytes:
+    """
+    Encodes one change as a journal record: an operation byte followed by the key and, unless the
+    object was removed, its fields.
+    """
+    code = _TABLE_CODES[table]
+    if item is None:
+        return _OP.pack(code * 2 + 1) + (_PAIR.pack(*key) if table == "enrollments" else _ID.pack(key))
+    op = _OP.pack(code * 2)
+    if table == "students":
+        return op + _ID.pack(item.id_number) + _pack_text(item.name) + _pack_text(item.major)
+    if table == "instructors":
+        return op + _ID.pack(item.id_number) + _pack_text(item.name) + _pack_text(item.department)
+    if table == "courses":
+        capacity = NONE if item.capacity is None else item.capacity
+        instructor = NONE if item.instructor_id is None else item.instructor_id
+        return op + _TRIPLE.pack(item.course_id, capacity, instructor) + _pack_text(item.course_name) + _pack_text(format_meetings(item.meetings))
+    grade = NONE if item.grade is None else item.grade
+    return op + _TRIPLE.pack(item.student_id, item.course_id, grade)
+
+
+def decode_records(view: memoryview) -> Iterator[Tuple[str, Hashable, bool, Optional[object]]]:
+    """
+    Yields (table, key, removed, item) for every record in a frame's payload, where item is None for
+    a removal and an enrollment's item is its grade.
+    """
+    offset, end = 0, len(view)
+    while offset < end:
+        (op,) = _OP.unpack_from(view, offset)
+        offset += _OP.size
+        table, removed = _TABLE_NAMES[op // 2], op % 2
+        if removed:
+            if table == "enrollments":
+                key = _PAIR.unpack_from(view, offset)
+                offset += _PAIR.size
+            else:
+                (key,) = _ID.unpack_from(view, offset)
+                offset += _ID.size
+            yield table, key, True, None
+        elif table == "enrollments":
+            student_id, course_id, grade = _TRIPLE.unpack_from(view, offset)
+            offset += _TRIPLE.size
+            yield table, (student_id, course_id), False, None if grade == NONE else grade
+        elif table == "courses":
+            course_id, capacity, instructor = _TRIPLE.unpack_from(view, offset)
+            name, offset = _unpack_text(view, offset + _TRIPLE.size)
+            meetings, offset = _unpack_text(view, offset)
+            yield table, course_id, False, Course(
+                name, course_id, None if capacity == NONE else capacity, parse_meetings(meetings), None if instructor == NONE else instructor
+            )
+        else:
+            (id_number,) = _ID.unpack_from(view, offset)
+            name, offset = _unpack_text(view, offset + _ID.size)
+            detail, offset = _unpack_text(view, offset)
+            cls = Student if table == "students" else Instructor
+            yield table, id_number, False, cls(name, id_number, detail)
+
+
+def read_snapshot(path: str) -> Tuple[int, Dict[str, Dict[Hashable, object]]]:
+    """
+    Reads a whole snapshot into tables to replay the journal onto.
+
+    Returns:
+        Tuple[int, Dict[str, Dict[Hashable, object]]]: The snapshot's generation and its tables: students,
+        instructors and courses by ID, and enrollment grades by (student_id, course_id).
+    """
+    with SnapshotReader(path) as snapshot:
+        tables = {
+            "students": {student.id_number: student for student in snapshot.students()},
+            "instructors": {instructor.id_number: instructor for instructor in snapshot.instructors()},
+            "courses": {course.course_id: course for course in snapshot.courses()},
+            "enrollments": {(student_id, course_id): grade for student_id, course_id, grade in snapshot.enrollments()},
+        }
+        return snapshot.generation, tables
+
+
+class JournalStorage(StorageBackend):
+    """
+    Persists a StudentManagementSystem as an append-only binary journal of its changes, plus periodic snapshots.
+
+    Every change the system records is encoded at once as a compact binary record. Records are
+    written in groups (group commit): once group_size records are pending, or when the system is
+    saved, they are appended to the journal as one frame with a length and a CRC-32, and synced to
+    disk. A crash loses at most the uncommitted group, and a torn frame at the end of the journal is
+    detected on recovery and cut off, so that the frames committed after it are appended to intact ones.
+
+    A snapshot writes the whole state in the SMS_snapshot format (see write_snapshot), after which a
+    new journal file is started and the old ones are deleted, so recovery reads the latest snapshot
+    through a memory map and only replays the journal written since. With snapshot_every set, a
+    snapshot is taken automatically once that many records have been journaled since the last one.
+    Records are idempotent upserts and removals, so a snapshot taken in the middle of a change is
+    still recovered correctly.
+
+    The recovered state is handed to the system in one go: use open_journaled() to create the
+    system, which loads everything and then lets the storage release its copy.
+
+    Attributes:
+        directory (str): The directory holding the snapshot and the journal files.
+        group_size (int): The number of records that are committed together.
+        sync (bool): Whether each commit is synced to disk with fsync.
+        snapshot_every (Optional[int]): The number of journaled records after which a snapshot is taken.
+        system (Optional[StudentManagementSystem]): The system whose state snapshots are taken of.
+
+    Methods:
+        record(table: str, key: Hashable, item: Optional[object]): Encodes a change into the pending group.
+        flush(): Commits the pending group.
+        snapshot(): Writes a snapshot of the system and starts a new journal file.
+        load(table: str, key: Hashable), load_all(table: str), load_enrollments(course_id: Optional[int]), count(table: str):
+            Read the recovered state.
+        release(): Drops the recovered state once the system has loaded it.
+        close(): Commits the pending group and closes the journal.
+    """
+
+    def __init__(
+        self, directory: str, group_size: int = 1000, sync: bool = True, snapshot_every: Optional[int] = None
+    ) -> None:
+        self.directory: str = directory
+        self.group_size: int = group_size
+        self.sync: bool = sync
+        self.snapshot_every: Optional[int] = snapshot_every
+        self.system: Optional[StudentManagementSystem] = None
+        self._pending: bytearray = bytearray()
+        self._pending_count: int = 0
+        self._journaled: int = 0  # Records committed since the last snapshot
+        os.makedirs(directory, exist_ok=True)
+        self._generation, self._tables = self._recover()
+        self._file: BinaryIO = open(self._journal_path(self._generation), "ab")
+
+    def _snapshot_path(self) -> str:
+        return os.path.join(self.directory, "snapshot.bin")
+
+    def _journal_path(self, generation: int) -> str:
+        return os.path.join(self.directory, f"journal-{generation:06d}.log")
+
+    def _journals(self) -> List[Tuple[int, str]]:
+        return sorted(
+            (int(name[8:14]), os.path.join(self.directory, name))
+            for name in os.listdir(self.directory)
+            if name.startswith("journal-") and name.endswith(".log")
+        )
+
+    def _recover(self) -> Tuple[int, Dict[str, Dict[Hashable, object]]]:
+        """
+        Loads the latest snapshot and replays the journal files written since, truncating each one
+        at its first torn frame.
+        """
+        if os.path.exists(self._snapshot_path()):
+            generation, tables = read_snapshot(self._snapshot_path())
+        else:
+            generation, tables = 0, {table: {} for table in _TABLE_NAMES}
+        for file_generation, path in self._journals():
+            if file_generation < generation:
+                os.remove(path)  # Left over from a crash right after a snapshot
+                continue
+            count, end = self._replay(path, tables)
+            self._journaled += count
+            if end < os.path.getsize(path):
+                with open(path, "r+b") as file:
+                    file.truncate(end)
+                    file.flush()
+                    os.fsync(file.fileno())
+        return generation, tables
+
+    def _replay(self, path: str, tables: Dict[str, Dict[Hashable, object]]) -> Tuple[int, int]:
+        """
+        Applies the intact frames of a journal file to the tables.
+
+        Returns:
+            Tuple[int, int]: The number of records applied and the offset just after the last intact frame.
+        """
+        with open(path, "rb") as file:
+            data = file.read()
+        view, offset, count = memoryview(data), 0, 0
+        while offset + _FRAME.size <= len(data):
+            length, checksum = _FRAME.unpack_from(view, offset)
+            payload = view[offset + _FRAME.size : offset + _FRAME.size + length]
+            if len(payload) < length or zlib.crc32(payload) != checksum:
+                break  # A torn write at the end; everything before it is intact
+            for table, key, removed, item in decode_records(payload):
+                if removed:
+                    tables[table].pop(key, None)
+                else:
+                    tables[table][key] = item
+                count += 1
+            offset += _FRAME.size + length
+        return count, offset
+
+    def record(self, table: str, key: Hashable, item: Optional[object]) -> None:
+        self._pending += encode_record(table, key, item)
+        self._pending_count += 1
+        if self._pending_count >= self.group_size:
+            self.flush()
+
+    def flush(self) -> None:
+        self._commit()
+        if self.snapshot_every is not None and self.system is not None and self._journaled >= self.snapshot_every:
+            self.snapshot()
+
+    def _commit(self) -> None:
+        if not self._pending_count:
+            return
+        self._file.write(_FRAME.pack(len(self._pending), zlib.crc32(self._pending)) + self._pending)
+        self._file.flush()
+        if self.sync:
+            os.fsync(self._file.fileno())
+        self._journaled += self._pending_count
+        self._pending.clear()
+        self._pending_count = 0
+
+    def snapshot(self) -> None:
+        """
+        Writes a snapshot of the system, then switches to a new journal file and deletes the old ones.
+        """
+        if self.system is None:
+            raise ValueError("No system to take a snapshot of; create it with open_journaled()")
+        self._commit()
+        generation = self._generation + 1
+        write_snapshot(self._snapshot_path(), self.system, generation)
+        self._file.close()
+        self._generation = generation
+        self._file = open(self._journal_path(generation), "ab")
+        for file_generation, path in self._journals():
+            if file_generation < generation:
+                os.remove(path)
+        self._journaled = 0
+
+    def load(self, table: str, key: Hashable) -> Optional[object]:
+        return self._tables[table].get(key) if self._tables is not None else None
+
+    def load_all(self, table: str) -> Iterator[object]:
+        return iter(self._tables[table].values()) if self._tables is not None else iter(())
+
+    def load_enrollments(self, course_id: Optional[int] = None) -> Iterator[Tuple[int, int, Optional[int]]]:
+        if self._tables is None:
+            return
+        for (student_id, enrolled_course_id), grade in self._tables["enrollments"].items():
+            if course_id is None or enrolled_course_id == course_id:
+                yield student_id, enrolled_course_id, grade
+
+    def count(self, table: str) -> int:
+        return len(self._tables[table]) if self._tables is not None else 0
+
+    def release(self) -> None:
+        self._tables = None
+
+    def close(self) -> None:
+        self._commit()
+        self._file.close()
+
+
+def open_journaled(
+    directory: str,
+    columnar_grades: bool = False,
+    group_size: int = 1000,
+    sync: bool = True,
+    snapshot_every: Optional[int] = 1_000_000,
+    system_class: Callable[..., StudentManagementSystem] = StudentManagementSystem,
+) -> StudentManagementSystem:
+    """
+    Recovers a StudentManagementSystem from a journal directory (creating it if needed) and keeps
+    journaling its changes there. Call save() to commit the pending group of changes.
+
+    Args:
+        directory (str): The directory holding the snapshot and the journal files.
+        columnar_grades (bool): Keep the grades in a GradeStore.
+        group_size (int): The number of records that are committed together.
+        sync (bool): Whether each commit is synced to disk with fsync.
+        snapshot_every (Optional[int]): The number of journaled records after which a snapshot is taken; None for never.
+        system_class (Callable[..., StudentManagementSystem]): The kind of system to create.
+
+    Returns:
+        StudentManagementSystem: The recovered system.
+    """
+    # Recovery allocates millions of objects that all stay alive, so the cyclic garbage collector would
+    # only rescan them over and over
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        storage = JournalStorage(directory, group_size, sync, snapshot_every)
+        system = system_class(columnar_grades=columnar_grades, storage=storage)
+        # Loading the enrollments first also loads the students and courses without a per-course roster query
+        len(system.enrollments)
+        system.instructors.load_all()
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+    storage.release()
+    storage.system = system
+    return system
@@ -0,0 +1,282 @@
+import inspect
+import threading
+import time
+from bisect import bisect_left
+from collections import deque
+from functools import wraps
+from itertools import accumulate
+from typing import Any, Callable, Deque, Dict, List, Optional, Sequence, Tuple
+
+from SMS_Project import Course, StudentManagementSystem
+
+# The upper bounds of the latency histogram buckets, in seconds
+DEFAULT_BUCKETS: Tuple[float, ...] = (0.00001, 0.00005, 0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0)
+COURSE_METHODS: Tuple[str, ...] = (
+    "add_students_to_course",
+    "remove_student_from_course",
+    "list_enrolled_students",
+    "is_full",
+    "waitlist",
+)
+ARGUMENT_REPR_LIMIT = 200  # The longest argument text kept in a slow-call sample
+
+
+class _MethodStats:
+    __slots__ = ("calls", "errors", "seconds", "max_seconds", "buckets")
+
+    def __init__(self, bucket_count: int) -> None:
+        self.buckets: List[int] = [0] * (bucket_count + 1)  # The last bucket counts calls above every bound
+        self.reset()
+
+    def reset(self) -> None:
+        self.calls: int = 0
+        self.errors: int = 0
+        self.seconds: float = 0.0
+        self.max_seconds: float = 0.0
+        self.buckets[:] = [0] * len(self.buckets)
+
+
+class Metrics:
+    """
+    The call counts, latency histograms and slow calls of one instrumented system, plus the sizes of
+    its collections at the time they are exported. Use instrument() to start collecting.
+
+    A call counts as slow when it takes at least slow_seconds; the last sample_size slow calls are
+    kept with their method, duration and arguments, the arguments as text so that sampling does not
+    keep the objects alive. Calls made by one instrumented method to another are counted for both.
+
+    Attributes:
+        buckets (Tuple[float, ...]): The upper bounds of the latency histogram buckets, in seconds.
+        slow_seconds (float): The duration from which a call is sampled as slow.
+        system (Optional[StudentManagementSystem]): The instrumented system.
+
+    Methods:
+        call(method: str, function: Callable, args: tuple, kwargs: dict): Calls a function and records the call under a method name.
+        observe(method: str, seconds: float, args: tuple, kwargs: dict, failed: bool): Records one call.
+        slow_calls(): Returns the sampled slow calls, oldest first.
+        sizes(): Returns the current sizes of the system's collections.
+        snapshot(): Returns everything collected as a dictionary.
+        prometheus(prefix: str): Returns everything collected in the Prometheus text exposition format.
+        reset(): Forgets every call recorded so far.
+    """
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS, slow_seconds: float = 0.01, sample_size: int = 100) -> None:
+        """
+        Args:
+            buckets (Sequence[float]): The upper bounds of the latency histogram buckets, in seconds.
+            slow_seconds (float): The duration from which a call is sampled as slow.
+            sample_size (int): The number of slow calls kept.
+        """
+        self.buckets: Tuple[float, ...] = tuple(sorted(buckets))
+        self.slow_seconds: float = slow_seconds
+        self.system: Optional[StudentManagementSystem] = None
+        self._methods: Dict[str, _MethodStats] = {}
+        self._slow: Deque[Dict[str, Any]] = deque(maxlen=sample_size)
+        self._lock: threading.Lock = threading.Lock()
+        self._wrappers: Dict[Tuple[str, Callable], Callable] = {}  # The _timed wrappers that call() goes through
+
+    def call(self, method: str, function: Callable, args: tuple, kwargs: dict) -> Any:
+        wrapper = self._wrappers.get((method, function))
+        if wrapper is None:
+            wrapper = self._wrappers[(method, function)] = _timed(self, method, function)
+        return wrapper(*args, **kwargs)
+
+    def observe(self, method: str, seconds: float, args: tuple = (), kwargs: Optional[dict] = None, failed: bool = False) -> None:
+        self._record(self._stats(method), method, seconds, args, kwargs, failed)
+
+    def _stats(self, method: str) -> _MethodStats:
+        with self._lock:
+            stats = self._methods.get(method)
+            if stats is None:
+                stats = self._methods[method] = _MethodStats(len(self.buckets))
+            return stats
+
+    def _record(self, stats: _MethodStats, method: str, seconds: float, args: tuple, kwargs: Optional[dict], failed: bool) -> None:
+        with self._lock:
+            stats.calls += 1
+            stats.errors += failed
+            stats.seconds += seconds
+            if seconds > stats.max_seconds:
+                stats.max_seconds = seconds
+            stats.buckets[bisect_left(self.buckets, seconds)] += 1
+            if seconds >= self.slow_seconds:
+                arguments = [repr(arg)[:ARGUMENT_REPR_LIMIT] for arg in args]
+                arguments += [f"{name}={value!r}"[:ARGUMENT_REPR_LIMIT] for name, value in (kwargs or {}).items()]
+                self._slow.append({"method": method, "seconds": seconds, "arguments": arguments, "failed": failed, "at": time.time()})
+
+    def slow_calls(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            return list(self._slow)
+
+    def sizes(self) -> Dict[str, int]:
+        """
+        Measures the system's collections. Collections that a system with storage has not loaded yet
+        are counted by the storage backend, so exporting never triggers a load; rosters and waitlists
+        are only measured once the enrollments are loaded.
+        """
+        system = self.system
+        if system is None:
+            return {}
+        storage = system._storage
+        sizes = {
+            table: len(registry) if storage is None or registry._bulk_loader is None else storage.count(table)
+            for table, registry in (("students", system.students), ("instructors", system.instructors), ("courses", system.courses))
+        }
+        sizes["views"] = len(system.views)
+        if "enrollments" in system.__dict__:
+            rosters = [len(course.enrolled_students) for course in system.courses]
+            sizes["enrollments"] = len(system.enrollments)
+            sizes["roster_max"] = max(rosters, default=0)
+            sizes["waitlisted"] = sum(len(course_ids) for course_ids in system._waitlisted.values())
+        else:
+            sizes["enrollments"] = storage.count("enrollments")
+        return sizes
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Returns a dictionary with the statistics of every method called so far ("methods": calls,
+        errors, total, mean and max seconds, and the histogram as cumulative counts by bucket bound),
+        the collection sizes ("sizes") and the slow calls ("slow_calls").
+        """
+        with self._lock:
+            methods = {
+                method: {
+                    "calls": stats.calls,
+                    "errors": stats.errors,
+                    "seconds": stats.seconds,
+                    "mean_seconds": stats.seconds / stats.calls,
+                    "max_seconds": stats.max_seconds,
+                    "buckets": dict(zip([*map(str, self.buckets), "+Inf"], self._cumulative(stats))),
+                }
+                for method, stats in sorted(self._methods.items())
+                if stats.calls
+            }
+        return {"methods": methods, "sizes": self.sizes(), "slow_calls": self.slow_calls()}
+
+    @staticmethod
+    def _cumulative(stats: _MethodStats) -> List[int]:
+        return list(accumulate(stats.buckets))
+
+    def prometheus(self, prefix: str = "sms") -> str:
+        """
+        Returns the method statistics and collection sizes in the Prometheus text exposition format:
+        a {prefix}_call_seconds histogram and a {prefix}_call_errors_total counter labelled by method,
+        and a {prefix}_collection_size gauge labelled by collection.
+        """
+        lines = [
+            f"# HELP {prefix}_call_seconds Duration of method calls.",
+            f"# TYPE {prefix}_call_seconds histogram",
+        ]
+        with self._lock:
+            methods = [(method, stats, self._cumulative(stats)) for method, stats in sorted(self._methods.items()) if stats.calls]
+        for method, stats, counts in methods:
+            for bound, count in zip([*map(str, self.buckets), "+Inf"], counts):
+                lines.append(f'{prefix}_call_seconds_bucket{{method="{method}",le="{bound}"}} {count}')
+            lines.append(f'{prefix}_call_seconds_sum{{method="{method}"}} {stats.seconds!r}')
+            lines.append(f'{prefix}_call_seconds_count{{method="{method}"}} {stats.calls}')
+        lines += [f"# HELP {prefix}_call_errors_total Method calls that raised.", f"# TYPE {prefix}_call_errors_total counter"]
+        lines += [f'{prefix}_call_errors_total{{method="{method}"}} {stats.errors}' for method, stats, _ in methods]
+        lines += [f"# HELP {prefix}_collection_size Number of items in a collection.", f"# TYPE {prefix}_collection_size gauge"]
+        lines += [f'{prefix}_collection_size{{collection="{name}"}} {size}' for name, size in self.sizes().items()]
+        return "\n".join(lines) + "\n"
+
+    def reset(self) -> None:
+        with self._lock:
+            for stats in self._methods.values():
+                stats.reset()  # In place, since the wrappers hold on to their method's stats
+            self._slow.clear()
+
+
+def _public_methods(cls: type) -> List[str]:
+    return [name for name in dir(cls) if not name.startswith("_") and inspect.isfunction(getattr(cls, name))]
+
+
+def _timed(metrics: Metrics, method: str, function: Callable) -> Callable:
+    stats, record = metrics._stats(method), metrics._record
+
+    @wraps(function)
+    def wrapper(*args, **kwargs):
+        failed = True
+        start = time.perf_counter()
+        try:
+            result = function(*args, **kwargs)
+            failed = False
+            return result
+        finally:
+            record(stats, method, time.perf_counter() - start, args, kwargs, failed)
+
+    return wrapper
+
+
+def _course_hook(name: str, function: Callable) -> Callable:
+    method = f"Course.{name}"
+
+    @wraps(function)
+    def wrapper(self: Course, *args, **kwargs):
+        system = self._system
+        metrics = None if system is None else system.__dict__.get("_metrics")
+        if metrics is None:
+            return function(self, *args, **kwargs)
+        return metrics.call(method, function, (self, *args), kwargs)
+
+    return wrapper
+
+
+_course_lock = threading.Lock()
+_course_originals: Dict[str, Callable] = {}  # The Course methods replaced by hooks, while any system is instrumented
+_instrumented_count = 0
+
+
+def instrument(system: StudentManagementSystem, metrics: Optional[Metrics] = None) -> Metrics:
+    """
+    Starts collecting metrics on a system: every public method of the system is wrapped on the
+    instance, and the public methods of Course are hooked while any system is instrumented, so that
+    calls on the system's courses are counted too. Without instrumentation nothing is wrapped, so an
+    uninstrumented system runs at full speed.
+
+    Args:
+        system (StudentManagementSystem): The system to instrument, which must not be shared by an asyncio facade.
+        metrics (Optional[Metrics]): Where to collect the metrics; a new Metrics with the default settings if not given.
+
+    Returns:
+        Metrics: The metrics being collected, also available as system._metrics.
+    """
+    global _instrumented_count
+    if "_metrics" in system.__dict__:
+        return system._metrics
+    metrics = metrics if metrics is not None else Metrics()
+    metrics.system = system
+    for name in _public_methods(type(system)):
+        function = getattr(system, name)
+        setattr(system, name, _timed(metrics, name, function))
+    system._metrics = metrics
+    with _course_lock:
+        if not _instrumented_count:
+            for name in COURSE_METHODS:
+                _course_originals[name] = getattr(Course, name)
+                setattr(Course, name, _course_hook(name, _course_originals[name]))
+        _instrumented_count += 1
+    return metrics
+
+
+def uninstrument(system: StudentManagementSystem) -> Optional[Metrics]:
+    """
+    Stops collecting metrics on a system, removing its wrappers, and unhooks Course once no system
+    is instrumented.
+
+    Returns:
+        Optional[Metrics]: The metrics collected, or None if the system was not instrumented.
+    """
+    global _instrumented_count
+    metrics = system.__dict__.pop("_metrics", None)
+    if metrics is None:
+        return None
+    for name in _public_methods(type(system)):
+        system.__dict__.pop(name, None)
+    with _course_lock:
+        _instrumented_count -= 1
+        if not _instrumented_count:
+            for name, function in _course_originals.items():
+                setattr(Course, name, function)
+            _course_originals.clear()
+    return metrics
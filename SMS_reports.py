@@ -0,0 +1,189 @@
+import threading
+from contextlib import nullcontext
+from typing import ContextManager, Dict, List, Optional, Tuple
+
+from SMS_Project import ChangeEvent, StudentManagementSystem
+
+
+class MaterializedReports:
+    """
+    Registrar reports kept up to date as a StudentManagementSystem changes, so that reading one is a
+    lookup rather than a pass over the registries: the number of students enrolled in each course,
+    the average grade of each major and the teaching load of each department.
+
+    The reports are computed once from the system's current state, then the reports subscribe to
+    the system's change events and update the affected aggregates in constant time per event. Each
+    student's grade count and sum are kept as well, so a change of major moves them in one step.
+
+    With a ConcurrentStudentManagementSystem, pass lock=True: its assign_grade calls run in parallel
+    and so deliver events from several threads at once.
+
+    Attributes:
+        system (StudentManagementSystem): The system reported on.
+
+    Methods:
+        enrollment_count(course_id: int): Returns the number of students enrolled in a course.
+        enrollment_counts(): Returns the number of students enrolled in every course with any.
+        major_average(major: str): Returns the average grade of the students with a major, or None.
+        major_averages(): Returns the average grade of every major with a grade.
+        instructor_load(instructor_id: int): Returns the number of courses an instructor teaches.
+        department_load(department: str): Returns the number of instructors in a department and of courses they teach.
+        department_loads(): Returns the load of every department with an instructor.
+        close(): Stops following the system's changes.
+    """
+
+    def __init__(self, system: StudentManagementSystem, lock: bool = False) -> None:
+        """
+        Args:
+            system (StudentManagementSystem): The system to report on.
+            lock (bool): Guard the aggregates with a lock, for systems that change from several threads at once.
+        """
+        self.system: StudentManagementSystem = system
+        self._lock: ContextManager = threading.Lock() if lock else nullcontext()
+        self._course_counts: Dict[int, int] = {}  # {course_id: number of enrollments}
+        self._majors: Dict[int, str] = {}  # {student_id: major}
+        self._student_grades: Dict[int, List[int]] = {}  # {student_id: [number of grades, sum of grades]}
+        self._major_grades: Dict[str, List[int]] = {}  # {major: [number of grades, sum of grades]}
+        self._departments: Dict[int, str] = {}  # {instructor_id: department}
+        self._instructor_loads: Dict[int, int] = {}  # {instructor_id: number of courses taught}
+        self._department_loads: Dict[str, List[int]] = {}  # {department: [number of instructors, courses taught]}
+        with system._writing():
+            self._rebuild()
+            system.subscribe(self._apply)
+
+    def _rebuild(self) -> None:
+        system = self.system
+        for student in system.students:
+            self._majors[student.id_number] = student.major
+        for enrollment in system.enrollments:
+            self._apply_enrollment("add", enrollment.student_id, enrollment.course_id, None, enrollment.grade)
+        for instructor in system.instructors:
+            self._add_instructor(instructor.id_number, instructor.department)
+        for instructor_id, courses in system._instructor_courses.items():
+            for _ in courses:
+                self._teach(instructor_id, 1)
+
+    def close(self) -> None:
+        self.system.unsubscribe(self._apply)
+
+    def _apply(self, event: ChangeEvent) -> None:
+        with self._lock:
+            table = event.table
+            if table == "enrollments":
+                self._apply_enrollment(event.kind, *event.key, event.old, event.new)
+            elif table == "students":
+                self._apply_student(event)
+            elif table == "teaching":
+                self._teach(event.key[0], -1 if event.kind == "remove" else 1)
+            elif table == "instructors":
+                self._apply_instructor(event)
+
+    def _apply_enrollment(self, kind: str, student_id: int, course_id: int, old_grade: Optional[int], grade: Optional[int]) -> None:
+        if kind == "add":
+            self._course_counts[course_id] = self._course_counts.get(course_id, 0) + 1
+        elif kind == "remove":
+            count = self._course_counts[course_id] - 1
+            if count:
+                self._course_counts[course_id] = count
+            else:
+                del self._course_counts[course_id]
+        if old_grade is not None:
+            self._grade(student_id, -1, -old_grade)
+        if grade is not None:
+            self._grade(student_id, 1, grade)
+
+    def _grade(self, student_id: int, count: int, total: int) -> None:
+        grades = self._student_grades.get(student_id)
+        if grades is None:
+            grades = self._student_grades[student_id] = [0, 0]
+        grades[0] += count
+        grades[1] += total
+        if not grades[0]:
+            del self._student_grades[student_id]
+        major = self._majors.get(student_id)
+        if major is not None:
+            self._move(major, count, total)
+
+    def _move(self, major: str, count: int, total: int) -> None:
+        grades = self._major_grades.get(major)
+        if grades is None:
+            grades = self._major_grades[major] = [0, 0]
+        grades[0] += count
+        grades[1] += total
+        if not grades[0]:
+            del self._major_grades[major]
+
+    def _apply_student(self, event: ChangeEvent) -> None:
+        student_id = event.key
+        old_major = self._majors.pop(student_id, None)
+        grades = self._student_grades.get(student_id)
+        if grades is not None and old_major is not None:
+            self._move(old_major, -grades[0], -grades[1])
+        if event.new is not None:
+            self._majors[student_id] = event.new.major
+            if grades is not None:
+                self._move(event.new.major, grades[0], grades[1])
+        else:
+            self._student_grades.pop(student_id, None)
+
+    def _add_instructor(self, instructor_id: int, department: str) -> None:
+        self._departments[instructor_id] = department
+        load = self._department_loads.setdefault(department, [0, 0])
+        load[0] += 1
+        load[1] += self._instructor_loads.get(instructor_id, 0)
+
+    def _apply_instructor(self, event: ChangeEvent) -> None:
+        instructor_id = event.key
+        department = self._departments.pop(instructor_id, None)
+        if department is not None:
+            load = self._department_loads[department]
+            load[0] -= 1
+            load[1] -= self._instructor_loads.get(instructor_id, 0)
+            if not load[0]:
+                del self._department_loads[department]
+        if event.new is not None:
+            self._add_instructor(instructor_id, event.new.department)
+        else:
+            self._instructor_loads.pop(instructor_id, None)
+
+    def _teach(self, instructor_id: int, change: int) -> None:
+        load = self._instructor_loads.get(instructor_id, 0) + change
+        if load:
+            self._instructor_loads[instructor_id] = load
+        else:
+            self._instructor_loads.pop(instructor_id, None)
+        department = self._departments.get(instructor_id)
+        if department is not None:
+            self._department_loads[department][1] += change
+
+    def enrollment_count(self, course_id: int) -> int:
+        return self._course_counts.get(course_id, 0)
+
+    def enrollment_counts(self) -> Dict[int, int]:
+        with self._lock:
+            return dict(self._course_counts)
+
+    def major_average(self, major: str) -> Optional[float]:
+        with self._lock:
+            grades = self._major_grades.get(major)
+            return None if grades is None else grades[1] / grades[0]
+
+    def major_averages(self) -> Dict[str, float]:
+        with self._lock:
+            return {major: total / count for major, (count, total) in self._major_grades.items()}
+
+    def instructor_load(self, instructor_id: int) -> int:
+        return self._instructor_loads.get(instructor_id, 0)
+
+    def department_load(self, department: str) -> Tuple[int, int]:
+        """
+        Returns:
+            Tuple[int, int]: The number of instructors in the department and of courses they teach.
+        """
+        with self._lock:
+            load = self._department_loads.get(department)
+            return (0, 0) if load is None else (load[0], load[1])
+
+    def department_loads(self) -> Dict[str, Tuple[int, int]]:
+        with self._lock:
+            return {department: (load[0], load[1]) for department, load in self._department_loads.items()}
@@ -0,0 +1,611 @@
+import heapq
+import multiprocessing
+import os
+from itertools import islice
+from multiprocessing.connection import Connection
+from operator import attrgetter, itemgetter
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+from SMS_Project import (
+    BulkGradeReport,
+    Course,
+    Enrollment,
+    Instructor,
+    MeetingSlot,
+    Registry,
+    ScheduleReport,
+    Student,
+    StudentManagementSystem,
+    _added,
+    _paginate,
+)
+
+
+class _Shard:
+    """
+    The worker side of a shard: answers requests against the shard's own StudentManagementSystem.
+    Requests name students and courses by ID where the shard has its own copy, and results are
+    plain data, since course objects carry the whole system with them.
+    """
+
+    def __init__(self, index: int, columnar_grades: bool) -> None:
+        self.index: int = index
+        self.system: StudentManagementSystem = StudentManagementSystem(columnar_grades)
+
+    def _student(self, student: Student) -> Student:
+        return self.system.students.get(student.id_number) or student
+
+    def _enrolled(self, student_ids: Iterable[int]) -> List[int]:
+        """Returns the course IDs of the students' enrollments, one per enrollment."""
+        enrollments = self.system._student_enrollments
+        return [course_id for student_id in student_ids for course_id in enrollments.get(student_id, ())]
+
+    def _grant(self, free: Dict[int, int]) -> None:
+        """
+        Sets the capacity of the shard's copy of each course to its local roster plus the seats free
+        across all shards, so the shard's own capacity checks see the whole course.
+        """
+        for course_id, seats in free.items():
+            course = self.system.courses.get(course_id)
+            if course is not None:
+                course.capacity = len(course.enrolled_students) + seats
+
+    def run(self, function: Callable[..., Any], args: tuple) -> Any:
+        return function(self.system, self.index, *args)
+
+    def add_student(self, student: Student) -> str:
+        return self.system.add_student(student)
+
+    def add_students(self, students: List[Student]) -> List[int]:
+        """Adds the students whose ID numbers are not registered yet, and returns the ID numbers skipped."""
+        skipped = []
+        for student in students:
+            if self.system.students.get(student.id_number) is None:
+                self.system.add_student(student)
+            else:
+                skipped.append(student.id_number)
+        return skipped
+
+    def remove_student(self, id_number: int) -> Tuple[str, List[int]]:
+        freed = self._enrolled((id_number,))
+        return self.system.remove_student(id_number), freed
+
+    def remove_students(self, id_numbers: List[int]) -> Tuple[int, List[int]]:
+        freed = self._enrolled(id_numbers)
+        return self.system._remove_students(id_numbers)[0], freed
+
+    def find_student(self, id_number: int) -> Optional[Tuple[int, Student]]:
+        return self.system.find_student(id_number)
+
+    def update_student(self, student: Student) -> str:
+        return self.system.update_student(student)
+
+    def show_student(self) -> List[Student]:
+        return list(self.system.show_student())
+
+    def find_students_by_major(self, major: str) -> List[Student]:
+        return self.system.find_students_by_major(major)
+
+    def search_students(self, text: str, prefix: bool, limit: Optional[int]) -> List[Student]:
+        return self.system.search_students(text, prefix, limit)
+
+    def add_courses(self, courses: List[Tuple[str, int, Optional[int], Tuple[MeetingSlot, ...]]]) -> None:
+        self.system.add_courses(*(Course(*course) for course in courses))
+
+    def update_course(self, course_name: str, course_id: int, capacity: Optional[int], meetings: Tuple[MeetingSlot, ...]) -> None:
+        self.system.update_course(Course(course_name, course_id, capacity, meetings))
+
+    def remove_course(self, course_id: int) -> None:
+        self.system.remove_course(course_id)
+
+    def remove_courses(self, course_ids: List[int]) -> int:
+        return self.system._remove_courses(course_ids)[1]
+
+    def enroll_student_in_courses(self, student: Student, course_ids: List[int], free: Dict[int, int]) -> Tuple[str, List[int]]:
+        """
+        Returns:
+            Tuple[str, List[int]]: The system's message and the IDs of the courses the student was newly enrolled in.
+        """
+        courses = [self.system.courses.get(course_id) for course_id in course_ids]
+        if None in courses:
+            return "Course not found.", []
+        self._grant(free)
+        before = set(self._enrolled((student.id_number,)))
+        message = self.system.enroll_student_in_courses(self._student(student), *courses)
+        return message, [course_id for course_id in self._enrolled((student.id_number,)) if course_id not in before]
+
+    def schedule_students(self, requests: List[Tuple[int, Sequence[str]]], free: Dict[int, int]) -> ScheduleReport:
+        self._grant(free)
+        return self.system.schedule_students(requests)
+
+    def assign_grade(self, student: Student, course_id: int, grade: int) -> str:
+        course = self.system.courses.get(course_id)
+        if course is None:
+            return "Course not found."
+        return self.system.assign_grade(self._student(student), course, grade)
+
+    def assign_grades_bulk(self, rows: List[Tuple[int, int, int]]) -> BulkGradeReport:
+        return self.system.assign_grades_bulk(rows)
+
+    def students_grades(self) -> Dict[int, Dict[str, Optional[int]]]:
+        return {student_id: dict(grades) for student_id, grades in self.system.students_grades().items()}
+
+    def get_student_grades(self, student_id: int) -> Optional[Dict[str, Optional[int]]]:
+        grades = self.system.get_student_grades(student_id)
+        return None if grades is None else dict(grades)
+
+    def student_course_list(self, student_id: int) -> Union[List[str], str]:
+        return self.system.student_course_list(student_id)
+
+    def list_enrolled_students(self, course_id: int) -> List[str]:
+        course = self.system.courses.get(course_id)
+        return [] if course is None else course.list_enrolled_students()
+
+    def enrollments_for_student(self, student_id: int) -> List[Tuple[Student, int, Optional[int]]]:
+        return [(e.student, e.course_id, e.grade) for e in self.system.enrollments_for_student(student_id)]
+
+    def enrollments_for_course(self, course_id: int) -> List[Tuple[Student, int, Optional[int]]]:
+        return [(e.student, e.course_id, e.grade) for e in self.system.enrollments_for_course(course_id)]
+
+    def show_enrollment(self) -> List[str]:
+        return [str(enrollment) for enrollment in self.system.enrollments]
+
+    def grades_for_student(self, student_id: int) -> Dict[int, Optional[int]]:
+        return self.system.grades_for_student(student_id)
+
+    def grades_for_course(self, course_id: int) -> Dict[int, Optional[int]]:
+        return self.system.grades_for_course(course_id)
+
+    def page(self, name: str, args: tuple) -> List[Any]:
+        return list(getattr(self.system, name)(*args))
+
+    def enrollment_page(
+        self, after_id: Optional[Tuple[int, int]], limit: Optional[int], where: Optional[Callable[[Enrollment], bool]]
+    ) -> List[Tuple[Student, int, Optional[int]]]:
+        return [(e.student, e.course_id, e.grade) for e in self.system.iter_enrollments(after_id, limit, where)]
+
+    def grade_rollup(self, course_id: int) -> Tuple[int, int]:
+        return tuple(self.system._grade_rollups.get(course_id, (0, 0)))
+
+
+def _split(seats: int, parts: int) -> List[int]:
+    """Splits a number of seats into parts that differ by at most one, the larger ones first."""
+    return [seats // parts + (part < seats % parts) for part in range(parts)]
+
+
+def _serve(connection: Connection, index: int, columnar_grades: bool) -> None:
+    """
+    Runs shard number index: answers (method name, arguments) requests until it receives None.
+    """
+    shard = _Shard(index, columnar_grades)
+    while True:
+        request = connection.recv()
+        if request is None:
+            break
+        name, args = request
+        try:
+            connection.send((True, getattr(shard, name)(*args)))
+        except Exception as error:
+            connection.send((False, error))
+    connection.close()
+
+
+class ShardedStudentManagementSystem:
+    """
+    A StudentManagementSystem spread over worker processes, so that work on different students runs
+    on different cores.
+
+    Students are partitioned by id_number: shard id_number % shard_count holds the student, their
+    enrollments and their grades in its own StudentManagementSystem, and every method about one
+    student is sent to that shard. Every shard has a copy of the course catalogue, while instructors
+    only live in the parent process. Queries that span students (students_grades, studentlist_in_course,
+    show_student, ...) are sent to all shards at once and their results merged, and map_shards runs any
+    picklable function against every shard's system in parallel, for jobs such as nightly recomputations.
+
+    Unlike a single system, a course's roster is only known to the shards, so use studentlist_in_course
+    or enrollments_for_course instead of Course.list_enrolled_students, and merged listings are in shard
+    order. Each shard has the courses' capacities and meetings, and so rejects time clashes and full
+    courses itself: the parent process counts the seats taken in each capacity-limited course across
+    the shards, and grants a shard the free seats before it enrolls anyone. Waitlists are not
+    supported, since Course.add_students_to_course only sees the catalogue's copy of a course. Students
+    and courses passed in are sent by value, so later changes to the objects do not reach the shards.
+    There is no subscribe(), since enrollments and grades change in the shards' processes. The iter_*
+    pages ask every shard for a page and merge them by ID, so a where filter must be picklable.
+
+    Attributes:
+        shard_count (int): The number of worker processes.
+        catalogue (StudentManagementSystem): The instructors and courses, kept in the parent process.
+
+    Methods:
+        shard_of(student_id: int): Returns the shard that holds a student.
+        map_shards(function: Callable, *args): Calls function(system, shard, *args) in every shard and returns the results in shard order.
+        close(): Stops the worker processes.
+
+    The other methods are those of StudentManagementSystem.
+    """
+
+    def __init__(self, shard_count: Optional[int] = None, columnar_grades: bool = False) -> None:
+        """
+        Args:
+            shard_count (Optional[int]): The number of worker processes; the number of CPUs if not given.
+            columnar_grades (bool): Keep each shard's grades in a GradeStore.
+        """
+        self.shard_count: int = shard_count or os.cpu_count() or 1
+        self.catalogue: StudentManagementSystem = StudentManagementSystem()
+        self._taken: Dict[int, int] = {}  # {course_id: seats taken across the shards}, for courses with a capacity
+        self._connections: List[Connection] = []
+        self._processes: List[multiprocessing.Process] = []
+        for index in range(self.shard_count):
+            parent, child = multiprocessing.Pipe()
+            process = multiprocessing.Process(target=_serve, args=(child, index, columnar_grades), daemon=True)
+            process.start()
+            child.close()
+            self._connections.append(parent)
+            self._processes.append(process)
+
+    def __enter__(self) -> "ShardedStudentManagementSystem":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        for connection in self._connections:
+            connection.send(None)
+            connection.close()
+        for process in self._processes:
+            process.join()
+        self._connections, self._processes = [], []
+
+    def shard_of(self, student_id: int) -> int:
+        return student_id % self.shard_count
+
+    def _scatter(self, requests: Dict[int, Tuple[str, tuple]]) -> Dict[int, Any]:
+        """
+        Sends one request to each of the given shards, then collects the answers, so the shards work in
+        parallel. An error raised in a shard is raised here once every answer is in.
+        """
+        for shard, request in requests.items():
+            self._connections[shard].send(request)
+        answers = {shard: self._connections[shard].recv() for shard in requests}
+        for ok, result in answers.values():
+            if not ok:
+                raise result
+        return {shard: result for shard, (_, result) in answers.items()}
+
+    def _call(self, student_id: int, name: str, *args: Any) -> Any:
+        shard = self.shard_of(student_id)
+        return self._scatter({shard: (name, args)})[shard]
+
+    def _broadcast(self, name: str, *args: Any) -> List[Any]:
+        results = self._scatter({shard: (name, args) for shard in range(self.shard_count)})
+        return [results[shard] for shard in range(self.shard_count)]
+
+    def map_shards(self, function: Callable[..., Any], *args: Any) -> List[Any]:
+        """
+        Calls function(system, shard, *args) with every shard's StudentManagementSystem and number, in
+        parallel. The function and its arguments must be picklable, e.g. a module-level function.
+
+        Returns:
+            List[Any]: The function's results, in shard order.
+        """
+        return self._broadcast("run", function, args)
+
+    def _enrollments(self, rows: List[Tuple[Student, int, Optional[int]]]) -> List[Enrollment]:
+        # Enrollments point to the catalogue's course, or hold just its ID if the course was removed
+        return [Enrollment(student, self.catalogue.courses.get(course_id) or course_id, grade) for student, course_id, grade in rows]
+
+    def add_student(self, student: Student) -> str:
+        return self._call(student.id_number, "add_student", student)
+
+    def add_students(self, *students: Student) -> str:
+        by_shard: Dict[int, List[Student]] = {}
+        for student in students:
+            by_shard.setdefault(self.shard_of(student.id_number), []).append(student)
+        results = self._scatter({shard: ("add_students", (chunk,)) for shard, chunk in by_shard.items()}).values()
+        skipped = [id_number for ids in results for id_number in ids]
+        return _added("student", len(students) - len(skipped), skipped)
+
+    def remove_student(self, id_number: int) -> str:
+        message, freed = self._call(id_number, "remove_student", id_number)
+        self._take(freed, -1)
+        return message
+
+    def remove_students(self, *id_numbers: int) -> str:
+        by_shard: Dict[int, List[int]] = {}
+        for id_number in id_numbers:
+            by_shard.setdefault(self.shard_of(id_number), []).append(id_number)
+        results = self._scatter({shard: ("remove_students", (chunk,)) for shard, chunk in by_shard.items()}).values()
+        students = enrollments = 0
+        for removed, freed in results:
+            students += removed
+            enrollments += len(freed)
+            self._take(freed, -1)
+        return f"{students} student(s) and {enrollments} enrollment(s) have been removed."
+
+    def find_student(self, id_number: int) -> Optional[Tuple[int, Student]]:
+        """
+        Finds a student by their ID number. The index returned is the student's slot in their shard.
+        """
+        return self._call(id_number, "find_student", id_number)
+
+    def update_student(self, student: Student) -> str:
+        return self._call(student.id_number, "update_student", student)
+
+    def show_student(self) -> List[Student]:
+        return [student for students in self._broadcast("show_student") for student in students]
+
+    def _merged_page(self, name: str, args: tuple, key: Callable, limit: Optional[int]) -> Iterator[Any]:
+        return islice(heapq.merge(*self._broadcast("page", name, args), key=key), limit)
+
+    def iter_students(
+        self,
+        after_id: Optional[int] = None,
+        limit: Optional[int] = None,
+        where: Optional[Callable[[Student], bool]] = None,
+        fields: Optional[Sequence[str]] = None,
+    ) -> Iterator[Union[Student, Dict[str, object]]]:
+        key = attrgetter("id_number") if fields is None else itemgetter("id_number")
+        return self._merged_page("iter_students", (after_id, limit, where, fields), key, limit)
+
+    def find_students_by_major(self, major: str) -> List[Student]:
+        return [student for students in self._broadcast("find_students_by_major", major) for student in students]
+
+    def search_students(self, text: str, prefix: bool = False, limit: Optional[int] = None) -> List[Student]:
+        found = [student for students in self._broadcast("search_students", text, prefix, limit) for student in students]
+        return found if limit is None else found[:limit]
+
+    def add_instructor(self, instructor: Instructor) -> str:
+        return self.catalogue.add_instructor(instructor)
+
+    def add_instructors(self, *instructors: Instructor) -> str:
+        return self.catalogue.add_instructors(*instructors)
+
+    def remove_instructor(self, id_number: int) -> str:
+        return self.catalogue.remove_instructor(id_number)
+
+    def find_instructor(self, id_number: int) -> Optional[Tuple[int, Instructor]]:
+        return self.catalogue.find_instructor(id_number)
+
+    def update_instructor(self, instructor: Instructor) -> str:
+        return self.catalogue.update_instructor(instructor)
+
+    def show_instructors(self) -> List[Instructor]:
+        return self.catalogue.show_instructors()
+
+    def iter_instructors(
+        self,
+        after_id: Optional[int] = None,
+        limit: Optional[int] = None,
+        where: Optional[Callable[[Instructor], bool]] = None,
+        fields: Optional[Sequence[str]] = None,
+    ) -> Iterator[Union[Instructor, Dict[str, object]]]:
+        return self.catalogue.iter_instructors(after_id, limit, where, fields)
+
+    def find_instructors_by_department(self, department: str) -> List[Instructor]:
+        return self.catalogue.find_instructors_by_department(department)
+
+    def search_instructors(self, text: str, prefix: bool = False, limit: Optional[int] = None) -> List[Instructor]:
+        return self.catalogue.search_instructors(text, prefix, limit)
+
+    def _take(self, course_ids: Iterable[int], change: int) -> None:
+        taken = self._taken
+        for course_id in course_ids:
+            if course_id in taken:
+                taken[course_id] += change
+
+    def _free(self, course_ids: Iterable[int]) -> Dict[int, int]:
+        """Returns the seats free across the shards in each of the courses that have a capacity."""
+        free = {}
+        for course_id in course_ids:
+            if course_id in self._taken:
+                free[course_id] = max(self.catalogue.courses.get(course_id).capacity - self._taken[course_id], 0)
+        return free
+
+    def add_courses(self, *courses: Course) -> str:
+        """
+        Adds courses to the catalogue and to every shard, skipping those whose ID is already registered.
+        Students already on a course's roster are enrolled in their shards, as far as the course's
+        capacity allows, and the roster is emptied, since rosters live in the shards.
+        """
+        new: Dict[int, Course] = {}
+        skipped = []
+        for course in courses:
+            if course.course_id in new or self.catalogue.courses.get(course.course_id) is not None:
+                skipped.append(course.course_id)
+            else:
+                new[course.course_id] = course
+        courses = tuple(new.values())
+        rosters = []
+        for course in courses:
+            rosters.append((course, list(course.enrolled_students)))
+            course.enrolled_students = Registry("id_number")
+        self.catalogue.add_courses(*courses)
+        self._broadcast(
+            "add_courses", [(course.course_name, course.course_id, course.capacity, course.meetings) for course in courses]
+        )
+        for course in courses:
+            if course.capacity is not None:
+                self._taken.setdefault(course.course_id, 0)
+        for course, students in rosters:
+            for student in students:
+                self.enroll_student_in_courses(student, course)
+        return _added("course", len(courses), skipped)
+
+    def remove_course(self, course_id: int) -> str:
+        self._broadcast("remove_course", course_id)
+        self._taken.pop(course_id, None)
+        return self.catalogue.remove_course(course_id)
+
+    def remove_courses(self, *course_ids: int) -> str:
+        enrollments = sum(self._broadcast("remove_courses", list(course_ids)))
+        for course_id in course_ids:
+            self._taken.pop(course_id, None)
+        courses, _ = self.catalogue._remove_courses(course_ids)
+        return f"{courses} course(s) and {enrollments} enrollment(s) have been removed."
+
+    def find_course(self, course_id: int) -> Optional[Tuple[int, Course]]:
+        return self.catalogue.find_course(course_id)
+
+    def update_course(self, course: Course) -> str:
+        """
+        Updates a course in the catalogue and every shard. A lower capacity does not drop any
+        enrollments; it only stops new ones until enough seats are freed.
+        """
+        self._broadcast("update_course", course.course_name, course.course_id, course.capacity, course.meetings)
+        if course.capacity is None:
+            self._taken.pop(course.course_id, None)
+        elif course.course_id not in self._taken:
+            self._taken[course.course_id] = sum(
+                len(students) for students in self._broadcast("list_enrolled_students", course.course_id)
+            )
+        return self.catalogue.update_course(course)
+
+    def assign_instructor(self, course_id: int, instructor_id: Optional[int]) -> str:
+        return self.catalogue.assign_instructor(course_id, instructor_id)
+
+    def courses_for_instructor(self, instructor_id: int) -> List[Course]:
+        return self.catalogue.courses_for_instructor(instructor_id)
+
+    def enroll_student_in_courses(self, student: Student, *courses: Course) -> str:
+        course_ids = [course.course_id for course in courses]
+        message, linked = self._call(
+            student.id_number, "enroll_student_in_courses", student, course_ids, self._free(course_ids)
+        )
+        self._take(linked, 1)
+        return message
+
+    def schedule_students(self, requests: Sequence[Tuple[int, Sequence[str]]]) -> ScheduleReport:
+        """
+        Splits the requests by shard, schedules each shard's students in parallel and merges the reports.
+        The free seats of each section are split evenly between the shards beforehand, so no section
+        goes over its capacity, but a shard may find a section full while another has a seat to spare.
+        """
+        by_shard: Dict[int, List[Tuple[int, Sequence[str]]]] = {}
+        for student_id, course_names in requests:
+            by_shard.setdefault(self.shard_of(student_id), []).append((student_id, list(course_names)))
+        shards = list(by_shard)
+        grants: Dict[int, Dict[int, int]] = {shard: {} for shard in shards}
+        for course_id, seats in self._free(self._taken).items():
+            for shard, share in zip(shards, _split(seats, len(shards))):
+                grants[shard][course_id] = share
+        reports = self._scatter(
+            {shard: ("schedule_students", (chunk, grants[shard])) for shard, chunk in by_shard.items()}
+        )
+        merged = ScheduleReport()
+        for report in reports.values():
+            merged.enrolled.update(report.enrolled)
+            merged.unscheduled.update(report.unscheduled)
+            for course_ids in report.enrolled.values():
+                self._take(course_ids, 1)
+        return merged
+
+    def show_enrollment(self) -> None:
+        for lines in self._broadcast("show_enrollment"):
+            for line in lines:
+                print(line)
+
+    def iter_enrollments(
+        self,
+        after_id: Optional[Tuple[int, int]] = None,
+        limit: Optional[int] = None,
+        where: Optional[Callable[[Enrollment], bool]] = None,
+        fields: Optional[Sequence[str]] = None,
+    ) -> Iterator[Union[Enrollment, Dict[str, object]]]:
+        pages = self._broadcast("enrollment_page", after_id, limit, where)
+        rows = list(islice(heapq.merge(*pages, key=lambda row: (row[0].id_number, row[1])), limit))
+        return _paginate(iter(self._enrollments(rows)), ("student_id", "course_id"), None, None, fields)
+
+    def assign_grade(self, student: Student, course: Course, grade: int) -> str:
+        return self._call(student.id_number, "assign_grade", student, course.course_id, grade)
+
+    def assign_grades_bulk(
+        self,
+        rows: Optional[Sequence[Tuple[int, int, int]]] = None,
+        student_ids: Optional[Sequence[int]] = None,
+        course_ids: Optional[Sequence[int]] = None,
+        grades: Optional[Sequence[int]] = None,
+    ) -> BulkGradeReport:
+        """
+        Splits the rows by shard, assigns each shard's rows in parallel and merges the reports,
+        with rejected row numbers referring to the rows as given.
+        """
+        if rows is None:
+            if not len(student_ids) == len(course_ids) == len(grades):
+                raise ValueError("student_ids, course_ids and grades must have the same length")
+            rows = zip(student_ids, course_ids, grades)
+        by_shard: Dict[int, Tuple[List[int], List[Tuple[int, int, int]]]] = {}
+        for row, (student_id, course_id, grade) in enumerate(rows):
+            numbers, shard_rows = by_shard.setdefault(self.shard_of(student_id), ([], []))
+            numbers.append(row)
+            shard_rows.append((student_id, course_id, grade))
+        reports = self._scatter({shard: ("assign_grades_bulk", (shard_rows,)) for shard, (_, shard_rows) in by_shard.items()})
+        merged = BulkGradeReport()
+        for shard, report in reports.items():
+            numbers = by_shard[shard][0]
+            merged.applied += report.applied
+            for reason, shard_rows in report.rejected.items():
+                for row in shard_rows:
+                    merged.reject(numbers[row], reason)
+        for rejected in merged.rejected.values():
+            rejected.sort()
+        return merged
+
+    def students_grades(self) -> Dict[int, Dict[str, Optional[int]]]:
+        merged: Dict[int, Dict[str, Optional[int]]] = {}
+        for grades in self._broadcast("students_grades"):
+            merged.update(grades)
+        return merged
+
+    def iter_students_grades(
+        self,
+        after_id: Optional[int] = None,
+        limit: Optional[int] = None,
+        where: Optional[Callable[[Tuple[int, Dict[str, Optional[int]]]], bool]] = None,
+        fields: Optional[Sequence[str]] = None,
+    ) -> Iterator[Tuple[int, Dict[str, Optional[int]]]]:
+        return self._merged_page("iter_students_grades", (after_id, limit, where, fields), itemgetter(0), limit)
+
+    def get_student_grades(self, student_id: int) -> Optional[Dict[str, Optional[int]]]:
+        return self._call(student_id, "get_student_grades", student_id)
+
+    def studentlist_in_course(self, course_id: int) -> Union[List[str], str]:
+        course = self.catalogue.courses.get(course_id)
+        if course is None:
+            return "Course not found."
+        enrolled_students = [student for students in self._broadcast("list_enrolled_students", course_id) for student in students]
+        return enrolled_students or f"No students are enrolled in {course.course_name}."
+
+    def iter_course_students(
+        self,
+        course_id: int,
+        after_id: Optional[int] = None,
+        limit: Optional[int] = None,
+        where: Optional[Callable[[Student], bool]] = None,
+        fields: Optional[Sequence[str]] = None,
+    ) -> Iterator[Union[Student, Dict[str, object]]]:
+        key = attrgetter("id_number") if fields is None else itemgetter("id_number")
+        return self._merged_page("iter_course_students", (course_id, after_id, limit, where, fields), key, limit)
+
+    def student_course_list(self, student_id: int) -> Union[List[str], str]:
+        return self._call(student_id, "student_course_list", student_id)
+
+    def enrollments_for_student(self, student_id: int) -> List[Enrollment]:
+        return self._enrollments(self._call(student_id, "enrollments_for_student", student_id))
+
+    def enrollments_for_course(self, course_id: int) -> List[Enrollment]:
+        return self._enrollments([row for rows in self._broadcast("enrollments_for_course", course_id) for row in rows])
+
+    def grades_for_student(self, student_id: int) -> Dict[int, Optional[int]]:
+        return self._call(student_id, "grades_for_student", student_id)
+
+    def grades_for_course(self, course_id: int) -> Dict[int, Optional[int]]:
+        merged: Dict[int, Optional[int]] = {}
+        for grades in self._broadcast("grades_for_course", course_id):
+            merged.update(grades)
+        return merged
+
+    def course_grade_rollup(self, course_id: int) -> Optional[Tuple[int, float]]:
+        rollups = self._broadcast("grade_rollup", course_id)
+        count, total = sum(rollup[0] for rollup in rollups), sum(rollup[1] for rollup in rollups)
+        return (count, total / count) if count else None
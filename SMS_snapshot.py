@@ -0,0 +1,402 @@
+import gc
+import mmap
+import os
+import struct
+from array import array
+from bisect import bisect_left
+from itertools import accumulate
+from operator import attrgetter
+from typing import BinaryIO, Callable, Dict, Iterator, List, Optional, Tuple
+
+from SMS_Project import UNGRADED, Course, Enrollment, Instructor, MeetingSlot, Student, StudentManagementSystem, format_meetings, parse_meetings
+
+NONE = -(2**63)  # Stands for None in integer fields, such as an unlimited course capacity
+SNAPSHOT_MAGIC = b"SMSSNAP3"
+
+_HEADER = struct.Struct("<8sQQQQQQ")  # Magic, generation and the number of strings, students, instructors, courses and enrollments
+_COUNTS = ("strings", "students", "instructors", "courses", "enrollments")
+
+
+def _sections(strings: int, students: int, instructors: int, courses: int, enrollments: int) -> List[Tuple[str, str, int]]:
+    """
+    Returns the (name, typecode, length) of every array in a snapshot, in file order. Each array
+    starts on an 8-byte boundary, and the UTF-8 blob of the string pool follows the last one.
+
+    Students, instructors and courses are stored sorted by ID, so a lookup is a binary search, with
+    an "order" array giving their rows in the order they were added. Text fields hold indexes into
+    the string pool, where every distinct string is stored once. Enrollments refer to student and
+    course rows, and are grouped by student and by course through offset arrays: the enrollments of
+    student row r are enrollment positions student_enrollments[student_enrollment_offsets[r]:student_enrollment_offsets[r + 1]].
+    """
+    return [
+        ("string_offsets", "q", strings + 1),
+        ("student_ids", "q", students),
+        ("student_names", "i", students),
+        ("student_majors", "i", students),
+        ("student_order", "i", students),
+        ("student_enrollment_offsets", "q", students + 1),
+        ("student_enrollments", "i", enrollments),
+        ("instructor_ids", "q", instructors),
+        ("instructor_names", "i", instructors),
+        ("instructor_departments", "i", instructors),
+        ("instructor_order", "i", instructors),
+        ("course_ids", "q", courses),
+        ("course_names", "i", courses),
+        ("course_capacities", "q", courses),
+        ("course_meetings", "i", courses),
+        ("course_instructors", "q", courses),
+        ("course_order", "i", courses),
+        ("course_enrollment_offsets", "q", courses + 1),
+        ("course_enrollments", "i", enrollments),
+        ("enrollment_students", "i", enrollments),
+        ("enrollment_courses", "i", enrollments),
+        ("enrollment_grades", "i", enrollments),
+    ]
+
+
+def _group(keys: List[int], groups: int) -> Tuple[array, array]:
+    """
+    Groups positions 0..len(keys)-1 by their key, keeping their order within a group.
+
+    Returns:
+        Tuple[array, array]: The offsets of each group and the grouped positions.
+    """
+    counts = [0] * (groups + 1)
+    for key in keys:
+        counts[key + 1] += 1
+    return array("q", accumulate(counts)), array("i", sorted(range(len(keys)), key=keys.__getitem__))
+
+
+def _table(items: list, key: Callable[[object], int]) -> Tuple[list, Dict[int, int], array]:
+    """
+    Sorts a table's objects by ID.
+
+    Returns:
+        Tuple[list, Dict[int, int], array]: The sorted objects, the row of each ID and the rows in the original order.
+    """
+    by_id = sorted(items, key=key)
+    rows = {key(item): row for row, item in enumerate(by_id)}
+    return by_id, rows, array("i", (rows[key(item)] for item in items))
+
+
+def write_snapshot(path: str, system: StudentManagementSystem, generation: int = 0) -> None:
+    """
+    Writes the whole state of a system to a binary snapshot that SnapshotReader can map without
+    parsing, atomically replacing any file at path.
+
+    Args:
+        path (str): The file to write.
+        system (StudentManagementSystem): The system to take a snapshot of.
+        generation (int): A number stored in the header for the caller's own use, such as a journal generation.
+    """
+    pool: Dict[str, int] = {}  # {text: index}, so every distinct string is stored once
+
+    def intern(text: str) -> int:
+        return pool.setdefault(text, len(pool))
+
+    students, student_rows, student_order = _table(list(system.students), attrgetter("id_number"))
+    instructors, _, instructor_order = _table(list(system.instructors), attrgetter("id_number"))
+    courses, course_rows, course_order = _table(list(system.courses), attrgetter("course_id"))
+    enrollments = [
+        enrollment for enrollment in system.enrollments
+        if enrollment.student_id in student_rows and enrollment.course_id in course_rows
+    ]
+    enrollment_students = [student_rows[enrollment.student_id] for enrollment in enrollments]
+    enrollment_courses = [course_rows[enrollment.course_id] for enrollment in enrollments]
+    student_offsets, student_enrollments = _group(enrollment_students, len(students))
+    course_offsets, course_enrollments = _group(enrollment_courses, len(courses))
+
+    arrays: Dict[str, array] = {
+        "student_ids": array("q", (student.id_number for student in students)),
+        "student_names": array("i", (intern(student.name) for student in students)),
+        "student_majors": array("i", (intern(student.major) for student in students)),
+        "student_order": student_order,
+        "student_enrollment_offsets": student_offsets,
+        "student_enrollments": student_enrollments,
+        "instructor_ids": array("q", (instructor.id_number for instructor in instructors)),
+        "instructor_names": array("i", (intern(instructor.name) for instructor in instructors)),
+        "instructor_departments": array("i", (intern(instructor.department) for instructor in instructors)),
+        "instructor_order": instructor_order,
+        "course_ids": array("q", (course.course_id for course in courses)),
+        "course_names": array("i", (intern(course.course_name) for course in courses)),
+        "course_capacities": array("q", (NONE if course.capacity is None else course.capacity for course in courses)),
+        "course_meetings": array("i", (intern(format_meetings(course.meetings)) for course in courses)),
+        "course_instructors": array("q", (NONE if course.instructor_id is None else course.instructor_id for course in courses)),
+        "course_order": course_order,
+        "course_enrollment_offsets": course_offsets,
+        "course_enrollments": course_enrollments,
+        "enrollment_students": array("i", enrollment_students),
+        "enrollment_courses": array("i", enrollment_courses),
+        "enrollment_grades": array("i", (UNGRADED if enrollment.grade is None else enrollment.grade for enrollment in enrollments)),
+    }
+    encoded = [text.encode() for text in pool]
+    arrays["string_offsets"] = array("q", accumulate(map(len, encoded), initial=0))
+
+    counts = (len(pool), len(students), len(instructors), len(courses), len(enrollments))
+    temporary = path + ".tmp"
+    with open(temporary, "wb") as file:
+        file.write(_HEADER.pack(SNAPSHOT_MAGIC, generation, *counts))
+        for name, _, _ in _sections(*counts):
+            data = arrays[name].tobytes()
+            file.write(data + bytes(-len(data) % 8))
+        file.write(b"".join(encoded))
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(temporary, path)
+
+
+class SnapshotReader:
+    """
+    Reads a snapshot written by write_snapshot through a memory map, without loading it.
+
+    Opening a snapshot only maps the file and reads its header: the arrays are read in place, and
+    a query only touches the rows it needs. Students, instructors and courses are found by binary
+    search on their sorted IDs, a student's or a course's enrollments through the grouping arrays,
+    and text is decoded from the string pool as it is needed. The objects returned are built fresh
+    for each call; courses come with their instructor's ID number only, and without a roster, which
+    enrollments_for_course provides instead.
+    Use load() to turn the whole snapshot into a StudentManagementSystem.
+
+    Attributes:
+        path (str): The snapshot file.
+        generation (int): The generation stored in the snapshot's header.
+        counts (Dict[str, int]): The number of strings, students, instructors, courses and enrollments.
+
+    Methods:
+        student(student_id: int), instructor(id_number: int), course(course_id: int): Look up one object by ID.
+        students(), instructors(), courses(): Iterate over every object, in the order they were added.
+        enrollments(): Iterates over every enrollment as a (student_id, course_id, grade) row.
+        enrollments_for_student(student_id: int): Returns a student's (course_id, grade) pairs.
+        enrollments_for_course(course_id: int): Returns a course's (student_id, grade) pairs.
+        get_student_grades(student_id: int): Returns a student's grades by course name.
+        student_course_list(student_id: int): Returns the names of a student's courses.
+        find_students_by_major(major: str), find_instructors_by_department(department: str): Filter by a text field, ignoring case.
+        load(columnar_grades: bool): Builds a StudentManagementSystem from the whole snapshot.
+        close(): Unmaps the file.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path: str = path
+        self._file: BinaryIO = open(path, "rb")
+        self._map: mmap.mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        view = memoryview(self._map)
+        self._views: List[memoryview] = [view]
+        self._strings: Optional[List[str]] = None  # The whole string pool, decoded on the first bulk read
+        try:
+            magic, self.generation, *counts = _HEADER.unpack_from(view, 0)
+            if magic != SNAPSHOT_MAGIC:
+                raise ValueError(f"{path} is not a system snapshot")
+            self.counts: Dict[str, int] = dict(zip(_COUNTS, counts))
+            self._arrays: Dict[str, memoryview] = {}
+            offset = _HEADER.size
+            for name, typecode, length in _sections(*counts):
+                size = length * array(typecode).itemsize
+                if offset + size > len(view):
+                    raise ValueError(f"{path} is truncated")
+                self._arrays[name] = view[offset : offset + size].cast(typecode)
+                self._views.append(self._arrays[name])
+                offset += size + -size % 8
+            self._blob: memoryview = view[offset:]
+            self._views.append(self._blob)
+        except Exception:
+            self.close()
+            raise
+
+    def __enter__(self) -> "SnapshotReader":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        for view in reversed(self._views):
+            view.release()
+        self._views = []
+        self._map.close()
+        self._file.close()
+
+    def _string(self, index: int) -> str:
+        if self._strings is not None:
+            return self._strings[index]
+        offsets = self._arrays["string_offsets"]
+        return str(self._blob[offsets[index] : offsets[index + 1]], "utf-8")
+
+    def _all_strings(self) -> List[str]:
+        """
+        Decodes the whole string pool at once, for reads that touch most rows. Equal text fields then
+        share one string object, as the pool stores each string once.
+        """
+        if self._strings is None:
+            offsets = self._arrays["string_offsets"].tolist()
+            text = str(self._blob, "utf-8")
+            if len(text) == len(self._blob):  # Pure ASCII, so byte offsets are character offsets
+                self._strings = [text[start:end] for start, end in zip(offsets, offsets[1:])]
+            else:
+                blob = self._blob
+                self._strings = [str(blob[start:end], "utf-8") for start, end in zip(offsets, offsets[1:])]
+        return self._strings
+
+    @staticmethod
+    def _row(ids: memoryview, key: int) -> int:
+        row = bisect_left(ids, key)
+        return row if row < len(ids) and ids[row] == key else -1
+
+    def _student_at(self, row: int) -> Student:
+        arrays = self._arrays
+        return Student(self._string(arrays["student_names"][row]), arrays["student_ids"][row], self._string(arrays["student_majors"][row]))
+
+    def _instructor_at(self, row: int) -> Instructor:
+        arrays = self._arrays
+        return Instructor(
+            self._string(arrays["instructor_names"][row]), arrays["instructor_ids"][row], self._string(arrays["instructor_departments"][row])
+        )
+
+    def _course_at(self, row: int) -> Course:
+        arrays = self._arrays
+        capacity, instructor = arrays["course_capacities"][row], arrays["course_instructors"][row]
+        return Course(
+            self._string(arrays["course_names"][row]),
+            arrays["course_ids"][row],
+            None if capacity == NONE else capacity,
+            parse_meetings(self._string(arrays["course_meetings"][row])),
+            None if instructor == NONE else instructor,
+        )
+
+    def student(self, student_id: int) -> Optional[Student]:
+        row = self._row(self._arrays["student_ids"], student_id)
+        return None if row == -1 else self._student_at(row)
+
+    def instructor(self, id_number: int) -> Optional[Instructor]:
+        row = self._row(self._arrays["instructor_ids"], id_number)
+        return None if row == -1 else self._instructor_at(row)
+
+    def course(self, course_id: int) -> Optional[Course]:
+        row = self._row(self._arrays["course_ids"], course_id)
+        return None if row == -1 else self._course_at(row)
+
+    def students(self) -> Iterator[Student]:
+        strings, arrays = self._all_strings(), self._arrays
+        ids, names, majors = arrays["student_ids"].tolist(), arrays["student_names"].tolist(), arrays["student_majors"].tolist()
+        for row in arrays["student_order"].tolist():
+            yield Student(strings[names[row]], ids[row], strings[majors[row]])
+
+    def instructors(self) -> Iterator[Instructor]:
+        strings, arrays = self._all_strings(), self._arrays
+        ids, names = arrays["instructor_ids"].tolist(), arrays["instructor_names"].tolist()
+        departments = arrays["instructor_departments"].tolist()
+        for row in arrays["instructor_order"].tolist():
+            yield Instructor(strings[names[row]], ids[row], strings[departments[row]])
+
+    def courses(self) -> Iterator[Course]:
+        strings, arrays = self._all_strings(), self._arrays
+        ids, names, capacities = arrays["course_ids"].tolist(), arrays["course_names"].tolist(), arrays["course_capacities"].tolist()
+        meetings, instructors = arrays["course_meetings"].tolist(), arrays["course_instructors"].tolist()
+        parsed: Dict[int, Tuple[MeetingSlot, ...]] = {}  # {string index: meetings}, as sections often share a timetable
+        for row in arrays["course_order"].tolist():
+            schedule = parsed.get(meetings[row])
+            if schedule is None:
+                schedule = parsed[meetings[row]] = parse_meetings(strings[meetings[row]])
+            instructor = instructors[row]
+            yield Course(
+                strings[names[row]], ids[row], None if capacities[row] == NONE else capacities[row], schedule, None if instructor == NONE else instructor
+            )
+
+    def enrollments(self) -> Iterator[Tuple[int, int, Optional[int]]]:
+        arrays = self._arrays
+        student_ids, course_ids = arrays["student_ids"].tolist(), arrays["course_ids"].tolist()
+        for student, course, grade in zip(
+            arrays["enrollment_students"].tolist(), arrays["enrollment_courses"].tolist(), arrays["enrollment_grades"].tolist()
+        ):
+            yield student_ids[student], course_ids[course], None if grade == UNGRADED else grade
+
+    def _positions(self, table: str, key: int) -> Optional[memoryview]:
+        """
+        Returns the enrollment positions of a student or a course, or None if there is no such ID.
+        """
+        row = self._row(self._arrays[f"{table}_ids"], key)
+        if row == -1:
+            return None
+        offsets = self._arrays[f"{table}_enrollment_offsets"]
+        return self._arrays[f"{table}_enrollments"][offsets[row] : offsets[row + 1]]
+
+    def enrollments_for_student(self, student_id: int) -> List[Tuple[int, Optional[int]]]:
+        positions = self._positions("student", student_id)
+        if positions is None:
+            return []
+        courses, grades, course_ids = self._arrays["enrollment_courses"], self._arrays["enrollment_grades"], self._arrays["course_ids"]
+        return [
+            (course_ids[courses[position]], None if grades[position] == UNGRADED else grades[position]) for position in positions
+        ]
+
+    def enrollments_for_course(self, course_id: int) -> List[Tuple[int, Optional[int]]]:
+        positions = self._positions("course", course_id)
+        if positions is None:
+            return []
+        students, grades, student_ids = self._arrays["enrollment_students"], self._arrays["enrollment_grades"], self._arrays["student_ids"]
+        return [
+            (student_ids[students[position]], None if grades[position] == UNGRADED else grades[position]) for position in positions
+        ]
+
+    def get_student_grades(self, student_id: int) -> Optional[Dict[str, Optional[int]]]:
+        positions = self._positions("student", student_id)
+        if positions is None:
+            return None
+        courses, grades, names = self._arrays["enrollment_courses"], self._arrays["enrollment_grades"], self._arrays["course_names"]
+        return {
+            self._string(names[courses[position]]): None if grades[position] == UNGRADED else grades[position]
+            for position in positions
+        }
+
+    def student_course_list(self, student_id: int) -> List[str]:
+        positions = self._positions("student", student_id)
+        courses, names = self._arrays["enrollment_courses"], self._arrays["course_names"]
+        return [] if positions is None else [self._string(names[courses[position]]) for position in positions]
+
+    def _matching(self, field: str, text: str) -> List[int]:
+        """
+        Returns the rows whose text field equals the text, ignoring case, in the order they were added.
+        Each distinct value of the field is decoded and compared once.
+        """
+        target = text.casefold()
+        values = self._arrays[field]
+        matches = {index for index in set(values.tolist()) if self._string(index).casefold() == target}
+        table = field.split("_")[0]
+        return [row for row in self._arrays[f"{table}_order"].tolist() if values[row] in matches] if matches else []
+
+    def find_students_by_major(self, major: str) -> List[Student]:
+        return [self._student_at(row) for row in self._matching("student_majors", major)]
+
+    def find_instructors_by_department(self, department: str) -> List[Instructor]:
+        return [self._instructor_at(row) for row in self._matching("instructor_departments", department)]
+
+    def load(
+        self, columnar_grades: bool = False, system_class: Callable[..., StudentManagementSystem] = StudentManagementSystem
+    ) -> StudentManagementSystem:
+        """
+        Builds a system holding everything in the snapshot. Stored enrollments are restored as they
+        are, without checking capacity again.
+
+        Args:
+            columnar_grades (bool): Keep the grades in a GradeStore.
+            system_class (Callable[..., StudentManagementSystem]): The kind of system to create.
+
+        Returns:
+            StudentManagementSystem: The new system.
+        """
+        # Every object built here stays alive, so the cyclic garbage collector would only rescan them
+        gc_was_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            system = system_class(columnar_grades=columnar_grades)
+            system.add_students(*self.students())
+            system.add_instructors(*self.instructors())
+            system.add_courses(*self.courses())
+            students, courses = system.students, system.courses
+            for student_id, course_id, grade in self.enrollments():
+                student, course = students.get(student_id), courses.get(course_id)
+                system._index(Enrollment(student, course, grade))
+                course.enrolled_students.append(student)
+        finally:
+            if gc_was_enabled:
+                gc.enable()
+        return system
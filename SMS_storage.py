@@ -0,0 +1,145 @@
+import sqlite3
+from typing import Callable, Dict, Hashable, Iterator, List, Optional, Tuple
+
+from SMS_Project import Course, Instructor, StorageBackend, Student, format_meetings, parse_meetings
+
+# {table: (class, key columns, other columns)}; the columns are attribute names of the stored objects
+TABLES: Dict[str, Tuple[Optional[type], Tuple[str, ...], Tuple[str, ...]]] = {
+    "students": (Student, ("id_number",), ("name", "major")),
+    "instructors": (Instructor, ("id_number",), ("name", "department")),
+    "courses": (Course, ("course_id",), ("course_name", "capacity", "meetings", "instructor_id")),
+    "enrollments": (None, ("student_id", "course_id"), ("grade",)),
+}
+# {column: (to the stored value, from the stored value)} for the columns that are not stored as they are
+CODECS: Dict[str, Tuple[Callable[[object], object], Callable[[object], object]]] = {
+    "meetings": (format_meetings, parse_meetings),
+}
+# {column: constructor argument} for the columns that are passed to the constructor under another name
+ARGUMENTS: Dict[str, str] = {"instructor_id": "instructor"}
+
+
+def to_row(table: str, item: object) -> tuple:
+    """
+    Returns the stored row of an object: its key columns followed by its other columns.
+    """
+    _, keys, columns = TABLES[table]
+    return tuple(
+        CODECS[column][0](getattr(item, column)) if column in CODECS else getattr(item, column) for column in keys + columns
+    )
+
+
+def from_row(table: str, row: tuple) -> object:
+    """
+    Builds a student, instructor or course from its stored row.
+    """
+    cls, keys, columns = TABLES[table]
+    return cls(
+        **{
+            ARGUMENTS.get(column, column): CODECS[column][1](value) if column in CODECS else value
+            for column, value in zip(keys + columns, row)
+        }
+    )
+
+
+class SQLiteStorage(StorageBackend):
+    """
+    Stores a StudentManagementSystem in a local SQLite database.
+
+    Changes are only recorded in memory until they are flushed, and repeated changes to the same
+    object are coalesced, so each flush writes every changed object once. A flush runs as one
+    transaction with one prepared statement per table and kind of change. It happens automatically
+    once batch_size objects have changed, and before anything is read back so reads see every change.
+
+    Attributes:
+        connection (sqlite3.Connection): The connection to the database.
+        batch_size (int): The number of changed objects after which changes are flushed automatically.
+
+    Methods:
+        record(table: str, key: Hashable, item: Optional[object]): Records that an object was saved, or removed if item is None.
+        flush(): Writes all recorded changes in one transaction.
+        load(table: str, key: Hashable): Returns the stored student, instructor or course with the given ID, or None.
+        load_all(table: str): Yields every stored student, instructor or course in the order they were first saved.
+        load_enrollments(course_id: Optional[int]): Yields the stored enrollments, of one course if course_id is given,
+            as (student_id, course_id, grade) rows.
+        count(table: str): Returns the number of stored objects in a table, with a COUNT query.
+        close(): Writes all recorded changes and closes the database.
+    """
+
+    def __init__(self, path: str = ":memory:", batch_size: int = 1000) -> None:
+        # Usable from any thread; a ConcurrentStudentManagementSystem makes the threads take turns
+        self.connection: sqlite3.Connection = sqlite3.connect(path, check_same_thread=False)
+        self.batch_size: int = batch_size
+        self._pending: Dict[Tuple[str, Hashable], Optional[object]] = {}  # {(table, key): object or None}
+        with self.connection:
+            for table, (_, keys, columns) in TABLES.items():
+                self.connection.execute(
+                    f"CREATE TABLE IF NOT EXISTS {table} ({', '.join(keys + columns)}, UNIQUE ({', '.join(keys)}))"
+                )
+                # Databases written before a column was added get it, empty
+                existing = {row[1] for row in self.connection.execute(f"PRAGMA table_info({table})")}
+                for column in columns:
+                    if column not in existing:
+                        self.connection.execute(f"ALTER TABLE {table} ADD COLUMN {column}")
+            self.connection.execute("CREATE INDEX IF NOT EXISTS enrollments_by_course ON enrollments (course_id)")
+
+    def record(self, table: str, key: Hashable, item: Optional[object]) -> None:
+        self._pending[(table, key)] = item
+        if len(self._pending) >= self.batch_size:
+            self.flush()
+
+    def flush(self) -> None:
+        if not self._pending:
+            return
+        saved: Dict[str, List[tuple]] = {}
+        removed: Dict[str, List[tuple]] = {}
+        for (table, key), item in self._pending.items():
+            if item is None:
+                removed.setdefault(table, []).append(key if isinstance(key, tuple) else (key,))
+            else:
+                saved.setdefault(table, []).append(to_row(table, item))
+        with self.connection:
+            for table, rows in removed.items():
+                _, keys, _ = TABLES[table]
+                self.connection.executemany(
+                    f"DELETE FROM {table} WHERE {' AND '.join(f'{key} = ?' for key in keys)}", rows
+                )
+            for table, rows in saved.items():
+                _, keys, columns = TABLES[table]
+                self.connection.executemany(
+                    f"INSERT INTO {table} ({', '.join(keys + columns)}) VALUES ({', '.join('?' * len(keys + columns))}) "
+                    f"ON CONFLICT ({', '.join(keys)}) DO UPDATE SET "
+                    + ", ".join(f"{column} = excluded.{column}" for column in columns),
+                    rows,
+                )
+        self._pending.clear()
+
+    def load(self, table: str, key: Hashable) -> Optional[object]:
+        self.flush()
+        _, keys, columns = TABLES[table]
+        row = self.connection.execute(
+            f"SELECT {', '.join(keys + columns)} FROM {table} WHERE {keys[0]} = ?", (key,)
+        ).fetchone()
+        return None if row is None else from_row(table, row)
+
+    def load_all(self, table: str) -> Iterator[object]:
+        self.flush()
+        _, keys, columns = TABLES[table]
+        for row in self.connection.execute(f"SELECT {', '.join(keys + columns)} FROM {table} ORDER BY rowid"):
+            yield from_row(table, row)
+
+    def load_enrollments(self, course_id: Optional[int] = None) -> Iterator[Tuple[int, int, Optional[int]]]:
+        self.flush()
+        if course_id is None:
+            yield from self.connection.execute("SELECT student_id, course_id, grade FROM enrollments ORDER BY rowid")
+        else:
+            yield from self.connection.execute(
+                "SELECT student_id, course_id, grade FROM enrollments WHERE course_id = ? ORDER BY rowid", (course_id,)
+            )
+
+    def count(self, table: str) -> int:
+        self.flush()
+        return self.connection.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+
+    def close(self) -> None:
+        self.flush()
+        self.connection.close()
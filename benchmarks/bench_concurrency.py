@@ -0,0 +1,118 @@
+"""
+Measures the throughput of a shared StudentManagementSystem as the number of threads grows.
+
+Run from the repository root with:
+    python -m benchmarks.bench_concurrency --students 20000 --threads 1 2 4 8 --seconds 2
+
+Every thread runs the same mix of operations: mostly get_student_grades and studentlist_in_course
+reads, plus assign_grade and enroll_student_in_courses writes. The mix is run against
+ConcurrentStudentManagementSystem and against a plain system behind a single global lock, and the
+total operations per second of each are written as JSON.
+"""
+import argparse
+import json
+import random
+import threading
+import time
+from typing import Callable, Dict, List, Tuple
+
+from benchmarks.bench_operations import Dataset
+from SMS_concurrency import ConcurrentStudentManagementSystem
+from SMS_Project import Course, Student, StudentManagementSystem
+
+
+class GloballyLocked:
+    """Forwards every method call to a system while holding one lock, the baseline being compared against."""
+
+    def __init__(self, system: StudentManagementSystem) -> None:
+        self._system = system
+        self._lock = threading.Lock()
+
+    def __getattr__(self, name: str) -> Callable:
+        method = getattr(self._system, name)
+
+        def locked(*args, **kwargs):
+            with self._lock:
+                return method(*args, **kwargs)
+
+        return locked
+
+
+class Workload:
+    """
+    The objects the threads operate on, picked before they start so the threads only touch the system
+    through its public methods.
+
+    Attributes:
+        students (List[Student]): Every student, indexed by ID number.
+        courses (List[Course]): Every course, indexed by course ID.
+        enrolled (List[Tuple[Student, Course]]): One course each student is enrolled in, indexed by ID number.
+    """
+
+    def __init__(self, system: StudentManagementSystem) -> None:
+        self.students: List[Student] = list(system.students)
+        self.courses: List[Course] = list(system.courses)
+        self.enrolled: List[Tuple[Student, Course]] = [
+            (student, system.enrollments_for_student(student.id_number)[0].course) for student in self.students
+        ]
+
+
+def worker(
+    system, workload: Workload, write_ratio: float, seed: int, stop: threading.Event, counts: List[int], slot: int
+) -> None:
+    rng = random.Random(seed)
+    n, m = len(workload.students), len(workload.courses)
+    done = 0
+    while not stop.is_set():
+        student_id = rng.randrange(n)
+        roll = rng.random()
+        if roll < write_ratio / 2:
+            student, course = workload.enrolled[student_id]
+            system.assign_grade(student, course, rng.randint(0, 100))
+        elif roll < write_ratio:
+            system.enroll_student_in_courses(workload.students[student_id], workload.courses[rng.randrange(m)])
+        elif roll < 0.5 + write_ratio / 2:
+            system.get_student_grades(student_id)
+        else:
+            system.studentlist_in_course(rng.randrange(m))
+        done += 1
+    counts[slot] = done
+
+
+def measure(system, workload: Workload, threads: int, seconds: float, write_ratio: float) -> float:
+    stop = threading.Event()
+    counts = [0] * threads
+    workers = [
+        threading.Thread(target=worker, args=(system, workload, write_ratio, i, stop, counts, i)) for i in range(threads)
+    ]
+    for thread in workers:
+        thread.start()
+    time.sleep(seconds)
+    stop.set()
+    for thread in workers:
+        thread.join()
+    return sum(counts) / seconds
+
+
+def run(students: int, thread_counts: List[int], seconds: float, write_ratio: float, seed: int) -> Dict[str, object]:
+    results = []
+    for mode in ("concurrent", "global_lock"):
+        system_class = ConcurrentStudentManagementSystem if mode == "concurrent" else StudentManagementSystem
+        dataset = Dataset(students, seed, system_class=system_class)
+        system = dataset.system if mode == "concurrent" else GloballyLocked(dataset.system)
+        workload = Workload(dataset.system)
+        for threads in thread_counts:
+            throughput = measure(system, workload, threads, seconds, write_ratio)
+            results.append({"mode": mode, "threads": threads, "ops_per_sec": round(throughput, 1)})
+    return {"students": students, "seconds": seconds, "write_ratio": write_ratio, "results": results}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--students", type=int, default=20_000)
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--seconds", type=float, default=2.0, help="how long to run each thread count")
+    parser.add_argument("--write-ratio", type=float, default=0.1, help="the share of operations that write")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    print(json.dumps(run(args.students, args.threads, args.seconds, args.write_ratio, args.seed), indent=2))
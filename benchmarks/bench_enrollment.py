@@ -0,0 +1,113 @@
+"""
+Generates a registration-day burst of enrollment attempts against courses with limited seats.
+
+Run from the repository root with:
+    python -m benchmarks.bench_enrollment --students 50000 --attempts 200000 --concurrent
+
+Every student is registered up front and every course gets a capacity. The load generator then
+replays a random stream of attempts: a student asks for a few courses at once with
+enroll_student_in_courses (all or nothing), joins the waitlist of a full course with
+Course.add_students_to_course, or drops a course with Course.remove_student_from_course, which
+promotes the next waitlisted student. The attempts per second of each kind, the outcome counts and
+a consistency check of rosters against enrollments are written as JSON.
+"""
+import argparse
+import json
+import random
+import time
+from itertools import accumulate
+from typing import Dict, List
+
+from SMS_concurrency import ConcurrentStudentManagementSystem
+from SMS_Project import Course, Student, StudentManagementSystem
+
+COURSES_PER_REQUEST = (3, 5)
+SEATS_PER_STUDENT = 3  # Seats in the whole catalogue per student, so popular courses fill up
+
+
+def build(students: int, courses: int, seed: int, concurrent: bool) -> StudentManagementSystem:
+    rng = random.Random(seed)
+    system = ConcurrentStudentManagementSystem() if concurrent else StudentManagementSystem()
+    seats = students * SEATS_PER_STUDENT // courses
+    system.add_courses(*(Course(f"Course {i}", i, rng.randint(seats // 2, seats * 3 // 2)) for i in range(courses)))
+    system.add_students(*(Student(f"Student {i}", i, f"Major {i % 80}") for i in range(students)))
+    return system
+
+
+def check(system: StudentManagementSystem) -> Dict[str, int]:
+    """
+    Counts the courses whose roster is over capacity or differs from their enrollments; both should be 0.
+    """
+    over, drifted = 0, 0
+    for course in system.courses:
+        roster = {student.id_number for student in course.enrolled_students}
+        over += course.capacity is not None and len(roster) > course.capacity
+        drifted += roster != {enrollment.student_id for enrollment in system.enrollments_for_course(course.course_id)}
+    return {"courses_over_capacity": over, "courses_out_of_sync": drifted}
+
+
+def run(students: int, courses: int, attempts: int, drop_ratio: float, seed: int, concurrent: bool) -> Dict[str, object]:
+    system = build(students, courses, seed, concurrent)
+    rng = random.Random(seed + 1)
+    cum_weights = list(accumulate(1 / (rank + 1) ** 0.8 for rank in range(courses)))
+    catalogue: List[Course] = list(system.courses)
+    people: List[Student] = list(system.students)
+    timings: Dict[str, List[int]] = {"enroll": [], "waitlist": [], "drop": []}
+    outcomes: Dict[str, int] = {"enrolled": 0, "rejected_full": 0, "waitlisted": 0, "dropped": 0}
+    clock = time.perf_counter_ns
+
+    start = time.perf_counter()
+    for _ in range(attempts):
+        student = people[rng.randrange(students)]
+        roll = rng.random()
+        if roll < drop_ratio:
+            enrollments = system.enrollments_for_student(student.id_number)
+            if not enrollments:
+                continue
+            course = enrollments[rng.randrange(len(enrollments))].course
+            began = clock()
+            course.remove_student_from_course(student)
+            timings["drop"].append(clock() - began)
+            outcomes["dropped"] += 1
+            continue
+        picks = {catalogue[i] for i in rng.choices(range(courses), cum_weights=cum_weights, k=rng.randint(*COURSES_PER_REQUEST))}
+        began = clock()
+        message = system.enroll_student_in_courses(student, *picks)
+        timings["enroll"].append(clock() - began)
+        if "not been enrolled" in message:
+            outcomes["rejected_full"] += 1
+            full = next(course for course in picks if course.is_full())
+            began = clock()
+            full.add_students_to_course(student)
+            timings["waitlist"].append(clock() - began)
+            outcomes["waitlisted"] += 1
+        else:
+            outcomes["enrolled"] += 1
+    seconds = time.perf_counter() - start
+
+    return {
+        "system": type(system).__name__,
+        "students": students,
+        "courses": courses,
+        "attempts": attempts,
+        "seconds": round(seconds, 3),
+        "attempts_per_sec": round(attempts / seconds, 1),
+        "ops_per_sec": {
+            kind: round(len(latencies) / (sum(latencies) / 1e9), 1) for kind, latencies in timings.items() if latencies
+        },
+        "outcomes": outcomes,
+        "waitlisted_now": sum(len(course.waitlist()) for course in catalogue),
+        **check(system),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--students", type=int, default=50_000)
+    parser.add_argument("--courses", type=int, default=1_000)
+    parser.add_argument("--attempts", type=int, default=200_000)
+    parser.add_argument("--drop-ratio", type=float, default=0.1, help="the share of attempts that drop a course")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--concurrent", action="store_true", help="use ConcurrentStudentManagementSystem")
+    args = parser.parse_args()
+    print(json.dumps(run(args.students, args.courses, args.attempts, args.drop_ratio, args.seed, args.concurrent), indent=2))
@@ -0,0 +1,78 @@
+"""
+Measures point-in-time transcript and roster queries on a GradeHistory after many regrades.
+
+Run from the repository root with:
+    python -m benchmarks.bench_history --students 50000 --regrades 1000000
+
+A system is populated with --students students, each enrolled in a few courses, and its history
+is started. --regrades grade changes are then made through assign_grades_bulk, one timestamp
+apart, so enrollments build up long version chains. The time per recorded change, the memory used
+by the version arrays, and the time of as-of transcript and roster queries at random points in
+the history are written as JSON.
+"""
+import argparse
+import json
+import random
+import time
+from typing import Dict
+
+from SMS_Project import Course, Student, StudentManagementSystem
+from SMS_history import GradeHistory
+
+COURSES_PER_STUDENT = 5
+BATCH = 1_000
+QUERIES = 1_000
+
+
+def run(students: int, courses: int, regrades: int, seed: int) -> Dict[str, object]:
+    rng = random.Random(seed)
+    system = StudentManagementSystem()
+    system.add_courses(*(Course(f"Course {i}", i) for i in range(courses)))
+    system.add_students(*(Student(f"Student {i}", i, f"Major {i % 80}") for i in range(students)))
+    for i in range(students):
+        system.enroll_student_in_courses(system.students.get(i), *rng.sample(list(system.courses), COURSES_PER_STUDENT))
+    keys = [(enrollment.student_id, enrollment.course_id) for enrollment in system.enrollments]
+
+    clock = [0.0]
+    history = GradeHistory(system, clock=lambda: clock[0])
+    elapsed = 0.0
+    for _ in range(regrades // BATCH):
+        rows = [(*rng.choice(keys), rng.randint(0, 100)) for _ in range(BATCH)]
+        clock[0] += 1
+        start = time.perf_counter()
+        system.assign_grades_bulk(rows)
+        elapsed += time.perf_counter() - start
+
+    times = [rng.uniform(0, clock[0]) for _ in range(QUERIES)]
+    student_ids = [rng.randrange(students) for _ in range(QUERIES)]
+    course_ids = [rng.randrange(courses) for _ in range(QUERIES)]
+    start = time.perf_counter()
+    for student_id, as_of in zip(student_ids, times):
+        history.get_student_grades(student_id, as_of)
+    transcript = time.perf_counter() - start
+    start = time.perf_counter()
+    for course_id, as_of in zip(course_ids, times):
+        history.course_roster(course_id, as_of)
+    roster = time.perf_counter() - start
+
+    versions = len(history.times)
+    return {
+        "students": students,
+        "enrollments": len(keys),
+        "versions": versions,
+        "us_per_grade_with_history": round(elapsed / regrades * 1e6, 2),
+        "version_array_bytes": versions * (history.times.itemsize + history.grades.itemsize),
+        "as_of_transcript_us": round(transcript / QUERIES * 1e6, 1),
+        "as_of_roster_us": round(roster / QUERIES * 1e6, 1),
+        "roster_size": len(keys) // courses,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--students", type=int, default=50_000)
+    parser.add_argument("--courses", type=int, default=2_000)
+    parser.add_argument("--regrades", type=int, default=1_000_000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    print(json.dumps(run(args.students, args.courses, args.regrades, args.seed), indent=2))
@@ -0,0 +1,87 @@
+"""
+Measures the memory used per Student, Instructor, Course and Enrollment object.
+
+Run from the repository root with: python -m benchmarks.bench_memory [count]
+"""
+import json
+import sys
+import tracemalloc
+from typing import Callable, Dict
+
+from SMS_Project import Course, Enrollment, Instructor, Student
+
+
+class PlainStudent:
+    """The dictionary-backed Student layout, before __slots__."""
+
+    def __init__(self, name: str, id_number: int, major: str) -> None:
+        self.name = name
+        self.id_number = id_number
+        self.major = major
+
+
+class PlainInstructor:
+    """The dictionary-backed Instructor layout, before __slots__."""
+
+    def __init__(self, name: str, id_number: int, department: str) -> None:
+        self.name = name
+        self.id_number = id_number
+        self.department = department
+
+
+class PlainCourse:
+    """The dictionary-backed Course layout, before __slots__."""
+
+    def __init__(self, course_name: str, course_id: int) -> None:
+        self.course_name = course_name
+        self.course_id = course_id
+        self.enrolled_students = []
+
+
+class PlainEnrollment:
+    """The dictionary-backed Enrollment layout, before __slots__."""
+
+    def __init__(self, student: object, course: object, grade: int = None) -> None:
+        self.student = student
+        self.course = course
+        self.grade = grade
+
+
+def bytes_per_object(factory: Callable[[int], object], count: int) -> float:
+    """
+    Returns the average number of bytes allocated by factory(i) for i in range(count),
+    counting everything the objects allocate but not the list that holds them.
+    """
+    tracemalloc.start()
+    holder = [None] * count
+    before = tracemalloc.get_traced_memory()[0]
+    for i in range(count):
+        holder[i] = factory(i)
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return (after - before) / count
+
+
+def run(count: int) -> Dict[str, Dict[str, float]]:
+    # Shared objects and strings are created up front so only the records themselves are measured.
+    name, major = "Student Name", "Computer Science"
+    student, course = Student(name, 1, major), Course("Algorithms", 1)
+    plain_student, plain_course = PlainStudent(name, 1, major), PlainCourse("Algorithms", 1)
+    cases = {
+        "Student": (lambda i: PlainStudent(name, i, major), lambda i: Student(name, i, major)),
+        "Instructor": (lambda i: PlainInstructor(name, i, major), lambda i: Instructor(name, i, major)),
+        "Course": (lambda i: PlainCourse(name, i), lambda i: Course(name, i)),
+        "Enrollment": (lambda i: PlainEnrollment(plain_student, plain_course), lambda i: Enrollment(student, course)),
+        "Enrollment (IDs)": (lambda i: PlainEnrollment(plain_student, plain_course), lambda i: Enrollment(1, 1)),
+    }
+    return {
+        label: {
+            "before_bytes": round(bytes_per_object(before, count), 1),
+            "after_bytes": round(bytes_per_object(after, count), 1),
+        }
+        for label, (before, after) in cases.items()
+    }
+
+
+if __name__ == "__main__":
+    print(json.dumps(run(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000), indent=2))
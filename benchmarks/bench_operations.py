@@ -0,0 +1,216 @@
+"""
+Times every public StudentManagementSystem and Course operation on synthetic datasets.
+
+Run from the repository root with:
+    python -m benchmarks.bench_operations --sizes 10000 100000 1000000 --output results.json
+    python -m benchmarks.bench_operations --baseline results.json
+
+Each operation is called --calls times on a system with the given number of students. Results are
+written as JSON with ops/sec, p50/p99 latency and the process's peak memory after each operation;
+with --baseline, the ops/sec of each operation is also compared against an earlier results file.
+With --instrument, the systems are instrumented with SMS_metrics, so comparing against a report
+without it measures the instrumentation's overhead.
+"""
+import argparse
+import json
+import platform
+import random
+import resource
+import subprocess
+import sys
+import time
+from itertools import accumulate
+from typing import Callable, Dict, Iterable, List, Optional, Tuple, Type
+
+from SMS_metrics import instrument
+from SMS_Project import Course, Instructor, Student, StudentManagementSystem
+
+COURSES_PER_STUDENT = (4, 5)
+STUDENTS_PER_COURSE = 40  # On average; course popularity is skewed so intro courses are much larger
+
+
+class Dataset:
+    """
+    A synthetic term: students, instructors and courses, with each student enrolled in a few courses.
+
+    Attributes:
+        system (StudentManagementSystem): The populated system.
+        student_count (int): The number of students.
+        course_count (int): The number of courses.
+        build_seconds (float): How long building the system took.
+        build_peak_rss_kb (int): The process's peak resident memory after building the system.
+    """
+
+    def __init__(
+        self,
+        student_count: int,
+        seed: int,
+        columnar_grades: bool = False,
+        system_class: Type[StudentManagementSystem] = StudentManagementSystem,
+    ) -> None:
+        rng = random.Random(seed)
+        self.student_count: int = student_count
+        self.course_count: int = max(10, student_count // STUDENTS_PER_COURSE)
+        cum_weights = list(accumulate(1 / (rank + 1) ** 0.8 for rank in range(self.course_count)))
+        start = time.perf_counter()
+        self.system: StudentManagementSystem = system_class(columnar_grades=columnar_grades)
+        courses = [Course(f"Course {i}", i) for i in range(self.course_count)]
+        self.system.add_courses(*courses)
+        self.system.add_instructors(*(Instructor(f"Instructor {i}", i, f"Dept {i % 50}") for i in range(self.course_count)))
+        for i in range(student_count):
+            student = Student(f"Student {i}", i, f"Major {i % 80}")
+            self.system.add_student(student)
+            picks = set(rng.choices(range(self.course_count), cum_weights=cum_weights, k=rng.randint(*COURSES_PER_STUDENT)))
+            self.system.enroll_student_in_courses(student, *(courses[course_id] for course_id in picks))
+        self.build_seconds: float = time.perf_counter() - start
+        self.build_peak_rss_kb: int = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def timed(operation: Callable[..., object], calls: Iterable[Tuple]) -> List[int]:
+    """
+    Calls operation once per argument tuple and returns the latency of each call in nanoseconds.
+    """
+    latencies = []
+    clock = time.perf_counter_ns
+    for args in calls:
+        start = clock()
+        operation(*args)
+        latencies.append(clock() - start)
+    return latencies
+
+
+def operations(dataset: Dataset, calls: int, rng: random.Random) -> Iterable[Tuple[str, Callable[[], List[int]]]]:
+    """
+    Yields (name, run) pairs, where run() performs the operation calls times and returns the latencies.
+    The order matters: operations that add objects come before the ones that remove them again.
+    """
+    system, n, m = dataset.system, dataset.student_count, dataset.course_count
+    student_ids = [rng.randrange(n) for _ in range(calls)]
+    course_ids = [rng.randrange(m) for _ in range(calls)]
+    new_student_ids = range(n, n + calls)
+    new_course_ids = range(m, m + calls)
+    students = [system.students.get(i) for i in student_ids]
+    courses = [system.courses.get(i) for i in course_ids]
+    enrolled = [(e.student, e.course) for e in (system.enrollments_for_student(i)[0] for i in student_ids)]
+
+    yield "add_student", lambda: timed(system.add_student, ((Student("New", i, "Undeclared"),) for i in new_student_ids))
+    yield "find_student", lambda: timed(system.find_student, ((i,) for i in student_ids))
+    yield "update_student", lambda: timed(system.update_student, ((Student(s.name, s.id_number, "Changed"),) for s in students))
+    yield "show_student", lambda: timed(lambda: sum(1 for _ in system.show_student()), [()] * min(calls, 10))
+    yield "find_students_by_major", lambda: timed(system.find_students_by_major, ((f"Major {i % 80}",) for i in student_ids))
+    yield "search_students", lambda: timed(system.search_students, ((f"Student {i}", True, 20) for i in student_ids))
+    yield "add_instructor", lambda: timed(system.add_instructor, ((Instructor("New", i, "Dept"),) for i in new_course_ids))
+    yield "find_instructor", lambda: timed(system.find_instructor, ((i,) for i in course_ids))
+    yield "update_instructor", lambda: timed(system.update_instructor, ((Instructor("Changed", i, "Dept"),) for i in course_ids))
+    yield "show_instructors", lambda: timed(lambda: sum(1 for _ in system.show_instructors()), [()] * min(calls, 10))
+    yield "find_instructors_by_department", lambda: timed(system.find_instructors_by_department, ((f"Dept {i % 50}",) for i in course_ids))
+    yield "search_instructors", lambda: timed(system.search_instructors, ((f"Instructor {i}", True, 20) for i in course_ids))
+    yield "add_courses", lambda: timed(system.add_courses, ((Course("New", i),) for i in new_course_ids))
+    yield "find_course", lambda: timed(system.find_course, ((i,) for i in course_ids))
+    yield "update_course", lambda: timed(system.update_course, ((Course(c.course_name, c.course_id),) for c in courses))
+    yield "enroll_student_in_courses", lambda: timed(
+        system.enroll_student_in_courses,
+        ((system.students.get(i), system.courses.get(j)) for i, j in zip(new_student_ids, new_course_ids)),
+    )
+    yield "assign_grade", lambda: timed(system.assign_grade, ((s, c, rng.randint(0, 100)) for s, c in enrolled))
+    yield "assign_grades_bulk", lambda: timed(
+        system.assign_grades_bulk,
+        [([(s.id_number, c.course_id, rng.randint(0, 100)) for s, c in enrolled[i : i + 1000]],) for i in range(0, calls, 1000)],
+    )
+    yield "students_grades", lambda: timed(system.students_grades, [()] * calls)
+    yield "get_student_grades", lambda: timed(system.get_student_grades, ((i,) for i in student_ids))
+    yield "studentlist_in_course", lambda: timed(system.studentlist_in_course, ((i,) for i in course_ids[: min(calls, 100)]))
+    yield "student_course_list", lambda: timed(system.student_course_list, ((i,) for i in student_ids))
+    yield "enrollments_for_student", lambda: timed(system.enrollments_for_student, ((i,) for i in student_ids))
+    yield "enrollments_for_course", lambda: timed(system.enrollments_for_course, ((i,) for i in course_ids[: min(calls, 100)]))
+    yield "Course.add_students_to_course", lambda: timed(
+        lambda s, c: c.add_students_to_course(s), zip(students, (system.courses.get(i) for i in new_course_ids))
+    )
+    yield "Course.list_enrolled_students", lambda: timed(lambda c: c.list_enrolled_students(), ((c,) for c in courses[: min(calls, 100)]))
+    yield "Course.remove_student_from_course", lambda: timed(
+        lambda s, c: c.remove_student_from_course(s), zip(students, (system.courses.get(i) for i in new_course_ids))
+    )
+    yield "remove_student", lambda: timed(system.remove_student, ((i,) for i in new_student_ids))
+    yield "remove_instructor", lambda: timed(system.remove_instructor, ((i,) for i in new_course_ids))
+    yield "remove_course", lambda: timed(system.remove_course, ((i,) for i in new_course_ids))
+
+
+def summarize(latencies: List[int]) -> Dict[str, float]:
+    ordered = sorted(latencies)
+    total = sum(ordered) or 1
+    return {
+        "calls": len(ordered),
+        "ops_per_sec": round(len(ordered) / (total / 1e9), 1),
+        "p50_us": round(ordered[len(ordered) // 2] / 1e3, 3),
+        "p99_us": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))] / 1e3, 3),
+        "peak_rss_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+    }
+
+
+def run(sizes: List[int], calls: int, seed: int, columnar_grades: bool = False, instrumented: bool = False) -> Dict[str, object]:
+    results = []
+    for size in sizes:
+        dataset = Dataset(size, seed, columnar_grades)
+        if instrumented:
+            instrument(dataset.system)
+        results.append(
+            {
+                "students": size,
+                "operation": "build",
+                "seconds": round(dataset.build_seconds, 3),
+                "peak_rss_kb": dataset.build_peak_rss_kb,
+            }
+        )
+        for name, bench in operations(dataset, calls, random.Random(seed)):
+            results.append({"students": size, "operation": name, **summarize(bench())})
+        results.append({"students": size, "operation": "view_cache", **dataset.system.views.stats()})
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True).stdout.strip()
+    except OSError:
+        commit = ""
+    return {
+        "commit": commit,
+        "python": platform.python_version(),
+        "calls": calls,
+        "seed": seed,
+        "columnar_grades": columnar_grades,
+        "instrumented": instrumented,
+        "results": results,
+    }
+
+
+def compare(report: Dict[str, object], baseline: Dict[str, object]) -> List[str]:
+    """
+    Returns one line per operation with the ops/sec ratio against the baseline report.
+    """
+    before = {(r["students"], r["operation"]): r for r in baseline["results"] if "ops_per_sec" in r}
+    lines = []
+    for result in report["results"]:
+        old: Optional[Dict] = before.get((result["students"], result["operation"]))
+        if old and "ops_per_sec" in result:
+            ratio = result["ops_per_sec"] / old["ops_per_sec"]
+            lines.append(f"{result['students']:>9} {result['operation']:<36} {ratio:6.2f}x")
+    return lines
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000], help="numbers of students")
+    parser.add_argument("--calls", type=int, default=2_000, help="calls per operation")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--columnar-grades", action="store_true")
+    parser.add_argument("--instrument", action="store_true", help="instrument the systems with SMS_metrics")
+    parser.add_argument("--output", help="write the JSON report to this file instead of stdout")
+    parser.add_argument("--baseline", help="a previous JSON report to compare ops/sec against")
+    args = parser.parse_args()
+
+    report = run(args.sizes, args.calls, args.seed, args.columnar_grades, args.instrument)
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(report, file, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+    if args.baseline:
+        with open(args.baseline) as file:
+            print("\n".join(compare(report, json.load(file))), file=sys.stderr)
@@ -0,0 +1,122 @@
+"""
+Measures journaling overhead and crash recovery time of a journaled StudentManagementSystem.
+
+Run from the repository root with:
+    python -m benchmarks.bench_recovery --students 200000 --directory /tmp/sms-journal
+
+A journaled system is populated with --students students, each enrolled in a few courses with a
+grade, and every change is written to the journal with group commit. Recovery is then timed twice:
+replaying the whole journal, and reading a snapshot taken afterwards. The seconds, throughput and
+file sizes of each step are written as JSON. Finally, a torn write is simulated at the end of the
+journal, and the changes committed after recovering from it are checked to survive the next recovery.
+"""
+import argparse
+import json
+import os
+import random
+import shutil
+import time
+from typing import Dict
+
+from SMS_journal import open_journaled
+from SMS_Project import Course, Student
+
+COURSES_PER_STUDENT = 5
+
+
+def directory_size(directory: str) -> int:
+    return sum(os.path.getsize(os.path.join(directory, name)) for name in os.listdir(directory))
+
+
+def check_torn_tail(directory: str) -> bool:
+    """
+    Commits a student, tears the journal's last frame as a crash in mid-write would, recovers and
+    commits another student, then recovers again. Returns whether both students survived.
+    """
+    shutil.rmtree(directory, ignore_errors=True)
+    system = open_journaled(directory, snapshot_every=None)
+    system.add_student(Student("Before", 1, "Major"))
+    system.save()
+    system._storage.close()
+    journal = os.path.join(directory, sorted(name for name in os.listdir(directory) if name.startswith("journal-"))[-1])
+    with open(journal, "ab") as file:
+        file.write(b"\x40\x00\x00\x00torn")  # A frame header promising more bytes than were written
+    system = open_journaled(directory, snapshot_every=None)
+    system.add_student(Student("After", 2, "Major"))
+    system.save()
+    system._storage.close()
+    system = open_journaled(directory, snapshot_every=None)
+    recovered = sorted(student.id_number for student in system.students)
+    system._storage.close()
+    shutil.rmtree(directory, ignore_errors=True)
+    return recovered == [1, 2]
+
+
+def run(students: int, courses: int, directory: str, group_size: int, sync: bool, seed: int) -> Dict[str, object]:
+    shutil.rmtree(directory, ignore_errors=True)
+    rng = random.Random(seed)
+    system = open_journaled(directory, group_size=group_size, sync=sync, snapshot_every=None)
+    start = time.perf_counter()
+    catalogue = [Course(f"Course {i}", i) for i in range(courses)]
+    system.add_courses(*catalogue)
+    for i in range(students):
+        student = Student(f"Student {i}", i, f"Major {i % 80}")
+        system.add_student(student)
+        picks = rng.sample(catalogue, COURSES_PER_STUDENT)
+        system.enroll_student_in_courses(student, *picks)
+        system.assign_grades_bulk([(i, course.course_id, rng.randint(0, 100)) for course in picks])
+    system.save()
+    populate = time.perf_counter() - start
+    changes = courses + students * (1 + 2 * COURSES_PER_STUDENT)
+    journal_bytes = directory_size(directory)
+    enrollments = len(system.enrollments)
+    system._storage.close()
+    del system
+
+    start = time.perf_counter()
+    system = open_journaled(directory, snapshot_every=None)
+    replay = time.perf_counter() - start
+    assert len(system.enrollments) == enrollments
+
+    start = time.perf_counter()
+    system._storage.snapshot()
+    snapshot = time.perf_counter() - start
+    snapshot_bytes = directory_size(directory)
+    system._storage.close()
+    del system
+
+    start = time.perf_counter()
+    system = open_journaled(directory, snapshot_every=None)
+    restore = time.perf_counter() - start
+    assert len(system.enrollments) == enrollments
+    system._storage.close()
+    torn_tail = check_torn_tail(directory + "-torn")
+    assert torn_tail, "Changes committed after a torn frame were lost"
+    return {
+        "students": students,
+        "enrollments": enrollments,
+        "group_size": group_size,
+        "sync": sync,
+        "populate_seconds": round(populate, 3),
+        "journaled_changes_per_sec": round(changes / populate, 1),
+        "journal_bytes": journal_bytes,
+        "replay_recovery_seconds": round(replay, 3),
+        "snapshot_seconds": round(snapshot, 3),
+        "snapshot_bytes": snapshot_bytes,
+        "snapshot_recovery_seconds": round(restore, 3),
+        "commits_after_torn_tail_recovered": torn_tail,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--students", type=int, default=200_000)
+    parser.add_argument("--courses", type=int, default=5_000)
+    parser.add_argument("--directory", default="sms-journal-bench")
+    parser.add_argument("--group-size", type=int, default=1000)
+    parser.add_argument("--no-sync", action="store_true", help="skip fsync on every group commit")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    report = run(args.students, args.courses, args.directory, args.group_size, not args.no_sync, args.seed)
+    shutil.rmtree(args.directory, ignore_errors=True)
+    print(json.dumps(report, indent=2))
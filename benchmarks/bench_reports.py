@@ -0,0 +1,103 @@
+"""
+Compares reading registrar reports from MaterializedReports with recomputing them from scratch,
+and measures what keeping the reports up to date adds to a grading burst.
+
+Run from the repository root with:
+    python -m benchmarks.bench_reports --students 50000
+
+A system is populated with --students students, each enrolled in a few courses, and a burst of
+--grades grade assignments is timed with and without the reports subscribed. The time to read the
+enrollment counts, major averages and department loads is timed both ways, and the results are
+written as JSON.
+"""
+import argparse
+import json
+import random
+import time
+from typing import Dict, Tuple
+
+from SMS_Project import Course, Instructor, Student, StudentManagementSystem
+from SMS_reports import MaterializedReports
+
+COURSES_PER_STUDENT = 5
+READS = 100
+
+
+def populate(students: int, courses: int, seed: int) -> StudentManagementSystem:
+    rng = random.Random(seed)
+    system = StudentManagementSystem()
+    system.add_courses(*(Course(f"Course {i}", i) for i in range(courses)))
+    system.add_students(*(Student(f"Student {i}", i, f"Major {i % 80}") for i in range(students)))
+    system.add_instructors(*(Instructor(f"Instructor {i}", i, f"Department {i % 20}") for i in range(courses // 2)))
+    for i in range(students):
+        system.enroll_student_in_courses(system.students.get(i), *rng.sample(list(system.courses), COURSES_PER_STUDENT))
+    for course_id in range(courses):
+        system.assign_instructor(course_id, course_id // 2)
+    return system
+
+
+def recompute(system: StudentManagementSystem) -> Tuple[Dict[int, int], Dict[str, float], Dict[str, Tuple[int, int]]]:
+    counts: Dict[int, int] = {}
+    majors: Dict[str, list] = {}
+    for enrollment in system.enrollments:
+        counts[enrollment.course_id] = counts.get(enrollment.course_id, 0) + 1
+        if enrollment.grade is not None:
+            grades = majors.setdefault(enrollment.student.major, [0, 0])
+            grades[0] += 1
+            grades[1] += enrollment.grade
+    departments: Dict[str, Tuple[int, int]] = {}
+    for instructor in system.instructors:
+        instructors, courses = departments.get(instructor.department, (0, 0))
+        departments[instructor.department] = (instructors + 1, courses + len(system.courses_for_instructor(instructor.id_number)))
+    return counts, {major: total / count for major, (count, total) in majors.items()}, departments
+
+
+def burst(system: StudentManagementSystem, grades: int, rng: random.Random) -> float:
+    enrollments = list(system.enrollments)
+    picks = [(rng.choice(enrollments), rng.randint(0, 100)) for _ in range(grades)]
+    start = time.perf_counter()
+    for enrollment, grade in picks:
+        system.assign_grade(enrollment.student, enrollment.course, grade)
+    return time.perf_counter() - start
+
+
+def run(students: int, courses: int, grades: int, seed: int) -> Dict[str, object]:
+    rng = random.Random(seed)
+    system = populate(students, courses, seed)
+    plain_burst = burst(system, grades, rng)
+
+    start = time.perf_counter()
+    reports = MaterializedReports(system)
+    build = time.perf_counter() - start
+    reported_burst = burst(system, grades, rng)
+
+    start = time.perf_counter()
+    for _ in range(READS):
+        reports.enrollment_counts(), reports.major_averages(), reports.department_loads()
+    materialized_read = (time.perf_counter() - start) / READS
+    start = time.perf_counter()
+    recomputed = recompute(system)
+    recompute_read = time.perf_counter() - start
+    assert recomputed[0] == reports.enrollment_counts() and recomputed[2] == reports.department_loads()
+
+    return {
+        "students": students,
+        "enrollments": students * COURSES_PER_STUDENT,
+        "grades": grades,
+        "build_seconds": round(build, 3),
+        "burst_us_per_grade": {
+            "without_reports": round(plain_burst / grades * 1e6, 2),
+            "with_reports": round(reported_burst / grades * 1e6, 2),
+        },
+        "read_ms": {"materialized": round(materialized_read * 1000, 3), "recomputed": round(recompute_read * 1000, 3)},
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--students", type=int, default=50_000)
+    parser.add_argument("--courses", type=int, default=2_000)
+    parser.add_argument("--grades", type=int, default=200_000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    print(json.dumps(run(args.students, args.courses, args.grades, args.seed), indent=2))
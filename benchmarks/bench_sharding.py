@@ -0,0 +1,92 @@
+"""
+Measures how a CPU-bound nightly recomputation scales with the number of shards.
+
+Run from the repository root with:
+    python -m benchmarks.bench_sharding --students 200000 --shards 1 2 4 8
+
+For each shard count, a ShardedStudentManagementSystem is populated (every shard builds its own
+students in parallel), and the nightly job then runs in every shard through map_shards: the course
+list and grade map of every student plus every student's GPA. The same job on a single in-process
+system is the baseline. The seconds, speedup and parallel efficiency of each shard count are
+written as JSON; the speedup can only approach the shard count on a machine with that many cores.
+"""
+import argparse
+import json
+import os
+import time
+from typing import Dict, List, Tuple
+
+from SMS_analytics import GradeAnalytics
+from SMS_Project import Course, Student, StudentManagementSystem
+from SMS_sharding import ShardedStudentManagementSystem
+
+COURSES_PER_STUDENT = 4
+
+
+def populate(system: StudentManagementSystem, shard: int, shard_count: int, students: int, courses: int) -> int:
+    """
+    Adds the students of one shard, with deterministic enrollments and grades so that every shard
+    count does the same total work. Returns the number of students added.
+    """
+    catalogue = [Course(f"Course {i}", i) for i in range(courses)]
+    system.add_courses(*catalogue)
+    ids = range(shard, students, shard_count)
+    system.add_students(*(Student(f"Student {i}", i, f"Major {i % 80}") for i in ids))
+    rows: List[Tuple[int, int, int]] = []
+    for i in ids:
+        picks = [catalogue[(i * 7 + k * 131) % courses] for k in range(COURSES_PER_STUDENT)]
+        system.enroll_student_in_courses(system.students.get(i), *picks)
+        rows.extend((i, course.course_id, (i * 31 + k * 17) % 101) for k, course in enumerate(picks))
+    system.assign_grades_bulk(rows)
+    return len(ids)
+
+
+def nightly(system: StudentManagementSystem, shard: int) -> Tuple[int, float]:
+    """
+    The nightly job: rebuilds every student's course list and grade map and computes every GPA.
+    Returns the number of course list entries and the sum of the GPAs, as a checksum.
+    """
+    system.views.clear()
+    entries = 0
+    for student in system.students:
+        entries += len(system.student_course_list(student.id_number))
+        system.get_student_grades(student.id_number)
+    return entries, sum(GradeAnalytics(system).gpas().values())
+
+
+def run(students: int, courses: int, shard_counts: List[int], columnar_grades: bool) -> Dict[str, object]:
+    system = StudentManagementSystem(columnar_grades)
+    populate(system, 0, 1, students, courses)
+    start = time.perf_counter()
+    checksum = nightly(system, 0)
+    baseline = time.perf_counter() - start
+    del system
+
+    results = [{"shards": 0, "seconds": round(baseline, 3), "checksum": checksum}]
+    for shard_count in shard_counts:
+        with ShardedStudentManagementSystem(shard_count, columnar_grades) as sharded:
+            sharded.map_shards(populate, shard_count, students, courses)
+            start = time.perf_counter()
+            parts = sharded.map_shards(nightly)
+            seconds = time.perf_counter() - start
+        speedup = baseline / seconds
+        results.append(
+            {
+                "shards": shard_count,
+                "seconds": round(seconds, 3),
+                "speedup": round(speedup, 2),
+                "efficiency": round(speedup / shard_count, 2),
+                "checksum": [sum(part[0] for part in parts), sum(part[1] for part in parts)],
+            }
+        )
+    return {"cpus": os.cpu_count(), "students": students, "courses": courses, "columnar_grades": columnar_grades, "results": results}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--students", type=int, default=200_000)
+    parser.add_argument("--courses", type=int, default=2_000)
+    parser.add_argument("--shards", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--columnar-grades", action="store_true")
+    args = parser.parse_args()
+    print(json.dumps(run(args.students, args.courses, args.shards, args.columnar_grades), indent=2))
@@ -0,0 +1,108 @@
+"""
+Compares a memory-mapped binary snapshot with pickling for sharing a term's state between batch jobs.
+
+Run from the repository root with:
+    python -m benchmarks.bench_snapshot --students 50000 --path /tmp/sms-term.snapshot
+
+A system is populated with --students students, each enrolled in a few courses with a grade, and
+saved both with write_snapshot and with pickle. For each format, the time to save and to open the
+file, the file size and the time of a batch of point queries (a student's grades and a course's
+roster) are written as JSON, along with the time to load a snapshot into a full system.
+"""
+import argparse
+import json
+import os
+import pickle
+import random
+import time
+from typing import Dict
+
+from SMS_Project import Course, Student, StudentManagementSystem
+from SMS_snapshot import SnapshotReader, write_snapshot
+
+COURSES_PER_STUDENT = 5
+QUERIES = 1_000
+
+
+def populate(students: int, courses: int, seed: int) -> StudentManagementSystem:
+    rng = random.Random(seed)
+    system = StudentManagementSystem()
+    catalogue = [Course(f"Course {i}", i) for i in range(courses)]
+    system.add_courses(*catalogue)
+    system.add_students(*(Student(f"Student {i}", i, f"Major {i % 80}") for i in range(students)))
+    rows = []
+    for i in range(students):
+        picks = rng.sample(catalogue, COURSES_PER_STUDENT)
+        system.enroll_student_in_courses(system.students.get(i), *picks)
+        rows.extend((i, course.course_id, rng.randint(0, 100)) for course in picks)
+    system.assign_grades_bulk(rows)
+    return system
+
+
+def run(students: int, courses: int, path: str, seed: int) -> Dict[str, object]:
+    system = populate(students, courses, seed)
+    rng = random.Random(seed + 1)
+    student_ids = [rng.randrange(students) for _ in range(QUERIES)]
+    course_ids = [rng.randrange(courses) for _ in range(QUERIES)]
+
+    start = time.perf_counter()
+    write_snapshot(path, system)
+    snapshot_write = time.perf_counter() - start
+    start = time.perf_counter()
+    with open(path + ".pickle", "wb") as file:
+        pickle.dump(system, file, pickle.HIGHEST_PROTOCOL)
+    pickle_write = time.perf_counter() - start
+    del system
+
+    start = time.perf_counter()
+    reader = SnapshotReader(path)
+    snapshot_open = time.perf_counter() - start
+    start = time.perf_counter()
+    for student_id, course_id in zip(student_ids, course_ids):
+        reader.get_student_grades(student_id)
+        reader.enrollments_for_course(course_id)
+    snapshot_queries = time.perf_counter() - start
+    start = time.perf_counter()
+    loaded = reader.load()
+    snapshot_load = time.perf_counter() - start
+    reader.close()
+    del loaded
+
+    start = time.perf_counter()
+    with open(path + ".pickle", "rb") as file:
+        unpickled = pickle.load(file)
+    pickle_open = time.perf_counter() - start
+    start = time.perf_counter()
+    for student_id, course_id in zip(student_ids, course_ids):
+        unpickled.get_student_grades(student_id)
+        unpickled.enrollments_for_course(course_id)
+    pickle_queries = time.perf_counter() - start
+
+    return {
+        "students": students,
+        "courses": courses,
+        "enrollments": students * COURSES_PER_STUDENT,
+        "snapshot": {
+            "write_seconds": round(snapshot_write, 3),
+            "bytes": os.path.getsize(path),
+            "open_ms": round(snapshot_open * 1000, 3),
+            "query_us": round(snapshot_queries / QUERIES * 1e6, 1),
+            "full_load_seconds": round(snapshot_load, 3),
+        },
+        "pickle": {
+            "write_seconds": round(pickle_write, 3),
+            "bytes": os.path.getsize(path + ".pickle"),
+            "open_ms": round(pickle_open * 1000, 3),
+            "query_us": round(pickle_queries / QUERIES * 1e6, 1),
+        },
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--students", type=int, default=50_000)
+    parser.add_argument("--courses", type=int, default=2_000)
+    parser.add_argument("--path", default="sms-term.snapshot")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    print(json.dumps(run(args.students, args.courses, args.path, args.seed), indent=2))
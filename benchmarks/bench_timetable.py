@@ -0,0 +1,93 @@
+"""
+Measures the batch schedule solver on a full term's requests.
+
+Run from the repository root with:
+    python -m benchmarks.bench_timetable --students 100000 --courses 400
+
+The catalogue has --courses courses with --sections sections each. Every section meets twice a
+week in one of the standard 90-minute blocks, and has enough seats for its share of the demand
+plus --slack. Each student requests 5 random courses, and the whole batch goes through
+StudentManagementSystem.schedule_students. The time taken, the solver's outcome and the result of
+checking every student's timetable for clashes and every section for overbooking are written as JSON.
+"""
+import argparse
+import json
+import random
+import time
+from typing import Dict, List
+
+from SMS_Project import Course, MeetingSlot, Student, StudentManagementSystem
+
+COURSES_PER_STUDENT = 5
+# Two meetings a week: Monday and Wednesday or Tuesday and Thursday, in one of six 90-minute blocks
+BLOCKS = [(days, 8 * 60 + 100 * block) for days in ((0, 2), (1, 3)) for block in range(6)]
+
+
+def catalogue(courses: int, sections: int, capacity: int, rng: random.Random) -> List[Course]:
+    catalogue = []
+    for course in range(courses):
+        for section in range(sections):
+            days, start = rng.choice(BLOCKS)
+            meetings = [MeetingSlot(day, start, start + 90) for day in days]
+            catalogue.append(Course(f"Course {course}", course * sections + section, capacity, meetings))
+    return catalogue
+
+
+def verify(system: StudentManagementSystem) -> Dict[str, int]:
+    """
+    Counts the students with overlapping meetings and the sections over capacity, both of which should be zero.
+    """
+    clashing = 0
+    for student_courses in system._student_enrollments.values():
+        intervals = sorted(
+            meeting.week_interval() for enrollment in student_courses.values() for meeting in enrollment.course.meetings
+        )
+        clashing += any(end > next_start for (_, end), (next_start, _) in zip(intervals, intervals[1:]))
+    overbooked = sum(
+        course.capacity is not None and len(course.enrolled_students) > course.capacity for course in system.courses
+    )
+    return {"students_with_clashes": clashing, "overbooked_sections": overbooked}
+
+
+def run(students: int, courses: int, sections: int, slack: float, seed: int) -> Dict[str, object]:
+    rng = random.Random(seed)
+    capacity = int(students * COURSES_PER_STUDENT / (courses * sections) * (1 + slack)) + 1
+    system = StudentManagementSystem()
+    system.add_courses(*catalogue(courses, sections, capacity, rng))
+    system.add_students(*(Student(f"Student {i}", i, f"Major {i % 80}") for i in range(students)))
+    names = [f"Course {course}" for course in range(courses)]
+    requests = [(i, rng.sample(names, COURSES_PER_STUDENT)) for i in range(students)]
+
+    start = time.perf_counter()
+    report = system.schedule_students(requests)
+    seconds = time.perf_counter() - start
+
+    reasons: Dict[str, int] = {}
+    for unscheduled in report.unscheduled.values():
+        for reason in unscheduled.values():
+            reasons[reason] = reasons.get(reason, 0) + 1
+    return {
+        "students": students,
+        "requests": students * COURSES_PER_STUDENT,
+        "sections": courses * sections,
+        "section_capacity": capacity,
+        "seconds": round(seconds, 2),
+        "requests_per_second": round(students * COURSES_PER_STUDENT / seconds),
+        "scheduled": sum(len(course_ids) for course_ids in report.enrolled.values()),
+        "fully_scheduled_students": sum(
+            len(course_ids) == COURSES_PER_STUDENT for course_ids in report.enrolled.values()
+        ),
+        "unscheduled": reasons,
+        **verify(system),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--students", type=int, default=100_000)
+    parser.add_argument("--courses", type=int, default=400)
+    parser.add_argument("--sections", type=int, default=4)
+    parser.add_argument("--slack", type=float, default=0.1, help="spare seats, as a fraction of the expected demand")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    print(json.dumps(run(args.students, args.courses, args.sections, args.slack, args.seed), indent=2))